@@ -0,0 +1,34 @@
+"""Prefix-search indexes for the property and tenant typeahead.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, Sequence[str], None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f("ix_properties_address"), "properties", ["address"], unique=False)
+    op.create_index(op.f("ix_properties_city"), "properties", ["city"], unique=False)
+    op.create_index(op.f("ix_properties_postal_code"), "properties", ["postal_code"], unique=False)
+    op.create_index(op.f("ix_tenants_name"), "tenants", ["name"], unique=False)
+    op.create_index(op.f("ix_tenants_email"), "tenants", ["email"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_tenants_email"), table_name="tenants")
+    op.drop_index(op.f("ix_tenants_name"), table_name="tenants")
+    op.drop_index(op.f("ix_properties_postal_code"), table_name="properties")
+    op.drop_index(op.f("ix_properties_city"), table_name="properties")
+    op.drop_index(op.f("ix_properties_address"), table_name="properties")
@@ -0,0 +1,113 @@
+"""Word-prefix search index table for tenant and property search.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, Sequence[str], None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tokenizer as of this revision (app.repositories.search_index), copied so the
+# migration keeps producing these terms whatever the app code becomes
+MIN_WORD_LENGTH = 2
+MAX_TERM_LENGTH = 12
+
+_WORD = re.compile(r"[^\W_]+")
+_DIGITS = re.compile(r"\D+")
+
+
+def _phone_words(value: str) -> list[str]:
+    groups = _WORD.findall(value)
+    joined = _DIGITS.sub("", value)
+    return groups + [joined] if joined and joined not in groups else groups
+
+
+#: entity type -> source query and {field: word splitter}
+SOURCES = {
+    "property": (
+        "SELECT id, address, city, postal_code FROM properties",
+        {"address": None, "city": None, "postal_code": None},
+    ),
+    "tenant": (
+        "SELECT id, name, email, phone FROM tenants",
+        {"name": None, "email": None, "phone": _phone_words},
+    ),
+}
+
+
+def _words(value, splitter) -> list[str]:
+    if not value:
+        return []
+    decomposed = unicodedata.normalize("NFKD", value)
+    value = "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+    return splitter(value) if splitter else _WORD.findall(value)
+
+
+def _index_terms(words) -> set[str]:
+    terms = set()
+    for word in words:
+        if len(word) < MIN_WORD_LENGTH:
+            continue
+        stop = min(len(word), MAX_TERM_LENGTH)
+        terms.update(word[:k] for k in range(MIN_WORD_LENGTH, stop + 1))
+        if len(word) < MAX_TERM_LENGTH:
+            terms.add(f"{word}$")
+    return terms
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    search_terms = op.create_table(
+        "search_terms",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("entity_type", sa.String(20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("field", sa.String(20), nullable=False),
+        sa.Column("term", sa.String(12), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_search_terms_lookup",
+        "search_terms",
+        ["entity_type", "term", "field", "entity_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_search_terms_entity", "search_terms", ["entity_id", "entity_type"], unique=False
+    )
+
+    # Index existing rows
+    bind = op.get_bind()
+    for entity_type, (sql, fields) in SOURCES.items():
+        rows = []
+        for values in bind.execute(sa.text(sql)).mappings():
+            for field, splitter in fields.items():
+                rows.extend(
+                    {
+                        "entity_type": entity_type,
+                        "entity_id": values["id"],
+                        "field": field,
+                        "term": term,
+                    }
+                    for term in sorted(_index_terms(_words(values[field], splitter)))
+                )
+        if rows:
+            op.bulk_insert(search_terms, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_search_terms_entity", table_name="search_terms")
+    op.drop_index("ix_search_terms_lookup", table_name="search_terms")
+    op.drop_table("search_terms")
@@ -0,0 +1,75 @@
+"""Composite indexes for the repository queries.
+
+The single-column property_id indexes from 001 are replaced by
+(property_id, <sort column>) indexes, which also serve the foreign keys.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, Sequence[str], None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_rent_charges_status_due_date", "rent_charges", ["status", "due_date"], unique=False
+    )
+    op.create_index(
+        "ix_rent_charges_property_id_due_date",
+        "rent_charges",
+        ["property_id", "due_date"],
+        unique=False,
+    )
+    op.create_index("ix_rent_charges_period_start", "rent_charges", ["period_start"], unique=False)
+    op.create_index("ix_rent_charges_created_at", "rent_charges", ["created_at"], unique=False)
+    op.create_index(
+        "ix_payments_property_id_payment_date",
+        "payments",
+        ["property_id", "payment_date"],
+        unique=False,
+    )
+    op.create_index("ix_payments_payment_date", "payments", ["payment_date"], unique=False)
+    op.create_index(
+        "ix_tenants_property_id_move_in_date",
+        "tenants",
+        ["property_id", "move_in_date"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tenants_move_out_date_name", "tenants", ["move_out_date", "name"], unique=False
+    )
+    op.create_index(op.f("ix_properties_is_active"), "properties", ["is_active"], unique=False)
+
+    # Covered by the composite indexes above
+    op.drop_index(op.f("ix_rent_charges_property_id"), table_name="rent_charges")
+    op.drop_index(op.f("ix_payments_property_id"), table_name="payments")
+    op.drop_index(op.f("ix_tenants_property_id"), table_name="tenants")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_tenants_property_id"), "tenants", ["property_id"], unique=False)
+    op.create_index(op.f("ix_payments_property_id"), "payments", ["property_id"], unique=False)
+    op.create_index(
+        op.f("ix_rent_charges_property_id"), "rent_charges", ["property_id"], unique=False
+    )
+
+    op.drop_index(op.f("ix_properties_is_active"), table_name="properties")
+    op.drop_index("ix_tenants_move_out_date_name", table_name="tenants")
+    op.drop_index("ix_tenants_property_id_move_in_date", table_name="tenants")
+    op.drop_index("ix_payments_payment_date", table_name="payments")
+    op.drop_index("ix_payments_property_id_payment_date", table_name="payments")
+    op.drop_index("ix_rent_charges_created_at", table_name="rent_charges")
+    op.drop_index("ix_rent_charges_period_start", table_name="rent_charges")
+    op.drop_index("ix_rent_charges_property_id_due_date", table_name="rent_charges")
+    op.drop_index("ix_rent_charges_status_due_date", table_name="rent_charges")
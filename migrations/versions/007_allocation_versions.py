@@ -0,0 +1,33 @@
+"""Version counters on payments and rent charges for concurrent allocations.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, Sequence[str], None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("payments", "rent_charges"):
+        op.add_column(
+            table, sa.Column("version", sa.Integer(), server_default="0", nullable=False)
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("rent_charges", "payments"):
+        # Batch mode so SQLite can drop the column too
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version")
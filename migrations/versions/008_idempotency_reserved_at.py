@@ -0,0 +1,32 @@
+"""Reservation time on idempotency keys, so a dead request's key can be taken over.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, Sequence[str], None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "idempotency_keys",
+        sa.Column("reserved_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Batch mode so SQLite can drop the column too
+    with op.batch_alter_table("idempotency_keys") as batch_op:
+        batch_op.drop_column("reserved_at")
@@ -0,0 +1,31 @@
+"""Owner and write time on idempotency keys, so a key whose write committed is never re-run.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, Sequence[str], None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("idempotency_keys", sa.Column("owner", sa.String(32), nullable=True))
+    op.add_column("idempotency_keys", sa.Column("written_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Batch mode so SQLite can drop the columns too
+    with op.batch_alter_table("idempotency_keys") as batch_op:
+        batch_op.drop_column("written_at")
+        batch_op.drop_column("owner")
@@ -1,11 +1,12 @@
 """Flask application factory."""
 
 import os
+from datetime import date
 
 from flask import Flask
 
 from app.config import config_by_name
-from app.database import db_session, shutdown_session
+from app.database import init_engine, init_read_routing, shutdown_session
 
 
 def create_app(config_name=None):
@@ -20,9 +21,43 @@ def create_app(config_name=None):
     )
     app.config.from_object(config_by_name[config_name])
 
+    # Bind the engine and sessions to this app's database settings
+    init_engine(app.config)
+
+    # Cached property directory belongs to this app's database
+    from app.repositories.property_directory import property_directory
+
+    property_directory.configure(
+        ttl=app.config["PROPERTY_CACHE_TTL"],
+        max_entries=app.config["PROPERTY_CACHE_MAX_ENTRIES"],
+    )
+
+    # Rendered dashboard panels and report partials ({% cache %} blocks)
+    from app.fragment_cache import init_fragment_cache
+
+    init_fragment_cache(app)
+
+    # ETag salt for conditional GET (app.conditional)
+    from app.conditional import init_conditional_get
+
+    init_conditional_get(app)
+
+    # Idempotency-Key header / hidden form field on POSTs (app.idempotency)
+    from app.idempotency import init_idempotency
+
+    init_idempotency(app)
+
     # Teardown database session after each request
     app.teardown_appcontext(shutdown_session)
 
+    if app.config.get("SQLALCHEMY_REPLICA_URI"):
+        init_read_routing(app)
+
+    if app.config.get("SQL_QUERY_STATS"):
+        from app.query_stats import init_query_stats
+
+        init_query_stats(app)
+
     # Register blueprints
     from app.routes.dashboard import bp as dashboard_bp
     from app.routes.properties import bp as properties_bp
@@ -32,6 +67,9 @@ def create_app(config_name=None):
     from app.routes.rent_charges import bp as rent_charges_bp
     from app.routes.reports import bp as reports_bp
     from app.routes.email import bp as email_bp
+    from app.routes.search import bp as search_bp
+    from app.routes.exports import bp as exports_bp
+    from app.routes.api import bp as api_bp
 
     app.register_blueprint(dashboard_bp)
     app.register_blueprint(properties_bp, url_prefix="/properties")
@@ -41,6 +79,9 @@ def create_app(config_name=None):
     app.register_blueprint(rent_charges_bp, url_prefix="/rent-charges")
     app.register_blueprint(reports_bp, url_prefix="/reports")
     app.register_blueprint(email_bp, url_prefix="/email")
+    app.register_blueprint(search_bp, url_prefix="/search")
+    app.register_blueprint(exports_bp, url_prefix="/exports")
+    app.register_blueprint(api_bp, url_prefix="/api/v1")
 
     # Template globals
     from app.domain.charge_states import get_behavior
@@ -48,6 +89,11 @@ def create_app(config_name=None):
 
     app.jinja_env.globals["ChargeStatus"] = ChargeStatus
 
+    from app.streaming import flush
+
+    app.jinja_env.globals["flush"] = flush
+    app.jinja_env.globals["today"] = date.today
+
     def _charge_table_row_class(charge):
         return get_behavior(charge.status).table_row_class()
 
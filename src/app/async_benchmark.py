@@ -0,0 +1,201 @@
+"""Sync vs async throughput for the reports and the Gmail API (``project-bench async``).
+
+Runs the same batch of work twice, once one call after another through the
+sync services and once with ``asyncio.gather`` through their async
+counterparts:
+
+- reports: ``--concurrency`` report calls (arrears, financial summary,
+  property report, payment timeline) on a seeded SQLite file, via
+  ``ReportService`` and ``AsyncReportService``;
+- email: ``--concurrency`` payment reminders via ``EmailService`` and
+  ``AsyncEmailService`` against a local stand-in for the Gmail API that
+  answers after ``--latency-ms``.
+
+Against SQLite the database does little waiting, so the report gain mostly
+shows with a networked MySQL (``--database``); the email batch shows what
+overlapping network waits buys.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app import create_app
+from app.database import db_session, get_engine, init_db, init_engine
+from app.models.property import Property
+from app.repositories import property_directory
+from app.seed import SeedOptions, seed_portfolio
+from app.services.email_service import AsyncEmailService, EmailService
+from app.services.report_service import AsyncReportService, ReportService
+
+_FAKE_CREDENTIALS = {
+    "GOOGLE_CLIENT_ID": "bench",
+    "GOOGLE_CLIENT_SECRET": "bench",
+    "GOOGLE_REFRESH_TOKEN": "bench",
+    "GOOGLE_EMAIL_FROM": "bench@example.com",
+}
+
+
+def _fake_gmail(latency_ms: float) -> ThreadingHTTPServer:
+    """Local HTTP server answering the token and send endpoints after a delay."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency_ms / 1000)
+            body = json.dumps({"access_token": "token", "id": "message"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+_REPORT_MIX = (
+    ("get_arrears_report", False),
+    ("get_financial_summary", False),
+    ("get_property_report", True),
+    ("get_payment_timeline", True),
+)
+
+
+def _report_calls(property_ids: list[int]) -> list[tuple[str, tuple]]:
+    """One report call per property id, cycling through the mix."""
+    calls = []
+    for i, property_id in enumerate(property_ids):
+        name, per_property = _REPORT_MIX[i % len(_REPORT_MIX)]
+        calls.append((name, (property_id,) if per_property else ()))
+    return calls
+
+
+def _timed(run: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    run()
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_reports(concurrency: int) -> dict:
+    """Run ``concurrency`` report calls sequentially (sync) and gathered (async)."""
+    property_ids = [pid for (pid,) in db_session.query(Property.id).limit(concurrency)]
+    property_ids = (property_ids * concurrency)[:concurrency]
+    calls = _report_calls(property_ids)
+
+    def sync_batch():
+        for name, args in calls:
+            db_session.remove()
+            getattr(ReportService(), name)(*args)
+        db_session.remove()
+
+    async def async_batch():
+        service = AsyncReportService(replica=False)
+        await asyncio.gather(*(getattr(service, name)(*args) for name, args in calls))
+
+    sync_batch()  # warm-up (property directory, statement caches)
+    return {
+        "case": f"reports x{concurrency}",
+        "sync_ms": round(_timed(sync_batch), 1),
+        "async_ms": round(_timed(lambda: asyncio.run(async_batch())), 1),
+    }
+
+
+def bench_email(concurrency: int, latency_ms: float) -> dict:
+    """Send ``concurrency`` reminders sequentially (sync) and gathered (async)."""
+    server = _fake_gmail(latency_ms)
+    base = f"http://127.0.0.1:{server.server_port}"
+    reminder = {
+        "tenant_name": "Bench Tenant",
+        "property_address": "1 Bench Street",
+        "amount_due": 1500.0,
+        "due_date": "2026-11-01",
+    }
+    saved = {key: os.environ.get(key) for key in _FAKE_CREDENTIALS}
+    os.environ.update({k: v for k, v in _FAKE_CREDENTIALS.items() if not os.environ.get(k)})
+
+    def configure(service):
+        service.TOKEN_URL, service.SEND_URL = f"{base}/token", f"{base}/send"
+        return service
+
+    def sync_batch():
+        service = configure(EmailService())
+        for i in range(concurrency):
+            service.send_payment_reminder(tenant_email=f"t{i}@example.com", **reminder)
+
+    async def async_batch():
+        async with httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency)) as client:
+            service = configure(AsyncEmailService(client))
+            await asyncio.gather(
+                *(
+                    service.send_payment_reminder(tenant_email=f"t{i}@example.com", **reminder)
+                    for i in range(concurrency)
+                )
+            )
+
+    try:
+        return {
+            "case": f"email x{concurrency} @{latency_ms:g}ms",
+            "sync_ms": round(_timed(sync_batch), 1),
+            "async_ms": round(_timed(lambda: asyncio.run(async_batch())), 1),
+        }
+    finally:
+        server.shutdown()
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+
+
+def run_async_benchmark(
+    properties: int = 200,
+    months: int = 24,
+    concurrency: int = 16,
+    latency_ms: float = 100,
+    database: str | None = None,
+) -> list[dict]:
+    """Compare on a freshly seeded temporary SQLite file, or on the data in ``database``."""
+    tmpdir = None
+    if database is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="renttrack-bench-")
+        database = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+
+    app = create_app("testing")
+    app.config["SQLALCHEMY_DATABASE_URI"] = database
+    init_engine(app.config)
+    try:
+        with app.app_context():
+            init_db()
+            if tmpdir is not None:
+                seed_portfolio(SeedOptions(properties=properties, months=months))
+                property_directory.invalidate()
+            results = [bench_reports(concurrency), bench_email(concurrency, latency_ms)]
+    finally:
+        db_session.remove()
+        get_engine().dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    for result in results:
+        result["speedup"] = round(result["sync_ms"] / result["async_ms"], 2)
+    return results
+
+
+def print_async_results(results: list[dict]) -> None:
+    print(f"{'case':<28} {'sync ms':>10} {'async ms':>10} {'speedup':>8}")
+    for r in results:
+        print(f"{r['case']:<28} {r['sync_ms']:>10.1f} {r['async_ms']:>10.1f} {r['speedup']:>7.2f}x")
+
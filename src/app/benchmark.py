@@ -0,0 +1,438 @@
+"""Benchmark suite for report, allocation and repository hot paths (``project-bench``).
+
+``project-bench run`` seeds the testing database (in-memory SQLite unless
+``TEST_DATABASE_URL`` is set) with ``app.seed`` portfolios of each
+``--sizes`` and, per dataset, times every case: the ReportService reports,
+``PaymentService.auto_allocate_payment`` and each repository query method.
+
+For every case it records wall time over ``--repeat`` runs (each in a fresh
+session, like a request) plus the statement count and peak Python memory of
+one extra instrumented run. Results print as a table and can be written to
+JSON with ``--output``.
+
+``--baseline FILE`` (or ``project-bench compare BASELINE CURRENT``) flags
+regressions: median time or peak memory up by more than ``--threshold``
+(and at least ``--min-ms`` slower), or any increase in the query count.
+The exit status is 1 when something regressed.
+
+``project-bench async`` compares the sync services with their async
+counterparts (``app.async_benchmark``).
+
+Example::
+
+    project-bench run --sizes 100,1000 --output benchmarks/baseline.json
+    project-bench run --sizes 100,1000 --baseline benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import NamedTuple
+
+from sqlalchemy import func
+
+from app import create_app
+from app.database import db_session, get_engine, init_db
+from app.models.payment import Payment
+from app.models.property import Property
+from app.models.rent_charge import ChargeStatus, RentCharge
+from app.models.tenant import Tenant
+from app.query_stats import collect_query_stats
+from app.repositories import (
+    PaymentRepository,
+    PropertyRepository,
+    RentChargeRepository,
+    SearchIndexRepository,
+    TenantRepository,
+    property_directory,
+)
+from app.seed import SeedOptions, seed_portfolio, truncate
+from app.services.payment_service import PaymentService
+from app.services.report_service import ReportService
+
+
+class Case(NamedTuple):
+    """One benchmarked call.
+
+    ``run`` receives the dataset context (ids of representative rows);
+    ``setup``, if given, runs untimed before each call and returns extra
+    context entries (e.g. a fresh payment to allocate).
+    """
+
+    name: str
+    run: Callable[[dict], object]
+    setup: Callable[[dict], dict] | None = None
+
+
+def _new_payment(ctx: dict) -> dict:
+    """Unallocated payment worth two months' rent for the property owing the most."""
+    property_id, rent = (
+        db_session.query(Property.id, Property.monthly_rent)
+        .join(RentCharge, RentCharge.property_id == Property.id)
+        .filter(RentCharge.status != ChargeStatus.PAID)
+        .group_by(Property.id, Property.monthly_rent)
+        .order_by(func.count(RentCharge.id).desc(), Property.id)
+        .first()
+    ) or (ctx["property_id"], Decimal("1000"))
+    payment = PaymentRepository().create(
+        {"property_id": property_id, "amount": rent * 2, "payment_date": date.today()}
+    )
+    return {"new_payment_id": payment.id}
+
+
+def _cases() -> list[Case]:
+    today = date.today()
+    a_year_ago = today - timedelta(days=365)
+
+    return [
+        # ReportService
+        Case("report.dashboard_summary", lambda c: ReportService().get_dashboard_summary()),
+        Case("report.arrears_report", lambda c: ReportService().get_arrears_report()),
+        Case(
+            "report.property_report",
+            lambda c: ReportService().get_property_report(c["property_id"]),
+        ),
+        Case(
+            "report.payment_timeline",
+            lambda c: ReportService().get_payment_timeline(c["property_id"], 12),
+        ),
+        Case("report.financial_summary", lambda c: ReportService().get_financial_summary()),
+        Case("report.occupancy_report", lambda c: ReportService().get_occupancy_report()),
+        Case(
+            "report.tenant_payment_history",
+            lambda c: ReportService().get_tenant_payment_history(c["tenant_id"]),
+        ),
+        # PaymentService
+        Case(
+            "payment_service.auto_allocate_payment",
+            lambda c: PaymentService().auto_allocate_payment(c["new_payment_id"]),
+            setup=_new_payment,
+        ),
+        # PropertyRepository
+        Case("property.get_all", lambda c: PropertyRepository().get_all()),
+        Case("property.get_active", lambda c: PropertyRepository().get_active()),
+        Case("property.get_directory_rows", lambda c: PropertyRepository().get_directory_rows()),
+        Case(
+            "property.get_with_tenant_count",
+            lambda c: PropertyRepository().get_with_tenant_count(),
+        ),
+        Case("property.get_by_city", lambda c: PropertyRepository().get_by_city("toronto")),
+        Case("property.search", lambda c: PropertyRepository().search("king st")),
+        Case("property.search_prefix", lambda c: PropertyRepository().search_prefix("ma")),
+        # TenantRepository
+        Case(
+            "tenant.get_by_property",
+            lambda c: TenantRepository().get_by_property(c["property_id"]),
+        ),
+        Case(
+            "tenant.get_active_by_property",
+            lambda c: TenantRepository().get_active_by_property(c["property_id"]),
+        ),
+        Case("tenant.get_current", lambda c: TenantRepository().get_current()),
+        Case("tenant.search_by_name", lambda c: TenantRepository().search_by_name("smith")),
+        Case("tenant.search", lambda c: TenantRepository().search("jo smi")),
+        Case("tenant.search_prefix", lambda c: TenantRepository().search_prefix("ma")),
+        Case("tenant.list_rows", lambda c: TenantRepository().list_rows()),
+        # PaymentRepository
+        Case(
+            "payment.get_by_property",
+            lambda c: PaymentRepository().get_by_property(c["property_id"], load="list"),
+        ),
+        Case(
+            "payment.get_by_date_range",
+            lambda c: PaymentRepository().get_by_date_range(a_year_ago, today),
+        ),
+        Case(
+            "payment.get_total_by_property",
+            lambda c: PaymentRepository().get_total_by_property(c["property_id"]),
+        ),
+        Case("payment.get_recent", lambda c: PaymentRepository().get_recent(load="with_property")),
+        Case(
+            "payment.get_with_allocations",
+            lambda c: PaymentRepository().get_with_allocations(c["payment_id"], load="detail"),
+        ),
+        Case("payment.list_rows", lambda c: PaymentRepository().list_rows()),
+        Case("payment.iter_rows", lambda c: sum(1 for _ in PaymentRepository().iter_rows())),
+        # RentChargeRepository
+        Case(
+            "charge.get_by_property",
+            lambda c: RentChargeRepository().get_by_property(c["property_id"], load="list"),
+        ),
+        Case(
+            "charge.get_by_status",
+            lambda c: RentChargeRepository().get_by_status(ChargeStatus.IN_ARREARS),
+        ),
+        Case(
+            "charge.get_charges_for_arrears_report",
+            lambda c: RentChargeRepository().get_charges_for_arrears_report(load="arrears"),
+        ),
+        Case("charge.get_overdue", lambda c: RentChargeRepository().get_overdue()),
+        Case("charge.get_upcoming", lambda c: RentChargeRepository().get_upcoming(30)),
+        Case(
+            "charge.get_outstanding_by_property",
+            lambda c: RentChargeRepository().get_outstanding_by_property(c["property_id"]),
+        ),
+        Case("charge.get_total_arrears", lambda c: RentChargeRepository().get_total_arrears()),
+        Case(
+            "charge.get_with_allocations",
+            lambda c: RentChargeRepository().get_with_allocations(c["charge_id"], load="detail"),
+        ),
+        Case(
+            "charge.get_by_date_range",
+            lambda c: RentChargeRepository().get_by_date_range(a_year_ago, today),
+        ),
+        Case("charge.get_recent", lambda c: RentChargeRepository().get_recent(load="summary")),
+        Case("charge.list_rows", lambda c: RentChargeRepository().list_rows()),
+        Case("charge.iter_rows", lambda c: sum(1 for _ in RentChargeRepository().iter_rows())),
+        Case("charge.count_by_status", lambda c: RentChargeRepository().count_by_status()),
+        # SearchIndexRepository
+        Case("search_index.match", lambda c: SearchIndexRepository().match("tenant", "smith")),
+    ]
+
+
+def _context() -> dict:
+    """Ids of representative rows: the property with the most charges, and its rows."""
+    property_id = (
+        db_session.query(RentCharge.property_id)
+        .group_by(RentCharge.property_id)
+        .order_by(func.count(RentCharge.id).desc(), RentCharge.property_id)
+        .limit(1)
+        .scalar()
+    )
+    latest = lambda model, column: (  # noqa: E731
+        db_session.query(model.id)
+        .filter(model.property_id == property_id)
+        .order_by(column.desc(), model.id.desc())
+        .limit(1)
+        .scalar()
+    )
+    return {
+        "property_id": property_id,
+        "tenant_id": latest(Tenant, Tenant.move_in_date),
+        "payment_id": latest(Payment, Payment.payment_date),
+        "charge_id": latest(RentCharge, RentCharge.due_date),
+    }
+
+
+def _prepare(case: Case, ctx: dict) -> dict:
+    extra = case.setup(ctx) if case.setup else {}
+    # Every call starts with an empty identity map, as a request would
+    db_session.remove()
+    return {**ctx, **extra}
+
+
+def run_case(case: Case, ctx: dict, repeat: int) -> dict:
+    """Time ``case`` and measure its query count and peak memory."""
+    case.run(_prepare(case, ctx))  # warm-up
+
+    timings = []
+    for _ in range(repeat):
+        call_ctx = _prepare(case, ctx)
+        started = time.perf_counter()
+        case.run(call_ctx)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Separate instrumented run: tracemalloc slows everything down
+    call_ctx = _prepare(case, ctx)
+    tracemalloc.start()
+    with collect_query_stats() as stats:
+        case.run(call_ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db_session.remove()
+
+    timings.sort()
+    return {
+        "case": case.name,
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 3),
+        "min_ms": round(timings[0], 3),
+        "queries": stats.count,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_suite(
+    sizes: list[int],
+    months: int = 24,
+    repeat: int = 10,
+    seed: int = 42,
+    only: str | None = None,
+) -> dict:
+    """Seed each dataset size and run every case against it.
+
+    Returns:
+        {"meta": {...}, "results": [{"dataset", "case", "median_ms", ...}, ...]}
+    """
+    results = []
+    cases = [c for c in _cases() if not only or only in c.name]
+    for size in sizes:
+        truncate()
+        counts = seed_portfolio(SeedOptions(properties=size, months=months, seed=seed))
+        property_directory.invalidate()
+        ctx = _context()
+        dataset = f"{size}p"
+        print(f"dataset {dataset}: {sum(counts.values())} rows", file=sys.stderr)
+
+        for case in cases:
+            result = run_case(case, ctx, repeat)
+            results.append({"dataset": dataset, **result})
+            print(f"  {case.name:<40} {result['median_ms']:>10.3f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": get_engine().dialect.name,
+            "months": months,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float = 0.2, min_ms: float = 1.0
+) -> list[str]:
+    """Regressions of ``current`` against ``baseline``, one message each."""
+    before = {(r["dataset"], r["case"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get((result["dataset"], result["case"]))
+        if old is None:
+            continue
+        label = f"{result['dataset']} {result['case']}"
+
+        slower = result["median_ms"] - old["median_ms"]
+        if slower > min_ms and result["median_ms"] > old["median_ms"] * (1 + threshold):
+            regressions.append(
+                f"{label}: median {old['median_ms']:.3f} -> {result['median_ms']:.3f} ms"
+            )
+        if result["queries"] > old["queries"]:
+            regressions.append(f"{label}: queries {old['queries']} -> {result['queries']}")
+        if result["peak_kib"] > old["peak_kib"] * (1 + threshold) + 64:
+            regressions.append(
+                f"{label}: peak memory {old['peak_kib']} -> {result['peak_kib']} KiB"
+            )
+    return regressions
+
+
+def _print_results(results: list[dict]) -> None:
+    print(
+        f"{'dataset':<8} {'case':<40} {'median ms':>10} {'p95 ms':>10} "
+        f"{'queries':>8} {'peak KiB':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['dataset']:<8} {r['case']:<40} {r['median_ms']:>10.3f} {r['p95_ms']:>10.3f} "
+            f"{r['queries']:>8} {r['peak_kib']:>10.1f}"
+        )
+
+
+def _report_regressions(regressions: list[str]) -> int:
+    if not regressions:
+        print("No regressions.")
+        return 0
+    print(f"{len(regressions)} regression(s):")
+    for message in regressions:
+        print(f"  {message}")
+    return 1
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="project-bench", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Seed datasets and run the benchmarks")
+    run.add_argument(
+        "--sizes",
+        default="100,1000",
+        type=lambda s: [int(n) for n in s.split(",")],
+        help="Comma-separated property counts (default 100,1000)",
+    )
+    run.add_argument("--months", type=int, default=24, help="History per dataset (default 24)")
+    run.add_argument("--repeat", type=int, default=10, help="Timed runs per case (default 10)")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--only", help="Run cases whose name contains this text")
+    run.add_argument("--output", help="Write results to this JSON file")
+    run.add_argument("--baseline", help="Compare against this results file")
+
+    aio = commands.add_parser(
+        "async", help="Sync vs async services (see app.async_benchmark)"
+    )
+    aio.add_argument("--properties", type=int, default=200, help="Properties to seed")
+    aio.add_argument("--months", type=int, default=24, help="History to seed (default 24)")
+    aio.add_argument("--concurrency", type=int, default=16, help="Calls per batch (default 16)")
+    aio.add_argument(
+        "--latency-ms", type=float, default=100, help="Simulated Gmail API latency (default 100)"
+    )
+    aio.add_argument("--database", help="Use the data in this database instead of seeding")
+    aio.add_argument("--output", help="Write results to this JSON file")
+
+    cmp = commands.add_parser("compare", help="Compare two results files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+
+    for sub in (run, cmp):
+        sub.add_argument(
+            "--threshold", type=float, default=0.2, help="Allowed slowdown (default 0.2 = 20%%)"
+        )
+        sub.add_argument(
+            "--min-ms", type=float, default=1.0, help="Ignore slowdowns below this (default 1)"
+        )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Run the benchmark CLI."""
+    args = _parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        sys.exit(_report_regressions(compare(baseline, current, args.threshold, args.min_ms)))
+
+    if args.command == "async":
+        from app.async_benchmark import print_async_results, run_async_benchmark
+
+        results = run_async_benchmark(
+            args.properties, args.months, args.concurrency, args.latency_ms, args.database
+        )
+        print_async_results(results)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({"results": results}, f, indent=2)
+        return
+
+    app = create_app("testing")
+    with app.app_context():
+        init_db()
+        suite = run_suite(args.sizes, args.months, args.repeat, args.seed, args.only)
+        truncate()
+        db_session.remove()
+
+    _print_results(suite["results"])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(suite, f, indent=2)
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        sys.exit(_report_regressions(compare(baseline, suite, args.threshold, args.min_ms)))
+
+
+if __name__ == "__main__":
+    main()
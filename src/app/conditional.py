@@ -0,0 +1,130 @@
+"""Conditional GET for detail, list and report pages.
+
+``@conditional(validate)`` runs ``validate(**view_args)`` before the view.
+It returns a ``Validator``: a few ``RowVersion`` markers (count, highest
+id, latest ``updated_at``) for the rows the page shows, read with indexed
+aggregate queries. From those it derives an ETag and a Last-Modified date.
+When the client's ``If-None-Match`` (or, without one, ``If-Modified-Since``)
+still matches, the response is a 304 and the view, with its report queries
+and rendering, never runs. Otherwise the view runs and its 200 response gets
+the validators plus ``Cache-Control: private, no-cache``, so browsers keep
+the page and revalidate it on every load.
+
+The ETag also covers the URL (filters included), the template sources and,
+for ``daily=True`` pages whose content depends on today's date, the date.
+Last-Modified follows ``updated_at``, which a delete does not move. Only
+the ETag sees deletes, so rely on ``If-None-Match``, which browsers send
+whenever they have an ETag.
+
+Requests with flashed messages waiting always get the full page so the
+message is shown.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+from collections.abc import Callable, Sequence
+from datetime import date, datetime, time, timezone
+from typing import NamedTuple
+
+from flask import Flask, current_app, make_response, request, session
+
+from app.repositories.rows import RowVersion
+
+
+class Validator(NamedTuple):
+    """What a page's content depends on."""
+
+    versions: Sequence[RowVersion]
+    #: Other values the page depends on (e.g. a property id looked up by the validator)
+    extra: tuple = ()
+
+
+def _template_digest(app: Flask) -> str:
+    """Digest of the template files' names, sizes and mtimes (changes on deploy)."""
+    digest = hashlib.sha1()
+    root = os.path.join(app.root_path, app.template_folder or "templates")
+    for directory, _, files in sorted(os.walk(root)):
+        for name in sorted(files):
+            stat = os.stat(os.path.join(directory, name))
+            digest.update(f"{directory}/{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def _utc(stamp: datetime) -> datetime:
+    # Naive database timestamps are taken as UTC
+    if stamp.tzinfo is None:
+        return stamp.replace(tzinfo=timezone.utc)
+    return stamp.astimezone(timezone.utc)
+
+
+def _last_modified(validator: Validator, daily: bool) -> datetime | None:
+    stamps = [_utc(v.last_modified) for v in validator.versions if v.last_modified is not None]
+    if daily:
+        stamps.append(_utc(datetime.combine(date.today(), time.min)))
+    # HTTP dates have whole seconds
+    return max(stamps).replace(microsecond=0) if stamps else None
+
+
+def _etag(validator: Validator, daily: bool) -> str:
+    parts = (
+        current_app.extensions["conditional_get_salt"],
+        request.full_path,
+        tuple(validator.versions),
+        validator.extra,
+        date.today().isoformat() if daily else "",
+    )
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:32]
+
+
+def _not_modified(etag: str, last_modified: datetime | None) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional(validate: Callable[..., Validator | None], daily: bool = False):
+    """Decorator: answer conditional GETs for the view from ``validate(**view_args)``.
+
+    ``validate`` returning None (e.g. the row does not exist) skips the
+    conditional handling for that request.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            run = current_app.ensure_sync(view)
+            if request.method not in ("GET", "HEAD") or session.get("_flashes"):
+                return run(**kwargs)
+
+            validator = validate(**kwargs)
+            if validator is None:
+                return run(**kwargs)
+
+            etag = _etag(validator, daily)
+            last_modified = _last_modified(validator, daily)
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(run(**kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers["Cache-Control"] = current_app.config["CONDITIONAL_CACHE_CONTROL"]
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def init_conditional_get(app: Flask) -> None:
+    """Salt ``app``'s ETags with its template sources."""
+    app.extensions["conditional_get_salt"] = _template_digest(app)
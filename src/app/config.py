@@ -1,6 +1,7 @@
 """Flask application configuration."""
 
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -32,10 +33,75 @@ class Config:
     DB_PASSWORD = os.environ.get("DB_PASSWORD", "")
     DB_NAME = os.environ.get("DB_NAME", "renttrack")
 
-    SQLALCHEMY_DATABASE_URI = (
+    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or (
         f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
+    # Optional read replica for GET requests and reports (see app.database)
+    SQLALCHEMY_REPLICA_URI = os.environ.get("DATABASE_REPLICA_URL")
+    REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", 5))
+    REPLICA_CHECK_INTERVAL = float(os.environ.get("REPLICA_CHECK_INTERVAL", 5))
+    # Seconds to wait for a replica connection before reading from the primary instead
+    REPLICA_CONNECT_TIMEOUT = float(os.environ.get("REPLICA_CONNECT_TIMEOUT", 2))
+    # How long a client that just wrote keeps reading from the primary
+    REPLICA_STICKY_SECONDS = float(os.environ.get("REPLICA_STICKY_SECONDS", 10))
+
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ECHO = False
+
+    # Connection pool (ignored for SQLite)
+    SQLALCHEMY_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+    SQLALCHEMY_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    SQLALCHEMY_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", 30))
+    SQLALCHEMY_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 3600))
+
+    # Per-request SQL statistics (X-DB-* headers, N+1 warnings)
+    SQL_QUERY_STATS = os.environ.get("SQL_QUERY_STATS", "1") == "1"
+    SQL_REPEAT_THRESHOLD = int(os.environ.get("SQL_REPEAT_THRESHOLD", 10))
+    # Relationships not named in a repository load plan raise instead of lazy loading
+    SQL_RAISE_ON_LAZY_LOAD = False
+    # Rows per fetch for the streaming repository methods (iter_all, iter_rows, ...)
+    SQL_STREAM_CHUNK_SIZE = int(os.environ.get("SQL_STREAM_CHUNK_SIZE", 1000))
+    # Streamed list/report pages send their HTML in chunks of about this many characters
+    STREAM_TEMPLATE_BUFFER_BYTES = int(os.environ.get("STREAM_TEMPLATE_BUFFER_BYTES", 16 * 1024))
+
+    # Bearer token for GET /_worker/stats under project-serve (unset: no such route); only
+    # direct loopback clients are answered, never requests forwarded by a proxy
+    WORKER_STATS_TOKEN = os.environ.get("WORKER_STATS_TOKEN", "")
+
+    # Property directory cache (property select boxes)
+    PROPERTY_CACHE_TTL = int(os.environ.get("PROPERTY_CACHE_TTL", 60))
+    PROPERTY_CACHE_MAX_ENTRIES = int(os.environ.get("PROPERTY_CACHE_MAX_ENTRIES", 10000))
+
+    # Fragment cache for {% cache %} blocks: file:///dir, redis://host/db, memory:// or null://
+    # (the default directory is shared by the host's workers, so they all see each write;
+    # keys are namespaced by a hash of the database URL, so other databases' apps never collide)
+    FRAGMENT_CACHE_URL = os.environ.get(
+        "FRAGMENT_CACHE_URL", "file://" + os.path.join(tempfile.gettempdir(), "renttrack-fragments")
+    )
+    FRAGMENT_CACHE_TTL = int(os.environ.get("FRAGMENT_CACHE_TTL", 300))
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get("FRAGMENT_CACHE_MAX_ENTRIES", 1000))
+    FRAGMENT_CACHE_PREFIX = os.environ.get("FRAGMENT_CACHE_PREFIX", "renttrack:")
+
+    # Cache-Control for pages answering conditional GETs (browsers keep them and revalidate)
+    CONDITIONAL_CACHE_CONTROL = os.environ.get("CONDITIONAL_CACHE_CONTROL", "private, no-cache")
+
+    # JSON API (/api/v1): page sizes, and responses at least this large are gzipped
+    API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", 100))
+    API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 1000))
+    API_GZIP_MIN_BYTES = int(os.environ.get("API_GZIP_MIN_BYTES", 1024))
+    # Change feed holds back entries this recent, so lower sequence numbers still committing
+    # are not skipped (keep above the longest write transaction plus replica lag)
+    CHANGE_FEED_SETTLE_SECONDS = float(os.environ.get("CHANGE_FEED_SETTLE_SECONDS", 5))
+
+    # Idempotency keys: seconds a saved result is kept, and a retry waits for a running original
+    IDEMPOTENCY_KEY_TTL = int(os.environ.get("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", 5))
+    # A retry takes over a key whose request wrote nothing and has not finished after this long
+    # (its worker died); keep well above the worker timeout (project-serve --timeout, 30)
+    IDEMPOTENCY_LEASE_SECONDS = float(os.environ.get("IDEMPOTENCY_LEASE_SECONDS", 120))
+
+    # Property selects switch to a typeahead search box above this many properties
+    TYPEAHEAD_THRESHOLD = int(os.environ.get("TYPEAHEAD_THRESHOLD", 200))
 
 
 class DevelopmentConfig(Config):
@@ -44,6 +110,8 @@ class DevelopmentConfig(Config):
     DEBUG = True
     TESTING = False
 
+    SQL_RAISE_ON_LAZY_LOAD = os.environ.get("SQL_RAISE_ON_LAZY_LOAD", "1") == "1"
+
 
 class ProductionConfig(Config):
     """Production configuration."""
@@ -51,13 +119,24 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
 
+    SQLALCHEMY_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 10))
+    SQLALCHEMY_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 20))
+    SQLALCHEMY_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+
+    SQL_QUERY_STATS = os.environ.get("SQL_QUERY_STATS", "0") == "1"
+
 
 class TestingConfig(Config):
     """Testing configuration."""
 
     DEBUG = True
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_DATABASE_URI = os.environ.get("TEST_DATABASE_URL", "sqlite:///:memory:")
+    SQLALCHEMY_REPLICA_URI = os.environ.get("TEST_DATABASE_REPLICA_URL")
+    WTF_CSRF_ENABLED = False
+    SQL_RAISE_ON_LAZY_LOAD = True
+    # Each test database is private to its process, and so are its fragments
+    FRAGMENT_CACHE_URL = "memory://"
 
 
 config_by_name = {
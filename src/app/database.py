@@ -1,30 +1,564 @@
-"""Database session management for Flask application."""
+"""Database session management for Flask application.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+The engine is created lazily from the configuration chosen in ``create_app``
+(``init_engine``). Code that runs outside an app (scripts, shells) gets an
+engine built from the ``FLASK_ENV`` config the first time a session is used.
 
-from app.config import Config
+With ``SQLALCHEMY_REPLICA_URI`` set, sessions route SELECTs to a read replica
+while they are in replica mode (``replica_reads()``, or every GET request via
+``init_read_routing``). Flushes, DML and anything after the session's first
+write go to the primary, and the replica is skipped while it is unreachable or
+lags more than ``REPLICA_MAX_LAG_SECONDS``.
 
-# Create engine with connection pooling
-engine = create_engine(
-    Config.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-)
+``async_session()`` opens an ``AsyncSession`` on the same databases through
+the asyncio drivers (aiosqlite, aiomysql) for the async repositories and
+services. Its connections come from pools that live on one background event
+loop, so they are reused across Flask's per-request loops.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from functools import lru_cache
+
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import config_by_name
+
+logger = logging.getLogger(__name__)
+
+_engine: Engine | None = None
+_replica_engine: Engine | None = None
+_engine_config: Mapping = {}
+# Async engines by role ("primary" / "replica"), created on first use in this process
+_async_engines: dict[str, AsyncEngine] = {}
+_async_pid: int | None = None
+_engine_lock = threading.RLock()
+
+# Session.info keys
+_REPLICA_DEPTH = "replica_reads"
+_PRIMARY_DEPTH = "primary_reads"
+_PINNED = "pinned_to_primary"
+_WROTE = "wrote"
+
+
+def _config_as_mapping(config) -> Mapping:
+    if isinstance(config, Mapping):
+        return config
+    return {key: getattr(config, key) for key in dir(config) if key.isupper()}
+
+
+def _engine_options(config: Mapping, connect_timeout: float | None = None) -> dict:
+    """create_engine() keyword arguments for the configured database.
+
+    ``connect_timeout`` bounds how long opening a server connection may take.
+    """
+    url = config["SQLALCHEMY_DATABASE_URI"]
+    options = {"echo": config.get("SQLALCHEMY_ECHO", False)}
+
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in url or url in ("sqlite://", "sqlite:///"):
+            # One shared connection, otherwise every thread sees an empty database
+            options["poolclass"] = StaticPool
+        return options
+
+    options.update(
+        pool_pre_ping=True,
+        pool_size=config.get("SQLALCHEMY_POOL_SIZE", 5),
+        max_overflow=config.get("SQLALCHEMY_MAX_OVERFLOW", 10),
+        pool_timeout=config.get("SQLALCHEMY_POOL_TIMEOUT", 30),
+        pool_recycle=config.get("SQLALCHEMY_POOL_RECYCLE", 3600),
+    )
+    if connect_timeout:
+        options["connect_args"] = {"connect_timeout": connect_timeout}
+    return options
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # ondelete="CASCADE" only works in SQLite with foreign keys switched on
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _create_engine(url: str, config: Mapping, connect_timeout: float | None = None) -> Engine:
+    options = _engine_options({**config, "SQLALCHEMY_DATABASE_URI": url}, connect_timeout)
+    engine = create_engine(url, **options)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    return engine
+
+
+def init_engine(config) -> Engine:
+    """Create the engine for a config (Flask ``app.config`` or a Config class).
+
+    Also creates the read-replica engine when ``SQLALCHEMY_REPLICA_URI`` is
+    set. Replaces (and disposes) any engines created earlier.
+    """
+    global _engine, _replica_engine, _engine_config
+
+    config = _config_as_mapping(config)
+    engine = _create_engine(config["SQLALCHEMY_DATABASE_URI"], config)
+    replica_url = config.get("SQLALCHEMY_REPLICA_URI")
+    replica = None
+    if replica_url:
+        # Short, so a hung replica fails its health check fast instead of stalling requests
+        replica = _create_engine(replica_url, config, config.get("REPLICA_CONNECT_TIMEOUT", 2))
+    if replica is not None:
+        event.listen(replica, "handle_error", _replica_error)
+
+    with _engine_lock:
+        previous = (_engine, _replica_engine)
+        _engine, _replica_engine = engine, replica
+        _engine_config = config
+        _drop_async_engines()
+        replica_health.configure(
+            max_lag=config.get("REPLICA_MAX_LAG_SECONDS", 5),
+            check_interval=config.get("REPLICA_CHECK_INTERVAL", 5),
+        )
+    db_session.remove()
+    for old in previous:
+        if old is not None:
+            old.dispose()
+    return engine
+
+
+def get_engine() -> Engine:
+    """Return the engine, creating it from the FLASK_ENV config on first use."""
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                init_engine(config_by_name[os.environ.get("FLASK_ENV", "development")])
+    return _engine
+
+
+def get_replica_engine() -> Engine | None:
+    """The read-replica engine, or None when no replica is configured."""
+    get_engine()
+    return _replica_engine
+
+
+def dispose_engine(close: bool = True) -> None:
+    """Drop pooled connections (use ``close=False`` in a freshly forked process)."""
+    for engine in (_engine, _replica_engine):
+        if engine is not None:
+            engine.dispose(close=close)
+    with _engine_lock:
+        _drop_async_engines(close=close)
+
+
+def _replica_lag(connection: Connection) -> float | None:
+    """Seconds the replica is behind its primary (None: replication stopped).
+
+    Only MySQL reports lag; other databases (e.g. a copied SQLite file) count
+    as current.
+    """
+    if connection.dialect.name != "mysql":
+        return 0.0
+    for statement, column in (
+        ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+        ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+    ):
+        try:
+            row = connection.exec_driver_sql(statement).mappings().first()
+        except Exception:
+            continue
+        return row[column] if row else 0.0
+    return 0.0
+
+
+class ReplicaHealth:
+    """Whether reads may go to the replica, re-checked every ``check_interval`` seconds.
+
+    A check opens a replica connection and asks ``lag_probe`` for the lag; a
+    failed connection, stopped replication or lag above ``max_lag`` sends
+    reads back to the primary until a later check passes. One thread runs
+    each check, outside the lock; the others keep the last known state
+    meanwhile, so a hung replica never blocks them.
+    """
+
+    def __init__(self, lag_probe: Callable[[Connection], float | None] = _replica_lag):
+        self.lag_probe = lag_probe
+        self.max_lag = 5.0
+        self.check_interval = 5.0
+        self._lock = threading.Lock()
+        self._healthy = False
+        self._checking = False
+        self._checked_at = float("-inf")
+
+    def configure(self, max_lag: float, check_interval: float) -> None:
+        """Apply settings and force a fresh check on next use."""
+        with self._lock:
+            self.max_lag = float(max_lag)
+            self.check_interval = float(check_interval)
+            self._checked_at = float("-inf")
+
+    def mark_down(self) -> None:
+        """Stop using the replica until the next check succeeds."""
+        with self._lock:
+            self._healthy = False
+            self._checked_at = time.monotonic()
+
+    def available(self, engine: Engine) -> bool:
+        """True if ``engine`` (the replica) passed its most recent check."""
+        with self._lock:
+            if self._checking or time.monotonic() - self._checked_at < self.check_interval:
+                return self._healthy
+            self._checking = True
+        healthy = False
+        try:
+            healthy = self._check(engine)
+        finally:
+            with self._lock:
+                self._healthy, self._checking = healthy, False
+                self._checked_at = time.monotonic()
+        return healthy
+
+    def _check(self, engine: Engine) -> bool:
+        try:
+            with engine.connect() as connection:
+                lag = self.lag_probe(connection)
+        except Exception as e:
+            logger.warning("Read replica unavailable, using primary: %s", e)
+            return False
+        if lag is None or lag > self.max_lag:
+            logger.warning("Read replica lag %s s, using primary", lag)
+            return False
+        return True
+
+
+replica_health = ReplicaHealth()
+
+
+def _replica_error(context) -> None:
+    # The replica dropped or refused a connection: route reads to the primary from now on
+    if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+        replica_health.mark_down()
+
+
+class RoutingSession(Session):
+    """Session that sends SELECTs to the read replica while in replica mode.
+
+    Everything else (flushes, DML, ``session.connection()``) goes to the
+    primary, as does every statement once the session has written something,
+    so a request reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        primary = get_engine()
+        if (
+            self._flushing
+            or not self.info.get(_REPLICA_DEPTH)
+            or self.info.get(_PRIMARY_DEPTH)
+            or self.info.get(_PINNED)
+            or not getattr(clause, "is_select", False)
+        ):
+            return primary
+        replica = _replica_engine
+        if replica is None or not replica_health.available(replica):
+            return primary
+        return replica
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_after_write(session, flush_context):
+    session.info[_PINNED] = session.info[_WROTE] = True
+
+
+def pin_to_primary(session=None) -> None:
+    """Send every further statement of ``session`` (default: db_session) to the primary."""
+    (session or db_session).info[_PINNED] = True
+
+
+def is_pinned_to_primary(session=None) -> bool:
+    """True once ``session`` has written or been pinned with ``pin_to_primary``."""
+    return bool((session or db_session).info.get(_PINNED))
+
+
+def has_written(session=None) -> bool:
+    """True once ``session`` has flushed changes."""
+    return bool((session or db_session).info.get(_WROTE))
+
+
+@contextmanager
+def replica_reads(session=None) -> Iterator[None]:
+    """Route the block's SELECTs to the read replica (unless the session has written)."""
+    session = session or db_session
+    session.info[_REPLICA_DEPTH] = session.info.get(_REPLICA_DEPTH, 0) + 1
+    try:
+        yield
+    finally:
+        session.info[_REPLICA_DEPTH] -= 1
+
+
+@contextmanager
+def primary_reads(session=None) -> Iterator[None]:
+    """Route the block's SELECTs to the primary, even inside ``replica_reads()``.
+
+    ``replica_reads()`` blocks opened within it (``@reads_from_replica``
+    service calls) read from the primary too.
+    """
+    session = session or db_session
+    session.info[_PRIMARY_DEPTH] = session.info.get(_PRIMARY_DEPTH, 0) + 1
+    try:
+        yield
+    finally:
+        session.info[_PRIMARY_DEPTH] -= 1
+
+
+def reads_from_replica(func):
+    """Method decorator: run ``func`` inside ``replica_reads()`` on the instance's session.
+
+    That is ``self._session`` (a service built on an explicit session, such as
+    ``ReportService(session)`` inside ``AsyncReportService``), or db_session.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with replica_reads(getattr(self, "_session", None)):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+_session_factory = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
 
 # Scoped session for thread safety
-db_session = scoped_session(
-    sessionmaker(autocommit=False, autoflush=False, bind=engine)
-)
+db_session = scoped_session(_session_factory)
+
+
+# --- asyncio ------------------------------------------------------------------
+
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "mysql": "mysql+aiomysql"}
+
+
+def async_url(url: str) -> str:
+    """The asyncio-driver URL for a configured (sync) database URL."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for {backend!r}")
+    if backend == "sqlite" and parsed.database in (None, "", ":memory:"):
+        raise ValueError("Async sessions need a file or server database, not in-memory SQLite")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def async_available() -> bool:
+    """Whether ``async_session()`` can reach the configured database.
+
+    False for in-memory SQLite (the testing default) and for databases
+    without an asyncio driver.
+    """
+    get_engine()
+    try:
+        async_url(_engine_config["SQLALCHEMY_DATABASE_URI"])
+    except ValueError:
+        return False
+    return True
+
+
+class _DatabaseLoop:
+    """Background event loop that owns the async engines' connections.
+
+    asyncio connections belong to the loop that opened them, and Flask runs
+    each async view in a loop of its own, so a pool shared by requests has to
+    live on a loop that outlasts them. Started on first use in each process.
+    """
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="db-loop", daemon=True).start()
+                self._loop, self._pid = loop, os.getpid()
+            return self._loop
+
+    def running(self) -> asyncio.AbstractEventLoop | None:
+        """The loop, if it was started in this process."""
+        return self._loop if self._pid == os.getpid() else None
+
+    async def run(self, awaitable):
+        """Await ``awaitable`` on the database loop, from any loop."""
+        loop = self.get()
+        if asyncio.get_running_loop() is loop:
+            return await awaitable
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(awaitable, loop))
+
+
+_database_loop = _DatabaseLoop()
+
+
+def _drop_async_engines(close: bool = True) -> None:
+    """Forget the async engines, closing their connections on the database loop.
+
+    Call with ``_engine_lock`` held.
+    """
+    global _async_pid
+    loop = _database_loop.running()
+    if close and loop is not None and _async_pid == os.getpid():
+        for engine in _async_engines.values():
+            asyncio.run_coroutine_threadsafe(engine.dispose(), loop)
+    _async_engines.clear()
+    _async_pid = os.getpid()
+
+
+class PooledAsyncSession(AsyncSession):
+    """``AsyncSession`` whose database work runs on the database loop.
+
+    Can be used from any event loop; connections return to the shared pool
+    when the session closes.
+    """
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await _database_loop.run(super().run_sync(fn, *args, **kwargs))
+
+    async def execute(self, *args, **kwargs):
+        return await _database_loop.run(super().execute(*args, **kwargs))
+
+    async def scalar(self, *args, **kwargs):
+        return await _database_loop.run(super().scalar(*args, **kwargs))
+
+    async def scalars(self, *args, **kwargs):
+        return await _database_loop.run(super().scalars(*args, **kwargs))
+
+    async def get(self, *args, **kwargs):
+        return await _database_loop.run(super().get(*args, **kwargs))
+
+    async def flush(self, *args, **kwargs):
+        return await _database_loop.run(super().flush(*args, **kwargs))
+
+    async def commit(self):
+        return await _database_loop.run(super().commit())
+
+    async def rollback(self):
+        return await _database_loop.run(super().rollback())
+
+    async def close(self):
+        return await _database_loop.run(super().close())
+
+
+def get_async_engine(replica: bool = False) -> AsyncEngine:
+    """Async engine for the primary (or the configured replica).
+
+    Built once per process, with the same pool settings as the sync engine;
+    its connections are opened and used on the database loop.
+    """
+    get_engine()
+    role = "replica" if replica else "primary"
+    with _engine_lock:
+        if _async_pid != os.getpid():
+            # Forked: the parent's connections and loop are not ours
+            _drop_async_engines(close=False)
+        engine = _async_engines.get(role)
+        if engine is None:
+            key = "SQLALCHEMY_REPLICA_URI" if replica else "SQLALCHEMY_DATABASE_URI"
+            url = _engine_config[key]
+            timeout = _engine_config.get("REPLICA_CONNECT_TIMEOUT", 2) if replica else None
+            options = _engine_options({**_engine_config, "SQLALCHEMY_DATABASE_URI": url}, timeout)
+            engine = create_async_engine(async_url(url), **options)
+            if engine.dialect.name == "sqlite":
+                event.listen(engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+            _async_engines[role] = engine
+    return engine
+
+
+def async_session(replica: bool = False) -> AsyncSession:
+    """New AsyncSession (use as ``async with``) on the primary or, if asked, the replica.
+
+    The replica is only used while ``replica_health`` reports it current.
+    """
+    bind = None
+    if replica:
+        replica_engine = get_replica_engine()
+        if replica_engine is not None and replica_health.available(replica_engine):
+            bind = get_async_engine(replica=True)
+    return PooledAsyncSession(bind or get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+def bulk_insert(connection: Connection, table: Table, rows: list[dict]) -> None:
+    """executemany a plain INSERT of ``rows`` (dicts with identical keys).
+
+    ``connection.execute(table.insert(), rows)`` compiles parameters row by
+    row, which dominates large loads. Here the statement is rendered once and
+    values go straight through each column type's bind processor (memoized,
+    since dates and amounts repeat heavily).
+    """
+    if not rows:
+        return
+    dialect = connection.dialect
+    preparer = dialect.identifier_preparer
+    names = list(rows[0])
+    columns = [table.c[name] for name in names]
+    processors = []
+    for column in columns:
+        process = column.type.dialect_impl(dialect).bind_processor(dialect)
+        processors.append(lru_cache(maxsize=4096)(process) if process else None)
+
+    placeholder = "?" if dialect.paramstyle == "qmark" else "%s"
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        preparer.format_table(table),
+        ", ".join(preparer.quote(column.name) for column in columns),
+        ", ".join([placeholder] * len(columns)),
+    )
+    params = [
+        tuple(
+            process(row[name]) if process else row[name]
+            for name, process in zip(names, processors)
+        )
+        for row in rows
+    ]
+    connection.exec_driver_sql(sql, params)
 
 
 def init_db():
     """Initialize database - create all tables."""
     from app.models.base import Base
 
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 
 def shutdown_session(exception=None):
     """Remove database session at end of request."""
     db_session.remove()
+
+
+def init_read_routing(app) -> None:
+    """Serve GET/HEAD requests from the read replica.
+
+    After a request that wrote, the client's Flask session keeps it on the
+    primary for ``REPLICA_STICKY_SECONDS`` so the page it is redirected to
+    shows its own changes even while the replica catches up.
+    """
+    from flask import request, session
+
+    sticky = app.config.get("REPLICA_STICKY_SECONDS", 10)
+
+    @app.before_request
+    def _route_reads():
+        if session.get("primary_until", 0) > time.time():
+            pin_to_primary()
+        elif request.method in ("GET", "HEAD"):
+            db_session.info[_REPLICA_DEPTH] = 1
+
+    @app.after_request
+    def _stick_to_primary(response):
+        if db_session.registry.has() and has_written():
+            session["primary_until"] = time.time() + sticky
+        return response
@@ -0,0 +1,82 @@
+"""Export ledger tables and reports as CSV or NDJSON (``project-export``).
+
+Rows are streamed from the database and written as they are encoded, so
+multi-year exports start writing at once and run in constant memory. Reads
+go to the read replica when one is configured.
+
+    project-export payments --start-date 2024-01-01 --output payments.csv
+    project-export rent-charges --format ndjson --property-id 12 --gzip > charges.ndjson.gz
+    project-export --list
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+from app import create_app
+from app.database import db_session, replica_reads
+from app.services.export_service import DATASETS, FORMATS, ExportFilters, ExportService
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="project-export", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--env", default=os.environ.get("FLASK_ENV", "development"), help="Config name"
+    )
+    parser.add_argument("dataset", nargs="?", choices=sorted(DATASETS), help="What to export")
+    parser.add_argument("--list", action="store_true", help="List the datasets and exit")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--property-id", type=int)
+    parser.add_argument("--tenant-id", type=int)
+    parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+    parser.add_argument("--output", "-o", help="Output file (default stdout)")
+    args = parser.parse_args(argv)
+    if not args.list and not args.dataset:
+        parser.error("a dataset is required (see --list)")
+    return args
+
+
+def _print_datasets() -> None:
+    for name, spec in DATASETS.items():
+        filters = ", ".join(spec.filters) or "-"
+        print(f"{name:<17} {spec.description}  [filters: {filters}]")
+
+
+def _write(args: argparse.Namespace, filters: ExportFilters) -> None:
+    try:
+        chunks = ExportService().stream(args.dataset, args.format, filters, args.gzip)
+    except ValueError as e:
+        sys.exit(f"project-export: {e}")
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            out.flush()
+    finally:
+        if args.output:
+            out.close()
+
+
+def main(argv=None) -> None:
+    """Run the export CLI."""
+    args = _parse_args(argv)
+    if args.list:
+        _print_datasets()
+        return
+
+    filters = ExportFilters(args.start_date, args.end_date, args.property_id, args.tenant_id)
+    app = create_app(args.env)
+    with app.app_context():
+        try:
+            with replica_reads():
+                _write(args, filters)
+        finally:
+            db_session.remove()
+
+
+if __name__ == "__main__":
+    main()
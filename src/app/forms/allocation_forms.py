@@ -1,53 +1,80 @@
 """WTForms for payment allocation management."""
 
+from collections.abc import Iterable
+from decimal import Decimal
+
 from flask_wtf import FlaskForm
-from wtforms import DecimalField, SelectField, SubmitField
-from wtforms.validators import DataRequired, NumberRange
+from wtforms import DecimalField, FieldList, Form, FormField, IntegerField, SubmitField
+from wtforms.validators import DataRequired, NumberRange, Optional
+from wtforms.widgets import HiddenInput
 
 
-class AllocationForm(FlaskForm):
-    """Form for creating payment allocations."""
+class AllocationLineForm(Form):
+    """One charge row of ``AllocationForm``: the charge and the amount to put on it."""
 
-    rent_charge_id = SelectField(
-        "Rent Charge",
-        validators=[DataRequired(message="Rent charge is required")],
-        coerce=int,
-    )
+    rent_charge_id = IntegerField(widget=HiddenInput(), validators=[DataRequired()])
 
     amount = DecimalField(
         "Amount to Allocate ($)",
+        places=2,
         validators=[
-            DataRequired(message="Amount is required"),
+            Optional(),
             NumberRange(min=0.01, message="Amount must be positive"),
         ],
         render_kw={"placeholder": "0.00", "step": "0.01"},
     )
 
+
+class AllocationForm(FlaskForm):
+    """Form for allocating a payment across several rent charges at once.
+
+    One line per outstanding charge; lines left blank are ignored.
+    """
+
+    lines = FieldList(FormField(AllocationLineForm))
+
     submit = SubmitField("Allocate Payment")
 
-    def __init__(self, property_id: int | None = None, *args, **kwargs):
-        """Initialize form with charge choices for a property.
+    def __init__(self, charges: Iterable = (), *args, **kwargs):
+        """Initialize form with one line per charge.
 
         Args:
-            property_id: Filter charges by this property
+            charges: Outstanding charges, already loaded by the caller (used
+                when the form is not being submitted)
         """
         super().__init__(*args, **kwargs)
-        if property_id:
-            from app.repositories.rent_charge_repository import RentChargeRepository
-
-            repo = RentChargeRepository()
-            charges = repo.get_outstanding_by_property(property_id)
-            self.rent_charge_id.choices = [
-                (
-                    c.id,
-                    f"{c.period_start.strftime('%b %d')} - "
-                    f"{c.period_end.strftime('%b %d, %Y')} "
-                    f"(${c.amount_due:,.2f} due {c.due_date.strftime('%b %d')})",
-                )
-                for c in charges
-            ]
-        else:
-            self.rent_charge_id.choices = []
+        if not self.lines.entries:
+            for charge in charges:
+                self.lines.append_entry({"rent_charge_id": charge.id})
+
+    def by_charge(self) -> dict[int, FormField]:
+        """Lines keyed by rent charge ID (lines without a valid ID are left out)."""
+        return {
+            line.rent_charge_id.data: line
+            for line in self.lines
+            if line.rent_charge_id.data is not None
+        }
+
+    def amounts(self) -> list[tuple[int, Decimal]]:
+        """(rent charge ID, amount) pairs of the lines filled in."""
+        return [
+            (line.rent_charge_id.data, line.amount.data)
+            for line in self.lines
+            if line.amount.data and line.rent_charge_id.data is not None
+        ]
+
+    def validate(self, extra_validators=None) -> bool:
+        valid = super().validate(extra_validators)
+        if any(line.rent_charge_id.errors for line in self.lines):
+            # The IDs are hidden fields: a bad one means a stale or tampered page
+            self.form_errors.append("The form lists an unknown charge; reload the page.")
+            return False
+        if not valid:
+            return False
+        if not self.amounts():
+            self.form_errors.append("Enter an amount for at least one charge.")
+            return False
+        return True
 
 
 class AutoAllocationForm(FlaskForm):
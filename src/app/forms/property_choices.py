@@ -0,0 +1,43 @@
+"""Property select-field choices: full list for small portfolios, typeahead otherwise."""
+
+from flask import current_app, has_app_context, url_for
+from wtforms import SelectField
+
+from app.repositories.property_directory import property_directory
+
+
+def set_property_choices(
+    field: SelectField,
+    blank: tuple[int, str] | None = None,
+    active_only: bool = False,
+) -> None:
+    """Fill a property SelectField.
+
+    Up to ``TYPEAHEAD_THRESHOLD`` properties are rendered as options. Above
+    that only the selected property (if any) is rendered, and the field is
+    marked with ``data-typeahead`` so main.js turns it into a search box backed
+    by ``/search/properties``. Validation still accepts only existing (and,
+    with ``active_only``, active) properties.
+
+    Args:
+        field: The bound SelectField (coerce=int)
+        blank: Optional leading choice such as ``(0, "All Properties")``
+        active_only: Offer active properties only
+    """
+    threshold = current_app.config.get("TYPEAHEAD_THRESHOLD", 200) if has_app_context() else 200
+
+    # Counted first, so a large portfolio is never listed just to be left out
+    if property_directory.count(active_only) <= threshold:
+        choices = property_directory.choices(active_only)
+    else:
+        selected = property_directory.get(field.data) if field.data else None
+        if selected and (selected.is_active or not active_only):
+            choices = [(selected.id, selected.label)]
+        else:
+            choices = []
+        field.render_kw = {
+            **(field.render_kw or {}),
+            "data-typeahead": url_for("search.properties", active=1 if active_only else None),
+        }
+
+    field.choices = ([blank] if blank else []) + choices
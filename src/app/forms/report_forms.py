@@ -41,10 +41,6 @@ class PropertyReportForm(FlaskForm):
     def __init__(self, *args, **kwargs):
         """Initialize form with property choices."""
         super().__init__(*args, **kwargs)
-        from app.repositories.property_repository import PropertyRepository
+        from app.forms.property_choices import set_property_choices
 
-        repo = PropertyRepository()
-        properties = repo.get_all()
-        self.property_id.choices = [
-            (p.id, f"{p.address}, {p.city}") for p in properties
-        ]
+        set_property_choices(self.property_id)
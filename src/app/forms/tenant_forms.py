@@ -59,13 +59,9 @@ class TenantForm(FlaskForm):
     def __init__(self, *args, **kwargs):
         """Initialize form with property choices."""
         super().__init__(*args, **kwargs)
-        from app.repositories.property_repository import PropertyRepository
+        from app.forms.property_choices import set_property_choices
 
-        repo = PropertyRepository()
-        properties = repo.get_active()
-        self.property_id.choices = [
-            (p.id, f"{p.address}, {p.city}") for p in properties
-        ]
+        set_property_choices(self.property_id, active_only=True)
 
 
 class TenantEditForm(TenantForm):
@@ -83,10 +79,6 @@ class TenantFilterForm(FlaskForm):
     def __init__(self, *args, **kwargs):
         """Initialize form with property choices including 'All'."""
         super().__init__(*args, **kwargs)
-        from app.repositories.property_repository import PropertyRepository
+        from app.forms.property_choices import set_property_choices
 
-        repo = PropertyRepository()
-        properties = repo.get_all()
-        self.property_id.choices = [(0, "All Properties")] + [
-            (p.id, f"{p.address}, {p.city}") for p in properties
-        ]
+        set_property_choices(self.property_id, blank=(0, "All Properties"))
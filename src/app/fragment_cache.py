@@ -0,0 +1,351 @@
+"""Jinja fragment cache for dashboard panels and report partials.
+
+Wrap a fragment in ``{% cache %}`` with a name and the values it depends on::
+
+    {% cache "dashboard.recent_payments", versions("payments", "properties") %}
+        {% set payments = reports.get_recent_payments() %}
+        ...
+    {% endcache %}
+
+The rendered HTML is stored under the name plus those values and reused
+until one of them changes; anything the block computes (queries included)
+is skipped on a hit. ``versions(*tables)`` returns the tables' current
+version tokens: every committed ORM insert, update or delete on a table
+gives it a new token, so fragments built from it miss from then on. Writes
+that bypass the ORM (``project-seed`` bulk inserts, raw SQL) leave the
+tokens alone; such fragments expire after ``FRAGMENT_CACHE_TTL``.
+
+The backend is chosen by ``FRAGMENT_CACHE_URL``:
+
+* ``file:///path/to/dir``: one file per fragment, shared by the workers on
+  a host (the default, under the system temp directory).
+* ``redis://host:6379/0``: any Redis-compatible server, shared by all hosts
+  (needs the ``redis`` package: ``pip install project[redis]``).
+* ``memory://``: per-process LRU of ``FRAGMENT_CACHE_MAX_ENTRIES``
+  fragments. Version tokens are per process too, so other workers see a
+  write only once their copy expires (``FRAGMENT_CACHE_TTL``). Only for a
+  single process, such as the tests.
+* ``null://``: caching off.
+
+Fragments are shared across requests, so they are rendered from the
+primary even inside ``replica_reads()``: a lagging replica's rows stored
+under the newest version token would be served until the next write.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+from urllib.parse import urlparse
+
+from flask import Flask, current_app, has_app_context
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database import primary_reads
+
+_CHANGED_TABLES = "fragment_cache_changed_tables"
+_listeners_installed = False
+
+
+class CacheBackend:
+    """Key-value store for rendered fragments and version tokens."""
+
+    def get(self, key: str) -> str | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        """Store ``value``; ``ttl`` seconds, or no expiry when None."""
+        raise NotImplementedError
+
+
+class NullBackend(CacheBackend):
+    """Stores nothing."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Thread-safe LRU in this process."""
+
+    def __init__(self, max_entries: int = 1000):
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float | None, str]] = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class FileBackend(CacheBackend):
+    """One file per key in ``directory``, written atomically.
+
+    Expired files are removed when read and by a sweep every
+    ``sweep_every`` writes.
+    """
+
+    def __init__(self, directory: str, sweep_every: int = 200):
+        self._directory = directory
+        self._sweep_every = sweep_every
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, hashlib.sha1(key.encode()).hexdigest())
+
+    @staticmethod
+    def _read(path: str) -> tuple[float, str] | None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                expires, _, value = f.read().partition("\n")
+        except (FileNotFoundError, ValueError):
+            return None
+        return float(expires), value
+
+    def get(self, key):
+        path = self._path(key)
+        entry = self._read(path)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires and expires <= time.time():
+            self._remove(path)
+            return None
+        return value
+
+    def set(self, key, value, ttl=None):
+        expires = 0 if ttl is None else time.time() + ttl
+        fd, tmp = tempfile.mkstemp(dir=self._directory, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(f"{expires}\n{value}")
+        os.replace(tmp, self._path(key))
+
+        self._writes += 1
+        if self._writes % self._sweep_every == 0:
+            self._sweep()
+
+    def _sweep(self) -> None:
+        now = time.time()
+        for name in os.listdir(self._directory):
+            if name.startswith(".tmp-"):
+                continue
+            path = os.path.join(self._directory, name)
+            entry = self._read(path)
+            if entry is not None and entry[0] and entry[0] <= now:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+class RedisBackend(CacheBackend):
+    """Redis-compatible server (Redis, Valkey, KeyDB, ...)."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "FRAGMENT_CACHE_URL uses redis:// but the redis package is not installed "
+                "(pip install project[redis])"
+            ) from e
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self._client.get(key)
+        return None if value is None else value.decode("utf-8")
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, value.encode("utf-8"), ex=None if ttl is None else max(1, int(ttl)))
+
+
+def backend_from_url(url: str, max_entries: int = 1000) -> CacheBackend:
+    """Backend for a ``FRAGMENT_CACHE_URL``."""
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryBackend(max_entries)
+    if parsed.scheme == "file":
+        return FileBackend(parsed.path)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    if parsed.scheme == "null":
+        return NullBackend()
+    raise ValueError(f"Unsupported FRAGMENT_CACHE_URL scheme: {url!r}")
+
+
+class FragmentCache:
+    """Rendered fragments plus per-table version tokens on one backend."""
+
+    def __init__(self, backend: CacheBackend, ttl: float = 300, prefix: str = ""):
+        self.backend = backend
+        self.ttl = ttl
+        self._prefix = prefix
+
+    def version(self, table: str) -> str:
+        """Current version token of ``table`` (a fresh one if it has none yet)."""
+        key = f"{self._prefix}version:{table}"
+        token = self.backend.get(key)
+        if token is None:
+            token = self.bump(table)
+        return token
+
+    def bump(self, table: str) -> str:
+        """Give ``table`` a new version token, so fragments built from it miss."""
+        token = uuid.uuid4().hex[:12]
+        self.backend.set(f"{self._prefix}version:{table}", token)
+        return token
+
+    def versions(self, *tables: str) -> str:
+        """Key part naming the current version of each table."""
+        return ",".join(f"{table}@{self.version(table)}" for table in tables)
+
+    def fragment(self, name: str, parts: Sequence, render) -> str:
+        """Cached fragment ``name`` for ``parts``, rendering it with ``render()`` on a miss."""
+        key = f"{self._prefix}fragment:{name}:" + ":".join(str(part) for part in parts)
+        value = self.backend.get(key)
+        if value is None:
+            value = str(render())
+            self.backend.set(key, value, self.ttl)
+        return value
+
+
+def get_fragment_cache() -> FragmentCache | None:
+    """The current app's fragment cache, or None outside an app context."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("fragment_cache")
+
+
+def versions(*tables: str) -> str:
+    """Template global: version tokens of ``tables`` for a ``{% cache %}`` key."""
+    cache = get_fragment_cache()
+    return cache.versions(*tables) if cache is not None else ""
+
+
+class FragmentCacheExtension(Extension):
+    """``{% cache name, key_part, ... %}...{% endcache %}``"""
+
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        name = parser.parse_expression()
+        parts = []
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method("_render", [name, nodes.List(parts)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, name: str, parts: list, caller) -> Markup:
+        cache = get_fragment_cache()
+        if cache is None:
+            return Markup(caller())
+        return Markup(cache.fragment(name, parts, lambda: _render_from_primary(caller)))
+
+
+def _render_from_primary(caller) -> str:
+    with primary_reads():
+        return caller()
+
+
+def _record_flushed_tables(session, flush_context) -> None:
+    changed = session.info.setdefault(_CHANGED_TABLES, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            changed.add(table)
+
+
+def _record_bulk_statement(orm_execute_state) -> None:
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and (
+        orm_execute_state.bind_mapper is not None
+    ):
+        table = orm_execute_state.bind_mapper.local_table.name
+        orm_execute_state.session.info.setdefault(_CHANGED_TABLES, set()).add(table)
+
+
+def _bump_committed_tables(session) -> None:
+    changed = session.info.pop(_CHANGED_TABLES, None)
+    cache = get_fragment_cache()
+    if changed and cache is not None:
+        for table in changed:
+            cache.bump(table)
+
+
+def _forget_rolled_back_tables(session) -> None:
+    session.info.pop(_CHANGED_TABLES, None)
+
+
+def _install_listeners() -> None:
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "after_flush", _record_flushed_tables)
+    event.listen(Session, "do_orm_execute", _record_bulk_statement)
+    event.listen(Session, "after_commit", _bump_committed_tables)
+    event.listen(Session, "after_rollback", _forget_rolled_back_tables)
+    _listeners_installed = True
+
+
+def database_namespace(database_url: str) -> str:
+    """Short hash of a database URL, so apps on different databases never share keys."""
+    return hashlib.sha256(database_url.encode()).hexdigest()[:12]
+
+
+def init_fragment_cache(app: Flask) -> FragmentCache:
+    """Create ``app``'s fragment cache and enable ``{% cache %}`` in its templates.
+
+    Keys start with ``FRAGMENT_CACHE_PREFIX`` and the ``database_namespace``
+    of ``SQLALCHEMY_DATABASE_URI``: a shared store (the default directory, a
+    Redis server) may serve several deployments, or a dev server and a test
+    run, each with its own database.
+    """
+    _install_listeners()
+    backend = backend_from_url(
+        app.config["FRAGMENT_CACHE_URL"], app.config["FRAGMENT_CACHE_MAX_ENTRIES"]
+    )
+    namespace = database_namespace(app.config["SQLALCHEMY_DATABASE_URI"])
+    cache = FragmentCache(
+        backend,
+        app.config["FRAGMENT_CACHE_TTL"],
+        f"{app.config['FRAGMENT_CACHE_PREFIX']}{namespace}:",
+    )
+    app.extensions["fragment_cache"] = cache
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    app.jinja_env.globals["versions"] = versions
+    return cache
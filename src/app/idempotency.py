@@ -0,0 +1,222 @@
+"""Idempotency keys for mutating requests.
+
+A POST carrying a key, either the ``Idempotency-Key`` header (API clients)
+or the hidden ``idempotency_key`` field that ``{{ idempotency_field() }}``
+renders into each form, runs at most once. Before the view runs, the key is
+reserved in ``idempotency_keys``, a table keyed on it. A retry with the same
+key gets the first request's saved response back without the view running
+again. That covers a double-clicked submit, a browser resubmitting after a
+dropped connection, or an API client retrying a timeout. A retry that
+arrives while the first request is still running waits up to
+``IDEMPOTENCY_WAIT_SECONDS`` for its result.
+
+The request's first commit also marks its key as written, in the same
+transaction, so the write and the mark commit together or not at all. A
+reservation still unfinished after ``IDEMPOTENCY_LEASE_SECONDS`` that was
+never marked belongs to a worker that died before writing; the next retry
+takes it over and runs the request. A marked one is never run again, even if
+its worker died before saving the response. Each reservation carries an owner
+token, and a request whose key was taken over meanwhile cannot commit.
+
+Only successful writes are saved: redirects, and 2xx responses other than
+HTML pages, plus whatever a request answered after its write committed. A
+form re-rendered with validation errors, a 4xx or 5xx error, or a streamed
+body from a request that wrote nothing releases the key, so the corrected
+form (which still carries it) is submitted afresh. Keys are kept for ``IDEMPOTENCY_KEY_TTL``
+seconds and are tied to the first request's path and body; reusing one for
+a different request is rejected with 422.
+
+``main.js`` gives each form a new key whenever a page is shown and after
+each in-place update. Submitting again after going Back, or after editing
+a form that already succeeded, is a new request and not a retry.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import time
+import uuid
+
+from flask import (
+    Flask,
+    current_app,
+    flash,
+    g,
+    has_request_context,
+    jsonify,
+    redirect,
+    request,
+    url_for,
+)
+from markupsafe import Markup
+from sqlalchemy import event
+
+from app.database import db_session
+from app.repositories.idempotency_keys import IdempotencyKeyRepository
+
+HEADER = "Idempotency-Key"
+FIELD = "idempotency_key"
+
+#: Longest key accepted (the column size)
+MAX_KEY_LENGTH = 64
+
+#: Seconds between checks while waiting on a request that holds the key
+_POLL_INTERVAL = 0.1
+
+#: Session info flag: the commit under way marked the request's key as written
+_MARKING = "idempotency_marking"
+
+
+class ReservationLost(Exception):
+    """The request's key was taken over by a retry before its write committed."""
+
+
+def idempotency_field() -> Markup:
+    """Hidden form field carrying a fresh idempotency key."""
+    return Markup(f'<input type="hidden" name="{FIELD}" value="{uuid.uuid4().hex}">')
+
+
+def _wants_json() -> bool:
+    if request.is_json:
+        return True
+    best = request.accept_mimetypes.best_match(["text/html", "application/json"])
+    return best == "application/json"
+
+
+def _reject(message: str, status: int):
+    """An error for API and in-page clients, a flash and redirect for forms."""
+    if _wants_json():
+        return jsonify(error=message), status
+    flash(message, "warning")
+    return redirect(request.referrer or url_for("dashboard.index"))
+
+
+def _replay(saved):
+    response = current_app.response_class(
+        saved.body or "", status=saved.status_code, content_type=saved.content_type
+    )
+    if saved.location:
+        response.headers["Location"] = saved.location
+        flash("This form was already submitted; showing its result.", "info")
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _claim():
+    """``before_request``: reserve the request's key, or answer from the saved result."""
+    if request.method != "POST":
+        return None
+    # Read the raw body before the form parser consumes it (the form is parsed from the copy)
+    body = request.get_data()
+    key = request.headers.get(HEADER) or request.form.get(FIELD)
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        return _reject(f"Idempotency keys are at most {MAX_KEY_LENGTH} characters.", 400)
+
+    config = current_app.config
+    repo = IdempotencyKeyRepository()
+    request_path = f"{request.method} {request.path}"
+    request_hash = hashlib.sha256(body).hexdigest()
+    owner = uuid.uuid4().hex
+    saved = repo.reserve(
+        key,
+        request_path,
+        request_hash,
+        config["IDEMPOTENCY_KEY_TTL"],
+        config["IDEMPOTENCY_LEASE_SECONDS"],
+        owner,
+    )
+    if saved is None:
+        g.idempotency_key, g.idempotency_owner = key, owner
+        return None
+
+    deadline = time.monotonic() + config["IDEMPOTENCY_WAIT_SECONDS"]
+    while saved is not None and saved.status_code is None and time.monotonic() < deadline:
+        time.sleep(_POLL_INTERVAL)
+        saved = repo.find(key)
+
+    if saved is None:
+        # The first request failed and released the key: this retry may run
+        return _claim()
+    if (saved.request_path, saved.request_hash) != (request_path, request_hash):
+        return _reject("This idempotency key was already used for a different request.", 422)
+    if saved.status_code is None and saved.written_at is not None:
+        return _reject("This request was already processed; reload to see its result.", 409)
+    if saved.status_code is None:
+        return _reject("This request is still being processed; try again shortly.", 409)
+    return _replay(saved)
+
+
+def _saveable(response) -> bool:
+    if response.is_streamed:
+        return False
+    if 300 <= response.status_code < 400:
+        return True
+    return 200 <= response.status_code < 300 and response.mimetype != "text/html"
+
+
+def _mark_written(session):
+    """``before_commit``: mark the request's key as written, in the committing transaction."""
+    if not has_request_context() or "idempotency_owner" not in g or "idempotency_written" in g:
+        return
+    if not (db_session.registry.has() and session is db_session()):
+        return
+    if not IdempotencyKeyRepository(session).mark_written(g.idempotency_key, g.idempotency_owner):
+        raise ReservationLost(g.idempotency_key)
+    session.info[_MARKING] = True
+
+
+def _marked(session):
+    """``after_commit``: the mark committed with the request's write."""
+    if session.info.pop(_MARKING, False):
+        g.idempotency_written = True
+
+
+def _reservation_lost(error):
+    db_session.rollback()
+    return _reject("This request took too long and was retried; it was not saved.", 409)
+
+
+def _record(response):
+    """``after_request``: save the response for the key, or release the key."""
+    key = g.pop("idempotency_key", None)
+    if key is None:
+        return response
+    owner = g.pop("idempotency_owner")
+    written = g.pop("idempotency_written", False)
+
+    repo = IdempotencyKeyRepository()
+    if written or _saveable(response):
+        # Once written the key is never released: a retry must not write again
+        body = None
+        if "Location" not in response.headers and not response.is_streamed:
+            body = response.get_data()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            body = body.decode()
+        repo.complete(
+            key,
+            response.status_code,
+            response.headers.get("Location"),
+            response.content_type,
+            body,
+            owner,
+        )
+    else:
+        # Do not commit whatever the failed request left behind
+        db_session.rollback()
+        repo.release(key, owner)
+    return response
+
+
+def init_idempotency(app: Flask) -> None:
+    """Honour idempotency keys on ``app``'s POST requests."""
+    app.before_request(_claim)
+    app.after_request(_record)
+    app.register_error_handler(ReservationLost, _reservation_lost)
+    if not event.contains(db_session, "before_commit", _mark_written):
+        event.listen(db_session, "before_commit", _mark_written)
+        event.listen(db_session, "after_commit", _marked)
+    app.jinja_env.globals["idempotency_field"] = idempotency_field
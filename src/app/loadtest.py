@@ -0,0 +1,428 @@
+"""Local HTTP load driver for the Flask pages (``project-loadtest``).
+
+Boots the app in-process on a threaded Werkzeug server bound to localhost,
+backed by a seeded database: a temporary SQLite file by default, or any
+``--database`` URL (e.g. a local MySQL). ``--concurrency`` client threads then
+replay a weighted mix of scenarios over keep-alive connections for
+``--duration`` seconds (or ``--requests`` scenarios):
+
+- reads: ``/``, ``/payments/``, ``/rent-charges/``, ``/reports/arrears``,
+  ``/properties/<id>``
+- writes: record a payment, then auto-allocate it or allocate it to one
+  outstanding charge
+
+Per endpoint it reports throughput, error count, p50/p90/p99/max latency and
+a latency histogram; ``--output`` also writes them as JSON. CSRF is disabled
+on the booted app so the write scenarios can post forms directly.
+
+Example::
+
+    project-loadtest --properties 500 --concurrency 16 --duration 30
+    project-loadtest --mix dashboard=1,property=3,auto_allocate=1 --output load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from datetime import date
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+from werkzeug.serving import make_server
+
+from app import create_app
+from app.database import db_session, get_engine, init_db, init_engine
+from app.models.property import Property
+from app.models.rent_charge import ChargeStatus, RentCharge
+from app.repositories import property_directory
+from app.seed import SeedOptions, seed_portfolio
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_PAYMENT_LOCATION = re.compile(r"/payments/(\d+)$")
+
+
+class Request(NamedTuple):
+    """One HTTP request; ``label`` groups it in the report (ids templated out)."""
+
+    label: str
+    method: str
+    path: str
+    form: dict | None = None
+
+
+class Scenario(NamedTuple):
+    """A user action: ``run(client, rng, targets)`` issues one or more requests."""
+
+    name: str
+    weight: int
+    run: Callable[[Client, random.Random, dict], None]
+
+
+class Recorder:
+    """Thread-safe latency samples and error counts per endpoint label."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, label: str, elapsed_ms: float, ok: bool) -> None:
+        with self._lock:
+            self.samples.setdefault(label, []).append(elapsed_ms)
+            if not ok:
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self, elapsed_s: float) -> list[dict]:
+        """Per-endpoint throughput, percentiles and histogram."""
+        rows = []
+        for label, samples in sorted(self.samples.items()):
+            samples = sorted(samples)
+            pct = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))]  # noqa: E731
+            histogram = [0] * (len(BUCKETS_MS) + 1)
+            for ms in samples:
+                histogram[next((i for i, b in enumerate(BUCKETS_MS) if ms <= b), -1)] += 1
+            rows.append(
+                {
+                    "endpoint": label,
+                    "requests": len(samples),
+                    "errors": self.errors.get(label, 0),
+                    "rps": round(len(samples) / elapsed_s, 1),
+                    "p50_ms": round(pct(0.50), 2),
+                    "p90_ms": round(pct(0.90), 2),
+                    "p99_ms": round(pct(0.99), 2),
+                    "max_ms": round(samples[-1], 2),
+                    "histogram": histogram,
+                }
+            )
+        return rows
+
+
+class Client:
+    """Keep-alive HTTP connection for one load thread."""
+
+    def __init__(self, host: str, port: int, recorder: Recorder):
+        self._host, self._port = host, port
+        self._recorder = recorder
+        self._conn = http.client.HTTPConnection(host, port, timeout=60)
+
+    def send(self, request: Request) -> http.client.HTTPResponse | None:
+        """Issue ``request``, record its latency; None if the connection failed."""
+        body, headers = None, {}
+        if request.form is not None:
+            body = urlencode(request.form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        started = time.perf_counter()
+        try:
+            self._conn.request(request.method, request.path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            self._conn = http.client.HTTPConnection(self._host, self._port, timeout=60)
+            self._recorder.record(request.label, (time.perf_counter() - started) * 1000, False)
+            return None
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._recorder.record(request.label, elapsed_ms, response.status < 400)
+        return response
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# --- scenarios ---------------------------------------------------------------
+
+
+def _get(path: str):
+    def run(client, rng, targets):
+        client.send(Request(f"GET {path}", "GET", path))
+
+    return run
+
+
+def _property_page(client, rng, targets):
+    property_id = rng.choice(targets["property_ids"])
+    client.send(Request("GET /properties/<id>", "GET", f"/properties/{property_id}"))
+
+
+def _record_payment(client, rng, targets) -> tuple[int, int] | None:
+    """POST a payment for a property with arrears; returns (payment id, property id)."""
+    property_id, rent = rng.choice(targets["owing"])
+    response = client.send(
+        Request(
+            "POST /payments/new",
+            "POST",
+            "/payments/new",
+            {
+                "property_id": property_id,
+                "amount": f"{rent:.2f}",
+                "payment_date": date.today().isoformat(),
+                "notes": "load test",
+            },
+        )
+    )
+    match = response and _PAYMENT_LOCATION.search(response.getheader("Location") or "")
+    return (int(match.group(1)), property_id) if match else None
+
+
+def _auto_allocate(client, rng, targets):
+    recorded = _record_payment(client, rng, targets)
+    if recorded:
+        payment_id, _ = recorded
+        client.send(
+            Request(
+                "POST /allocations/<id>/auto-allocate",
+                "POST",
+                f"/allocations/{payment_id}/auto-allocate",
+                {},
+            )
+        )
+
+
+def _allocate(client, rng, targets):
+    recorded = _record_payment(client, rng, targets)
+    if recorded:
+        payment_id, property_id = recorded
+        client.send(
+            Request(
+                "POST /allocations/<id>/allocate",
+                "POST",
+                f"/allocations/{payment_id}/allocate",
+                {
+                    "lines-0-rent_charge_id": rng.choice(targets["charges"][property_id]),
+                    "lines-0-amount": "50.00",
+                },
+            )
+        )
+
+
+SCENARIOS = {
+    s.name: s
+    for s in (
+        Scenario("dashboard", 20, _get("/")),
+        Scenario("payments", 15, _get("/payments/")),
+        Scenario("rent_charges", 15, _get("/rent-charges/")),
+        Scenario("arrears", 10, _get("/reports/arrears")),
+        Scenario("property", 25, _property_page),
+        Scenario("auto_allocate", 10, _auto_allocate),
+        Scenario("allocate", 5, _allocate),
+    )
+}
+
+
+def _targets() -> dict:
+    """Ids the scenarios pick from: all properties, and active ones with arrears."""
+    property_ids = [pid for (pid,) in db_session.query(Property.id)]
+    outstanding = (
+        db_session.query(RentCharge.property_id, RentCharge.id, Property.monthly_rent)
+        .join(Property, Property.id == RentCharge.property_id)
+        .filter(Property.is_active.is_(True), RentCharge.status != ChargeStatus.PAID)
+        .all()
+    )
+    charges: dict[int, list[int]] = {}
+    rents = {}
+    for property_id, charge_id, rent in outstanding:
+        charges.setdefault(property_id, []).append(charge_id)
+        rents[property_id] = rent
+    db_session.remove()
+    return {"property_ids": property_ids, "owing": sorted(rents.items()), "charges": charges}
+
+
+def _parse_mix(text: str | None) -> list[Scenario]:
+    if not text:
+        return list(SCENARIOS.values())
+    mix = []
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix.append(SCENARIOS[name]._replace(weight=int(weight or 1)))
+    return mix
+
+
+def run_load(
+    host: str,
+    port: int,
+    scenarios: list[Scenario],
+    targets: dict,
+    concurrency: int,
+    duration: float,
+    max_requests: int | None = None,
+    seed: int = 42,
+) -> tuple[Recorder, float]:
+    """Drive the server from ``concurrency`` threads; returns samples and elapsed seconds."""
+    if not targets["owing"]:
+        scenarios = [s for s in scenarios if s.run not in (_auto_allocate, _allocate)]
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+    remaining = [max_requests]
+    lock = threading.Lock()
+
+    def take() -> bool:
+        if time.monotonic() >= deadline:
+            return False
+        with lock:
+            if remaining[0] is None:
+                return True
+            remaining[0] -= 1
+            return remaining[0] >= 0
+
+    def worker(index: int):
+        rng = random.Random(seed + index)
+        client = Client(host, port, recorder)
+        weights = [s.weight for s in scenarios]
+        while take():
+            rng.choices(scenarios, weights)[0].run(client, rng, targets)
+        client.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - started
+
+
+def _print_summary(rows: list[dict], elapsed_s: float) -> None:
+    total = sum(r["requests"] for r in rows)
+    print(f"{total} requests in {elapsed_s:.1f}s ({total / elapsed_s:.1f} req/s)\n")
+    print(
+        f"{'endpoint':<40} {'reqs':>7} {'errs':>5} {'req/s':>8} "
+        f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+    )
+    for r in rows:
+        print(
+            f"{r['endpoint']:<40} {r['requests']:>7} {r['errors']:>5} {r['rps']:>8.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p90_ms']:>8.1f} {r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}"
+        )
+
+    labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+    for r in rows:
+        print(f"\n{r['endpoint']}")
+        peak = max(r["histogram"]) or 1
+        for label, count in zip(labels, r["histogram"]):
+            if count:
+                print(f"  {label:>9} {count:>7} {'#' * max(1, round(40 * count / peak))}")
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="project-loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--env",
+        default="production",
+        choices=["development", "production", "testing"],
+        help="Config to boot the app with (default production)",
+    )
+    parser.add_argument(
+        "--database", help="Database URL (default: a fresh SQLite file in a temp directory)"
+    )
+    parser.add_argument("--properties", type=int, default=200, help="Properties to seed")
+    parser.add_argument("--months", type=int, default=24, help="Months of history to seed")
+    parser.add_argument(
+        "--no-seed", action="store_true", help="Use the data already in --database"
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads (default 8)")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds to run (default 20)")
+    parser.add_argument("--requests", type=int, help="Stop after this many scenarios")
+    parser.add_argument(
+        "--mix",
+        help="Scenario weights, e.g. dashboard=2,property=5 (default: "
+        + ",".join(f"{s.name}={s.weight}" for s in SCENARIOS.values())
+        + ")",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Data and scenario RNG seed")
+    parser.add_argument("--output", help="Write the per-endpoint results to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Seed, boot the app and run the load test."""
+    args = _parse_args(argv)
+    scenarios = _parse_mix(args.mix)
+
+    tmpdir = None
+    database = args.database
+    if database is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="renttrack-load-")
+        database = f"sqlite:///{os.path.join(tmpdir.name, 'load.db')}"
+
+    app = create_app(args.env)
+    app.config.update(SQLALCHEMY_DATABASE_URI=database, WTF_CSRF_ENABLED=False)
+    init_engine(app.config)
+
+    with app.app_context():
+        init_db()
+        if get_engine().dialect.name == "sqlite":
+            # Readers no longer block on the writer scenarios
+            with get_engine().connect() as conn:
+                conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        if not args.no_seed:
+            counts = seed_portfolio(
+                SeedOptions(properties=args.properties, months=args.months, seed=args.seed)
+            )
+            print(f"Seeded {sum(counts.values())} rows", file=sys.stderr)
+        property_directory.invalidate()
+        targets = _targets()
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(
+        f"Serving on 127.0.0.1:{server.port}; {args.concurrency} clients for "
+        f"{args.duration:g}s",
+        file=sys.stderr,
+    )
+    try:
+        recorder, elapsed = run_load(
+            "127.0.0.1",
+            server.port,
+            scenarios,
+            targets,
+            args.concurrency,
+            args.duration,
+            args.requests,
+            args.seed,
+        )
+    finally:
+        server.shutdown()
+        if tmpdir is not None:
+            get_engine().dispose()
+            tmpdir.cleanup()
+
+    rows = recorder.summary(elapsed)
+    _print_summary(rows, elapsed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "meta": {
+                        "database": database if args.database else "sqlite (temporary)",
+                        "concurrency": args.concurrency,
+                        "elapsed_s": round(elapsed, 2),
+                        "mix": {s.name: s.weight for s in scenarios},
+                        "buckets_ms": list(BUCKETS_MS),
+                    },
+                    "endpoints": rows,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ from app.models.tenant import Tenant
 from app.models.rent_charge import RentCharge, ChargeStatus
 from app.models.payment import Payment
 from app.models.payment_allocation import PaymentAllocation
+from app.models.search_term import SearchTerm
+from app.models.change_log import ChangeLog
+from app.models.idempotency_key import IdempotencyKey
 
 __all__ = [
     "Base",
@@ -15,4 +18,7 @@ __all__ = [
     "ChargeStatus",
     "Payment",
     "PaymentAllocation",
+    "SearchTerm",
+    "ChangeLog",
+    "IdempotencyKey",
 ]
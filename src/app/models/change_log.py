@@ -0,0 +1,38 @@
+"""Change log entry - one insert, update or delete of a ledger row."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ChangeLog(Base):
+    """Append-only record of ledger mutations, read as an incremental feed.
+
+    ``id`` is the feed sequence number. Rows are written by
+    ``app.repositories.change_log`` in the same transaction as the change;
+    there is no foreign key because the changed row may be gone.
+    """
+
+    __tablename__ = "change_log"
+    __table_args__ = (
+        # Feed of one table's changes after a sequence number
+        Index("ix_change_log_entity_type_id", "entity_type", "id"),
+        # History of one row
+        Index("ix_change_log_entity_id", "entity_id", "entity_type"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    entity_type: Mapped[str] = mapped_column(String(40), nullable=False)
+    entity_id: Mapped[int] = mapped_column(nullable=False)
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)
+    #: JSON object of the row's column values after the change (changed columns for updates)
+    data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False
+    )
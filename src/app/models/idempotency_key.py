@@ -0,0 +1,51 @@
+"""Idempotency key - the saved result of one mutating request."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """A client-chosen key and the response its first request produced.
+
+    Written by ``app.idempotency``: reserved (no ``status_code`` yet) before
+    the view runs, then filled in with the response, or deleted if the
+    request failed. ``written_at`` is set in the same transaction as the
+    request's first write. A reservation left unfinished with no write (its
+    worker died first) may be taken over by a retry once ``reserved_at`` is
+    older than the lease. Rows are purged once ``expires_at`` has passed.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Purge of expired keys
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    #: "METHOD /path" of the first request
+    request_path: Mapped[str] = mapped_column(String(255), nullable=False)
+    #: SHA-256 of the first request's body
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[Optional[int]] = mapped_column(nullable=True)
+    location: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    content_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    body: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False
+    )
+    #: When the request now holding the key claimed it
+    reserved_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), nullable=False
+    )
+    #: Random token of the request now holding the key
+    owner: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    #: When the holding request's write committed (None: nothing written yet)
+    written_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Date, DateTime, ForeignKey, Numeric, Text, func
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Numeric, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -15,6 +15,12 @@ class Payment(Base):
     """Record of a rent payment received for a property."""
 
     __tablename__ = "payments"
+    __table_args__ = (
+        # Per-property payments by date; also serves the property_id foreign key
+        Index("ix_payments_property_id_payment_date", "property_id", "payment_date"),
+        # Recent payments and date ranges across all properties
+        Index("ix_payments_payment_date", "payment_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     property_id: Mapped[int] = mapped_column(
@@ -23,6 +29,8 @@ class Payment(Base):
     amount: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
     payment_date: Mapped[date] = mapped_column(Date, nullable=False)
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    #: Bumped by each allocation change (optimistic concurrency, see PaymentService)
+    version: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False
     )
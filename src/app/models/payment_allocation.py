@@ -17,10 +17,10 @@ class PaymentAllocation(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     payment_id: Mapped[int] = mapped_column(
-        ForeignKey("payments.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("payments.id", ondelete="CASCADE"), nullable=False, index=True
     )
     rent_charge_id: Mapped[int] = mapped_column(
-        ForeignKey("rent_charges.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("rent_charges.id", ondelete="CASCADE"), nullable=False, index=True
     )
     amount: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
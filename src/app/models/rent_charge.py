@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from enum import Enum
 
-from sqlalchemy import Date, DateTime, Enum as SQLEnum, ForeignKey, Numeric, func
+from sqlalchemy import Date, DateTime, Enum as SQLEnum, ForeignKey, Index, Numeric, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -22,6 +22,16 @@ class RentCharge(Base):
     """Rent charge for a property for a given period. Tracks state: Charged, Paid, Late, In Arrears."""
 
     __tablename__ = "rent_charges"
+    __table_args__ = (
+        # Status lists, arrears / overdue / upcoming reports (status IN ..., by due date)
+        Index("ix_rent_charges_status_due_date", "status", "due_date"),
+        # Per-property charges by due date; also serves the property_id foreign key
+        Index("ix_rent_charges_property_id_due_date", "property_id", "due_date"),
+        # Period range filters
+        Index("ix_rent_charges_period_start", "period_start"),
+        # Recently created charges
+        Index("ix_rent_charges_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     property_id: Mapped[int] = mapped_column(
@@ -40,6 +50,8 @@ class RentCharge(Base):
         default=ChargeStatus.CHARGED,
         nullable=False,
     )
+    #: Bumped by each allocation change (optimistic concurrency, see PaymentService)
+    version: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False
     )
@@ -0,0 +1,31 @@
+"""Search index term - one word prefix of one searchable field of a tenant or property."""
+
+from __future__ import annotations
+
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class SearchTerm(Base):
+    """Word-prefix side index used for ranked tenant / property search.
+
+    Rows are maintained by ``app.repositories.search_index`` whenever a
+    Tenant or Property is flushed; there is no foreign key because one table
+    serves both entity types.
+    """
+
+    __tablename__ = "search_terms"
+    __table_args__ = (
+        # Lookup: which entities have these word prefixes
+        Index("ix_search_terms_lookup", "entity_type", "term", "field", "entity_id"),
+        # Maintenance: drop all terms of one entity
+        Index("ix_search_terms_entity", "entity_id", "entity_type"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    entity_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[int] = mapped_column(nullable=False)
+    field: Mapped[str] = mapped_column(String(20), nullable=False)
+    term: Mapped[str] = mapped_column(String(12), nullable=False)
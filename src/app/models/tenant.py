@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Date, DateTime, ForeignKey, String, func
+from sqlalchemy import Date, DateTime, ForeignKey, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -15,13 +15,19 @@ class Tenant(Base):
     """Tenant record, linked to a property."""
 
     __tablename__ = "tenants"
+    __table_args__ = (
+        # Tenants of a property by move-in date; also serves the property_id foreign key
+        Index("ix_tenants_property_id_move_in_date", "property_id", "move_in_date"),
+        # Current tenants (move_out_date IS NULL) by name
+        Index("ix_tenants_move_out_date_name", "move_out_date", "name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     property_id: Mapped[int] = mapped_column(
         ForeignKey("properties.id", ondelete="CASCADE"), nullable=False
     )
-    name: Mapped[str] = mapped_column(String(255), nullable=False)
-    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, index=True)
     phone: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     move_in_date: Mapped[date] = mapped_column(Date, nullable=False)
     move_out_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
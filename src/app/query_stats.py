@@ -0,0 +1,143 @@
+"""Per-request SQL instrumentation: query count, DB time and N+1 detection.
+
+Engine events record every statement executed while a request is active.
+After the request the totals go out as ``X-DB-*`` response headers, and a
+warning is logged when one statement shape repeats more than
+``SQL_REPEAT_THRESHOLD`` times (the usual sign of a lazy load inside a loop).
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import Flask, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+_listeners_installed = False
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """SQL statements executed during one request."""
+
+    __slots__ = ("count", "total_time", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        # Parameters are bound separately, so the text itself is the shape
+        self.shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed more than ``threshold`` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    @property
+    def max_repeat(self) -> int:
+        return max(self.shapes.values(), default=0)
+
+
+def current_stats() -> QueryStats | None:
+    """Stats for the request being handled, or None outside instrumented requests."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_start_time")
+    if started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _install_listeners() -> None:
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    # Listen on the Engine class so engines replaced by init_engine are covered too
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _listeners_installed = True
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """Record the statements executed inside the block (no request needed).
+
+    Used by benchmarks and scripts::
+
+        with collect_query_stats() as stats:
+            ReportService().get_dashboard_summary()
+        print(stats.count)
+    """
+    _install_listeners()
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def init_query_stats(app: Flask) -> None:
+    """Enable per-request SQL statistics for ``app``."""
+    _install_listeners()
+    threshold = app.config.get("SQL_REPEAT_THRESHOLD", 10)
+
+    @app.before_request
+    def _start_query_stats():
+        stats = QueryStats()
+        g.query_stats = stats
+        g.query_stats_token = _current.set(stats)
+
+    @app.after_request
+    def _emit_query_stats(response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.total_time * 1000:.1f}"
+        response.headers["X-DB-Max-Repeat"] = str(stats.max_repeat)
+
+        for shape, n in stats.repeated(threshold):
+            logger.warning(
+                "Possible N+1: %s %s ran the same statement %d times: %.200s",
+                request.method,
+                request.path,
+                n,
+                shape,
+            )
+        return response
+
+    @app.teardown_request
+    def _stop_query_stats(exception=None):
+        token = g.pop("query_stats_token", None)
+        if token is not None:
+            _current.reset(token)
+
+    @app.context_processor
+    def _query_stats_context():
+        return {"query_stats": current_stats}
@@ -1,15 +1,58 @@
 """Repository pattern implementation for data access layer."""
 
+from app.repositories.async_repositories import (
+    AsyncPaymentRepository,
+    AsyncPropertyRepository,
+    AsyncRentChargeRepository,
+    AsyncRepository,
+    AsyncSearchIndexRepository,
+    AsyncTenantRepository,
+)
 from app.repositories.base_repository import BaseRepository
+from app.repositories.change_log import ChangeLogRepository
+from app.repositories.idempotency_keys import IdempotencyKeyRepository
+from app.repositories.property_directory import PropertyDirectory, property_directory
 from app.repositories.property_repository import PropertyRepository
 from app.repositories.tenant_repository import TenantRepository
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.rent_charge_repository import RentChargeRepository
+from app.repositories.rows import (
+    AllocationRow,
+    ChangeRow,
+    PaymentRow,
+    PropertyRow,
+    RentChargeRow,
+    RowVersion,
+    SearchHit,
+    SearchPage,
+    TenantRow,
+)
+from app.repositories.search_index import SearchIndexRepository
 
 __all__ = [
     "BaseRepository",
     "PropertyRepository",
+    "PropertyDirectory",
+    "property_directory",
     "TenantRepository",
     "PaymentRepository",
     "RentChargeRepository",
+    "SearchIndexRepository",
+    "ChangeLogRepository",
+    "IdempotencyKeyRepository",
+    "PaymentRow",
+    "AllocationRow",
+    "ChangeRow",
+    "RentChargeRow",
+    "TenantRow",
+    "PropertyRow",
+    "RowVersion",
+    "SearchHit",
+    "SearchPage",
+    "AsyncRepository",
+    "AsyncPropertyRepository",
+    "AsyncTenantRepository",
+    "AsyncPaymentRepository",
+    "AsyncRentChargeRepository",
+    "AsyncSearchIndexRepository",
 ]
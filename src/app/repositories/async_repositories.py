@@ -0,0 +1,85 @@
+"""Awaitable counterparts of the repositories, for an ``AsyncSession``.
+
+Each async repository wraps its sync repository class: calling a method runs
+the sync method inside ``AsyncSession.run_sync``, where SQLAlchemy drives the
+asyncio driver from a greenlet. The query code, load plans and search index
+stay in one place, and while one call waits on the database the event loop
+can run others::
+
+    async with async_session() as session:
+        payments, charges = await asyncio.gather(
+            AsyncPaymentRepository(session).get_recent(load="with_property"),
+            AsyncRentChargeRepository(session).get_overdue(),
+        )
+
+Calls on the same session run one after another (a session holds a single
+connection); use one session per concurrent branch to overlap database
+waits. Rows come back loaded: relationships outside the method's load plan
+cannot be lazy loaded once the call has returned.
+"""
+
+from collections.abc import Awaitable, Callable
+from typing import Any, ClassVar, Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.base_repository import BaseRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.property_repository import PropertyRepository
+from app.repositories.rent_charge_repository import RentChargeRepository
+from app.repositories.search_index import SearchIndexRepository
+from app.repositories.tenant_repository import TenantRepository
+
+R = TypeVar("R", bound=BaseRepository)
+
+
+class AsyncRepository(Generic[R]):
+    """Awaitable proxy for the public methods of ``repository_class``."""
+
+    repository_class: ClassVar[type[BaseRepository]]
+
+    def __init__(self, session: AsyncSession):
+        """Initialize with the async session the calls run on."""
+        self._session = session
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        if name.startswith("_") or not callable(getattr(self.repository_class, name, None)):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        async def call(*args, **kwargs):
+            return await self._session.run_sync(
+                lambda session: getattr(self.repository_class(session), name)(*args, **kwargs)
+            )
+
+        call.__name__ = name
+        return call
+
+
+class AsyncPropertyRepository(AsyncRepository[PropertyRepository]):
+    """Async ``PropertyRepository``."""
+
+    repository_class = PropertyRepository
+
+
+class AsyncTenantRepository(AsyncRepository[TenantRepository]):
+    """Async ``TenantRepository``."""
+
+    repository_class = TenantRepository
+
+
+class AsyncPaymentRepository(AsyncRepository[PaymentRepository]):
+    """Async ``PaymentRepository``."""
+
+    repository_class = PaymentRepository
+
+
+class AsyncRentChargeRepository(AsyncRepository[RentChargeRepository]):
+    """Async ``RentChargeRepository``."""
+
+    repository_class = RentChargeRepository
+
+
+class AsyncSearchIndexRepository(AsyncRepository[SearchIndexRepository]):
+    """Async ``SearchIndexRepository``."""
+
+    repository_class = SearchIndexRepository
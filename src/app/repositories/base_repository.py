@@ -1,16 +1,42 @@
 """Base repository with generic CRUD operations."""
 
-from typing import Generic, TypeVar
+from collections.abc import Callable, Iterator, Sequence
+from typing import ClassVar, Generic, TypeVar
 
-from sqlalchemy.orm import Session
+from flask import current_app, has_app_context
+from sqlalchemy import func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session, raiseload
 
 from app.database import db_session
+from app.repositories.rows import RowVersion
 
 T = TypeVar("T")
 
+#: A named load plan, or an explicit sequence of loader options
+LoadPlan = str | Sequence | None
+
+#: Rows per fetch for the ``iter_*`` methods when ``SQL_STREAM_CHUNK_SIZE`` is not set
+DEFAULT_CHUNK_SIZE = 1000
+
 
 class BaseRepository(Generic[T]):
-    """Generic repository for database operations."""
+    """Generic repository for database operations.
+
+    List methods take a ``load`` argument naming an entry of ``load_plans``
+    (or a sequence of loader options) so each caller eager-loads exactly the
+    relationships it renders. With ``SQL_RAISE_ON_LAZY_LOAD`` on, any other
+    relationship touched on rows loaded through a plan raises instead of
+    issuing a lazy query.
+
+    ``iter_*`` methods are generators over a server-side cursor (``yield_per``)
+    fetching ``chunk_size`` rows at a time, so memory stays flat however many
+    rows match. Their load plans must not joinedload collections (use
+    selectinload, which runs per chunk).
+    """
+
+    #: Named eager-loading profiles: name -> callable returning loader options
+    load_plans: ClassVar[dict[str, Callable[[], tuple]]] = {}
 
     def __init__(self, model_class: type[T], session: Session | None = None):
         """Initialize repository with model class.
@@ -26,9 +52,84 @@ class BaseRepository(Generic[T]):
         """Get a single record by ID."""
         return self._session.get(self._model, id)
 
-    def get_all(self) -> list[T]:
+    def get_many(self, ids: Sequence[int], load: LoadPlan = None) -> list[T]:
+        """Get the records with these IDs in one query (missing IDs are skipped)."""
+        if not ids:
+            return []
+        return self._query(load).filter(self._model.id.in_(list(ids))).all()
+
+    def get_all(self, load: LoadPlan = None) -> list[T]:
         """Get all records."""
-        return self._session.query(self._model).all()
+        return self._query(load).all()
+
+    def iter_all(self, load: LoadPlan = None, chunk_size: int | None = None) -> Iterator[T]:
+        """Stream all records in id order."""
+        return self._stream(self._query(load).order_by(self._model.id), chunk_size)
+
+    def keyset_page(
+        self,
+        columns: Sequence[str],
+        after: int | None = None,
+        limit: int = 100,
+        ranges: dict[str, tuple] | None = None,
+        **filters,
+    ) -> list[Row]:
+        """Up to ``limit`` rows with an id above ``after``, in id order, selecting only ``columns``.
+
+        Keyset pagination: a page seeks past the previous page's last id on
+        the primary key instead of skipping rows with OFFSET, so every page
+        costs the same however deep it is.
+
+        Args:
+            columns: Column attribute names to select
+            after: Last id of the previous page (None for the first page)
+            limit: Page size
+            ranges: Column name -> (low, high) inclusive bounds, either may be None
+            filters: Column equality filters, as for ``Query.filter_by``
+        """
+        model = self._model
+        query = self._session.query(*(getattr(model, name) for name in columns))
+        query = query.filter_by(**filters)
+        for name, (low, high) in (ranges or {}).items():
+            column = getattr(model, name)
+            if low is not None:
+                query = query.filter(column >= low)
+            if high is not None:
+                query = query.filter(column <= high)
+        if after is not None:
+            query = query.filter(model.id > after)
+        return query.order_by(model.id).limit(limit).all()
+
+    def _stream(self, query: Query, chunk_size: int | None = None) -> Iterator:
+        """Iterate ``query`` through a server-side cursor, ``chunk_size`` rows per fetch."""
+        if chunk_size is None:
+            chunk_size = DEFAULT_CHUNK_SIZE
+            if has_app_context():
+                chunk_size = current_app.config.get("SQL_STREAM_CHUNK_SIZE", chunk_size)
+        yield from query.yield_per(chunk_size)
+
+    def _query(self, load: LoadPlan = None) -> Query:
+        """Start a query on the model with a load plan applied."""
+        return self._with_load(self._session.query(self._model), load)
+
+    def _with_load(self, query: Query, load: LoadPlan) -> Query:
+        """Apply a named load plan (or explicit loader options) to a query."""
+        if load is None:
+            return query
+
+        if isinstance(load, str):
+            try:
+                options = tuple(self.load_plans[load]())
+            except KeyError:
+                raise ValueError(
+                    f"Unknown load plan {load!r} for {self._model.__name__}"
+                ) from None
+        else:
+            options = tuple(load)
+
+        if has_app_context() and current_app.config.get("SQL_RAISE_ON_LAZY_LOAD"):
+            options += (raiseload("*", sql_only=True),)
+        return query.options(*options)
 
     def create(self, data: dict) -> T:
         """Create a new record.
@@ -80,3 +181,22 @@ class BaseRepository(Generic[T]):
     def count(self) -> int:
         """Count total records."""
         return self._session.query(self._model).count()
+
+    def get_version(self, **filters) -> RowVersion:
+        """Count, highest id and latest ``updated_at`` of the rows matching ``filters``.
+
+        A cheap validator for conditional GET: inserts and deletes change the
+        count or highest id, updates move ``updated_at`` (``created_at`` on
+        models without one).
+
+        Args:
+            filters: Column equality filters, as for ``Query.filter_by``
+        """
+        model = self._model
+        changed = model.updated_at if hasattr(model, "updated_at") else model.created_at
+        row = (
+            self._session.query(func.count(model.id), func.max(model.id), func.max(changed))
+            .filter_by(**filters)
+            .one()
+        )
+        return RowVersion._make(row)
@@ -0,0 +1,163 @@
+"""Append-only change log of ledger mutations, read as an incremental feed.
+
+Every flushed insert, update and delete of a property, tenant, payment, rent
+charge or allocation appends a ``change_log`` row in the same transaction,
+written by a session ``after_flush`` hook. That covers
+``BaseRepository.create`` / ``update`` / ``delete``, the ``PaymentService``
+allocation paths and charge status recomputes, and ORM cascades. The row id
+is the feed's sequence number. A consumer remembers the last one it applied
+and asks for the entries after it, reading O(changes) rows instead of
+whole tables.
+
+Entries carry column values: the loaded columns for inserts, the changed
+ones for updates, none for deletes. Timestamps the database fills in are
+left out.
+
+Rows written behind the ORM's back (``project-seed`` bulk loads, raw SQL)
+are not logged. Take a full copy first (``/api/v1``), then follow the feed
+from the ``latest_seq()`` read before the copy started.
+
+Sequence numbers are assigned at insert but transactions commit in any
+order: with concurrent writers, an entry may become visible after a higher
+one has already been read. ``since(settled_before=...)`` therefore stops at
+the first entry written after that time. The feed holds back the last
+``CHANGE_FEED_SETTLE_SECONDS``, so every lower sequence number has committed
+(or rolled back) by the time an entry is served, as long as write
+transactions and replica lag stay shorter than that.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app.database import bulk_insert
+from app.models.change_log import ChangeLog
+from app.models.payment import Payment
+from app.models.payment_allocation import PaymentAllocation
+from app.models.property import Property
+from app.models.rent_charge import RentCharge
+from app.models.tenant import Tenant
+from app.repositories.base_repository import BaseRepository
+from app.repositories.rows import ChangeRow
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+#: Logged models -> entity type (their table name)
+LOGGED_MODELS = {
+    model: model.__tablename__
+    for model in (Property, Tenant, Payment, RentCharge, PaymentAllocation)
+}
+
+
+class ChangeLogRepository(BaseRepository[ChangeLog]):
+    """Reads the change log."""
+
+    def __init__(self, session=None):
+        """Initialize with ChangeLog model."""
+        super().__init__(ChangeLog, session)
+
+    def since(
+        self,
+        seq: int = 0,
+        limit: int = 1000,
+        entity_types: Iterable[str] | None = None,
+        settled_before: datetime | None = None,
+    ) -> list[ChangeRow]:
+        """Up to ``limit`` entries after sequence number ``seq``, oldest first.
+
+        Args:
+            seq: Last sequence number already applied (0 for the whole log)
+            limit: Page size
+            entity_types: Only entries for these tables
+            settled_before: Stop at the first entry written after this (naive UTC)
+        """
+        query = self._session.query(
+            ChangeLog.id,
+            ChangeLog.entity_type,
+            ChangeLog.entity_id,
+            ChangeLog.operation,
+            ChangeLog.data,
+            ChangeLog.created_at,
+        ).filter(ChangeLog.id > seq)
+        if entity_types:
+            query = query.filter(ChangeLog.entity_type.in_(list(entity_types)))
+        rows = query.order_by(ChangeLog.id).limit(limit).all()
+        if settled_before is not None:
+            unsettled = next(
+                (i for i, row in enumerate(rows) if row.created_at > settled_before), len(rows)
+            )
+            rows = rows[:unsettled]
+        return [
+            ChangeRow(id, entity_type, entity_id, operation, data and json.loads(data), created)
+            for id, entity_type, entity_id, operation, data, created in rows
+        ]
+
+    def latest_seq(self) -> int:
+        """Highest sequence number written so far (0 for an empty log)."""
+        return self._session.query(func.max(ChangeLog.id)).scalar() or 0
+
+
+def _plain(value):
+    """A column value as JSON: amounts as strings, ISO dates, enum values."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _values(instance, changed_only: bool) -> dict:
+    state = inspect(instance)
+    values = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key not in state.dict:
+            continue
+        if changed_only and not state.attrs[attr.key].history.has_changes():
+            continue
+        values[attr.key] = _plain(state.dict[attr.key])
+    return values
+
+
+def _entry(
+    entity_type: str, instance, operation: str, data: dict | None, now: datetime
+) -> dict:
+    return {
+        "entity_type": entity_type,
+        "entity_id": instance.id,
+        "operation": operation,
+        "data": None if data is None else json.dumps(data),
+        "created_at": now,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _log_changes(session: Session, flush_context) -> None:
+    """Append a change log entry for each ledger row this flush changed."""
+    # Stamped at flush, not transaction start, for the feed's settle window (naive UTC)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = []
+    for instance in session.new:
+        entity_type = LOGGED_MODELS.get(type(instance))
+        if entity_type:
+            rows.append(_entry(entity_type, instance, INSERT, _values(instance, False), now))
+    for instance in session.dirty:
+        entity_type = LOGGED_MODELS.get(type(instance))
+        if entity_type and session.is_modified(instance, include_collections=False):
+            rows.append(_entry(entity_type, instance, UPDATE, _values(instance, True), now))
+    for instance in session.deleted:
+        entity_type = LOGGED_MODELS.get(type(instance))
+        if entity_type:
+            rows.append(_entry(entity_type, instance, DELETE, None, now))
+
+    bulk_insert(session.connection(), ChangeLog.__table__, rows)
@@ -0,0 +1,163 @@
+"""Idempotency key store."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.base_repository import BaseRepository
+
+
+def _now() -> datetime:
+    # Stored naive, in UTC like the database's own timestamps
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class IdempotencyKeyRepository(BaseRepository[IdempotencyKey]):
+    """Reserves, completes and releases idempotency keys.
+
+    Every method except ``mark_written`` commits, so a key's state is visible
+    to a concurrent retry as soon as it changes. ``owner`` is the token of the
+    request holding a key; methods given one only touch the key while that
+    request still holds it.
+    """
+
+    def __init__(self, session=None):
+        """Initialize with IdempotencyKey model."""
+        super().__init__(IdempotencyKey, session)
+
+    def reserve(
+        self,
+        key: str,
+        request_path: str,
+        request_hash: str,
+        ttl: int,
+        lease: float | None = None,
+        owner: str | None = None,
+    ) -> IdempotencyKey | None:
+        """Claim ``key`` for a request, unless an earlier request holds it.
+
+        Expired keys are purged first. An unfinished reservation of the same
+        request that wrote nothing and is older than ``lease`` seconds is
+        taken over: the request holding it is assumed dead. One whose write
+        committed is never taken over, even if its response was not saved.
+
+        Args:
+            key: Client-chosen key
+            request_path: "METHOD /path" of the request
+            request_hash: SHA-256 of the request body
+            ttl: Seconds to keep the key
+            lease: Seconds after which an unfinished reservation may be taken over
+            owner: Token of the request claiming the key
+
+        Returns:
+            None if the key is now reserved for this request, otherwise the
+            earlier request's key (``status_code`` is None while it runs)
+        """
+        now = _now()
+        self._session.query(IdempotencyKey).filter(IdempotencyKey.expires_at < now).delete(
+            synchronize_session=False
+        )
+        self._session.add(
+            IdempotencyKey(
+                key=key,
+                request_path=request_path,
+                request_hash=request_hash,
+                reserved_at=now,
+                owner=owner,
+                expires_at=now + timedelta(seconds=ttl),
+            )
+        )
+        try:
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            if lease is None or not self._take_over(
+                key, request_path, request_hash, now, lease, owner
+            ):
+                return self.find(key)
+        return None
+
+    def _take_over(
+        self,
+        key: str,
+        request_path: str,
+        request_hash: str,
+        now: datetime,
+        lease: float,
+        owner: str | None,
+    ) -> bool:
+        """Re-reserve ``key`` if its request wrote nothing and never finished within ``lease``."""
+        taken = (
+            self._session.query(IdempotencyKey)
+            .filter(
+                IdempotencyKey.key == key,
+                IdempotencyKey.request_path == request_path,
+                IdempotencyKey.request_hash == request_hash,
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.written_at.is_(None),
+                IdempotencyKey.reserved_at < now - timedelta(seconds=lease),
+            )
+            .update(
+                {IdempotencyKey.reserved_at: now, IdempotencyKey.owner: owner},
+                synchronize_session=False,
+            )
+        )
+        self._session.commit()
+        return taken == 1
+
+    def find(self, key: str) -> IdempotencyKey | None:
+        """The key as currently stored (re-read, not from the identity map)."""
+        return (
+            self._session.query(IdempotencyKey)
+            .populate_existing()
+            .filter(IdempotencyKey.key == key)
+            .first()
+        )
+
+    def mark_written(self, key: str, owner: str) -> bool:
+        """Record that ``owner``'s write is committing, in the write's own transaction.
+
+        Does not commit. Returns False if ``owner`` no longer holds the key
+        (a retry took it over), in which case the write must not commit.
+        """
+        marked = (
+            self._session.query(IdempotencyKey)
+            .filter(IdempotencyKey.key == key, IdempotencyKey.owner == owner)
+            .update({IdempotencyKey.written_at: _now()}, synchronize_session=False)
+        )
+        return marked == 1
+
+    def complete(
+        self,
+        key: str,
+        status_code: int,
+        location: str | None,
+        content_type: str | None,
+        body: str | None,
+        owner: str | None = None,
+    ) -> None:
+        """Save the response of the request holding ``key``."""
+        self._held(key, owner).update(
+            {
+                IdempotencyKey.status_code: status_code,
+                IdempotencyKey.location: location,
+                IdempotencyKey.content_type: content_type,
+                IdempotencyKey.body: body,
+            },
+            synchronize_session=False,
+        )
+        self._session.commit()
+
+    def release(self, key: str, owner: str | None = None) -> None:
+        """Forget ``key`` so a retry runs the request again."""
+        self._held(key, owner).delete(synchronize_session=False)
+        self._session.commit()
+
+    def _held(self, key: str, owner: str | None):
+        query = self._session.query(IdempotencyKey).filter(IdempotencyKey.key == key)
+        if owner is not None:
+            query = query.filter(IdempotencyKey.owner == owner)
+        return query
@@ -1,24 +1,54 @@
 """Payment repository."""
 
+from collections.abc import Iterator
 from datetime import date
+from decimal import Decimal
 
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.orm import Query, joinedload, selectinload
 
 from app.models.payment import Payment
-from app.repositories.base_repository import BaseRepository
+from app.models.payment_allocation import PaymentAllocation
+from app.models.property import Property
+from app.repositories.base_repository import BaseRepository, LoadPlan
+from app.models.rent_charge import RentCharge
+from app.repositories.rows import AllocationRow, PaymentRow, RowVersion
 
 
 class PaymentRepository(BaseRepository[Payment]):
     """Repository for Payment operations."""
 
+    load_plans = {
+        # Lists showing allocated / unallocated totals
+        "list": lambda: (selectinload(Payment.allocations),),
+        # Rows showing the property address or city
+        "with_property": lambda: (joinedload(Payment.property),),
+        # Balance checks in PaymentService
+        "allocations": lambda: (joinedload(Payment.allocations),),
+        # Detail page: property plus each allocation's charge period
+        "detail": lambda: (
+            joinedload(Payment.property),
+            joinedload(Payment.allocations).joinedload(PaymentAllocation.rent_charge),
+        ),
+        # Partial updates after an allocation change: each allocated charge's
+        # status and what it still owes, in one query
+        "panel": lambda: (
+            joinedload(Payment.allocations)
+            .joinedload(PaymentAllocation.rent_charge)
+            .joinedload(RentCharge.payment_allocations),
+        ),
+    }
+
     def __init__(self, session=None):
         """Initialize with Payment model."""
         super().__init__(Payment, session)
 
-    def get_by_property(self, property_id: int, limit: int | None = None) -> list[Payment]:
+    def get_by_property(
+        self, property_id: int, limit: int | None = None, load: LoadPlan = None
+    ) -> list[Payment]:
         """Get payments for a property, ordered by date."""
         query = (
-            self._session.query(Payment)
+            self._query(load)
             .filter(Payment.property_id == property_id)
             .order_by(Payment.payment_date.desc())
         )
@@ -27,7 +57,11 @@ class PaymentRepository(BaseRepository[Payment]):
         return query.all()
 
     def get_by_date_range(
-        self, start_date: date, end_date: date, property_id: int | None = None
+        self,
+        start_date: date,
+        end_date: date,
+        property_id: int | None = None,
+        load: LoadPlan = None,
     ) -> list[Payment]:
         """Get payments within a date range.
 
@@ -35,14 +69,33 @@ class PaymentRepository(BaseRepository[Payment]):
             start_date: Start date (inclusive)
             end_date: End date (inclusive)
             property_id: Optional property filter
+            load: Optional load plan name
         """
-        query = self._session.query(Payment).filter(
+        return self._date_range_query(start_date, end_date, property_id, load).all()
+
+    def iter_by_date_range(
+        self,
+        start_date: date,
+        end_date: date,
+        property_id: int | None = None,
+        load: LoadPlan = None,
+        chunk_size: int | None = None,
+    ) -> Iterator[Payment]:
+        """Stream ``get_by_date_range`` results, ``chunk_size`` rows per fetch."""
+        return self._stream(
+            self._date_range_query(start_date, end_date, property_id, load), chunk_size
+        )
+
+    def _date_range_query(
+        self, start_date: date, end_date: date, property_id: int | None, load: LoadPlan
+    ) -> Query:
+        query = self._query(load).filter(
             Payment.payment_date >= start_date,
             Payment.payment_date <= end_date,
         )
         if property_id:
             query = query.filter(Payment.property_id == property_id)
-        return query.order_by(Payment.payment_date.desc()).all()
+        return query.order_by(Payment.payment_date.desc(), Payment.id.desc())
 
     def get_total_by_property(self, property_id: int) -> float:
         """Get total payments received for a property."""
@@ -53,22 +106,163 @@ class PaymentRepository(BaseRepository[Payment]):
         )
         return float(result) if result else 0.0
 
-    def get_recent(self, limit: int = 5) -> list[Payment]:
+    def count_and_total(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> tuple[int, Decimal]:
+        """Number and total amount of the payments dated in a range (one aggregate query)."""
+        query = self._session.query(
+            func.count(Payment.id), func.coalesce(func.sum(Payment.amount), 0)
+        )
+        if start_date:
+            query = query.filter(Payment.payment_date >= start_date)
+        if end_date:
+            query = query.filter(Payment.payment_date <= end_date)
+        count, total = query.one()
+        return count, total
+
+    def get_recent(self, limit: int = 5, load: LoadPlan = None) -> list[Payment]:
         """Get recent payments across all properties."""
         return (
-            self._session.query(Payment)
+            self._query(load)
             .order_by(Payment.payment_date.desc())
             .limit(limit)
             .all()
         )
 
-    def get_with_allocations(self, payment_id: int) -> Payment | None:
-        """Get payment with its allocations loaded."""
-        from sqlalchemy.orm import joinedload
+    def list_rows(
+        self,
+        property_id: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int | None = None,
+    ) -> list[PaymentRow]:
+        """Payments as read-only rows with property address and allocation totals.
+
+        Args:
+            property_id: Optional property filter
+            start_date: Optional start date (inclusive)
+            end_date: Optional end date (inclusive)
+            limit: Optional maximum number of rows
+        """
+        query = self._rows_query(property_id, start_date, end_date)
+        if limit:
+            query = query.limit(limit)
+        return [PaymentRow._make(row) for row in query]
+
+    def iter_rows(
+        self,
+        property_id: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        chunk_size: int | None = None,
+    ) -> Iterator[PaymentRow]:
+        """Stream ``list_rows`` results, ``chunk_size`` rows per fetch."""
+        for row in self._stream(self._rows_query(property_id, start_date, end_date), chunk_size):
+            yield PaymentRow._make(row)
+
+    def _rows_query(
+        self, property_id: int | None, start_date: date | None, end_date: date | None
+    ) -> Query:
+        allocated = (
+            select(func.coalesce(func.sum(PaymentAllocation.amount), 0))
+            .where(PaymentAllocation.payment_id == Payment.id)
+            .scalar_subquery()
+        )
+        allocation_count = (
+            select(func.count(PaymentAllocation.id))
+            .where(PaymentAllocation.payment_id == Payment.id)
+            .scalar_subquery()
+        )
+        query = self._session.query(
+            Payment.id,
+            Payment.property_id,
+            Payment.payment_date,
+            Payment.amount,
+            Payment.notes,
+            allocated,
+            allocation_count,
+            Property.address,
+            Property.city,
+        ).join(Property, Property.id == Payment.property_id)
+
+        if property_id:
+            query = query.filter(Payment.property_id == property_id)
+        if start_date:
+            query = query.filter(Payment.payment_date >= start_date)
+        if end_date:
+            query = query.filter(Payment.payment_date <= end_date)
+        return query.order_by(Payment.payment_date.desc(), Payment.id.desc())
+
+    def iter_allocation_rows(
+        self,
+        property_id: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        chunk_size: int | None = None,
+    ) -> Iterator[AllocationRow]:
+        """Stream allocations with their payment date and charge period.
 
+        Args:
+            property_id: Optional property filter
+            start_date: Optional payment start date (inclusive)
+            end_date: Optional payment end date (inclusive)
+            chunk_size: Rows per fetch
+        """
+        query = (
+            self._session.query(
+                PaymentAllocation.id,
+                PaymentAllocation.payment_id,
+                PaymentAllocation.rent_charge_id,
+                PaymentAllocation.amount,
+                Payment.payment_date,
+                RentCharge.period_start,
+                RentCharge.period_end,
+                Payment.property_id,
+                Property.address,
+                Property.city,
+            )
+            .join(Payment, Payment.id == PaymentAllocation.payment_id)
+            .join(RentCharge, RentCharge.id == PaymentAllocation.rent_charge_id)
+            .join(Property, Property.id == Payment.property_id)
+        )
+        if property_id:
+            query = query.filter(Payment.property_id == property_id)
+        if start_date:
+            query = query.filter(Payment.payment_date >= start_date)
+        if end_date:
+            query = query.filter(Payment.payment_date <= end_date)
+        query = query.order_by(Payment.payment_date.desc(), PaymentAllocation.id.desc())
+        for row in self._stream(query, chunk_size):
+            yield AllocationRow._make(row)
+
+    def get_allocation_version(
+        self,
+        payment_id: int | None = None,
+        rent_charge_id: int | None = None,
+        property_id: int | None = None,
+    ) -> RowVersion:
+        """``get_version`` for the allocations of a payment, a charge or a property's payments."""
+        query = self._session.query(
+            func.count(PaymentAllocation.id),
+            func.max(PaymentAllocation.id),
+            func.max(PaymentAllocation.created_at),
+        )
+        if payment_id:
+            query = query.filter(PaymentAllocation.payment_id == payment_id)
+        if rent_charge_id:
+            query = query.filter(PaymentAllocation.rent_charge_id == rent_charge_id)
+        if property_id:
+            query = query.join(Payment, Payment.id == PaymentAllocation.payment_id).filter(
+                Payment.property_id == property_id
+            )
+        return RowVersion._make(query.one())
+
+    def get_with_allocations(
+        self, payment_id: int, load: LoadPlan = "allocations"
+    ) -> Payment | None:
+        """Get payment with its allocations loaded."""
         return (
-            self._session.query(Payment)
-            .options(joinedload(Payment.allocations))
+            self._query(load)
             .filter(Payment.id == payment_id)
             .first()
         )
@@ -0,0 +1,175 @@
+"""Process-wide cache of the property directory (id -> address/city/rent/active).
+
+Select boxes need every property's label, which used
+to mean a full ``PropertyRepository().get_all()`` per request. The directory
+keeps one compact snapshot per process:
+
+* ``PropertyRepository`` writes call ``invalidate()`` (write-through), so the
+  process that made the change sees it immediately.
+* Other worker processes pick changes up when their snapshot's TTL expires.
+* Above ``max_entries`` properties no full snapshot is kept, so memory stays
+  bounded: ``get()`` keeps the ``max_entries`` most recently used entries,
+  loaded one property at a time, and ``all()`` / ``active()`` read the
+  database. Whether the directory is that large is checked with a count
+  once per TTL.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class PropertyEntry(NamedTuple):
+    """Cached directory entry for one property."""
+
+    id: int
+    address: str
+    city: str
+    postal_code: str
+    monthly_rent: Decimal
+    is_active: bool
+
+    @property
+    def label(self) -> str:
+        return f"{self.address}, {self.city}"
+
+
+class PropertyDirectory:
+    """Read-mostly, TTL-bounded snapshot of all properties."""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10000):
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._max_entries = max_entries
+        #: Full snapshot, or None when not loaded or too large
+        self._entries: dict[int, PropertyEntry] | None = None
+        #: Most recently used entries while the directory is too large to snapshot
+        self._recent: OrderedDict[int, PropertyEntry] = OrderedDict()
+        self._oversized = False
+        self._loaded_at = 0.0
+        self._generation = 0
+
+    def configure(self, ttl: float | None = None, max_entries: int | None = None) -> None:
+        """Change limits (and drop the current snapshot)."""
+        if ttl is not None:
+            self._ttl = ttl
+        if max_entries is not None:
+            self._max_entries = max_entries
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next lookup reloads it."""
+        with self._lock:
+            self._entries = None
+            self._recent.clear()
+            self._oversized = False
+            self._loaded_at = 0.0
+            self._generation += 1
+
+    def _rows(self, ids: list[int] | None = None) -> list[tuple]:
+        from app.database import primary_reads
+        from app.repositories.property_repository import PropertyRepository
+
+        # Shared across requests for the TTL, so never cache a lagging replica's view
+        with primary_reads():
+            return PropertyRepository().get_directory_rows(ids)
+
+    def _count(self, active_only: bool = False) -> int:
+        from app.database import primary_reads
+        from app.repositories.property_repository import PropertyRepository
+
+        with primary_reads():
+            repo = PropertyRepository()
+            return repo.count_active() if active_only else repo.count()
+
+    def _snapshot(self) -> dict[int, PropertyEntry] | None:
+        """The full snapshot, or None if the directory has more than ``max_entries``."""
+        if time.monotonic() - self._loaded_at < self._ttl:
+            entries = self._entries
+            if entries is not None or self._oversized:
+                return entries
+
+        generation = self._generation
+        entries = None
+        count = self._count()
+        if count <= self._max_entries:
+            entries = {row[0]: PropertyEntry._make(row) for row in self._rows()}
+            if len(entries) > self._max_entries:
+                entries = None
+        if entries is None:
+            logger.warning(
+                "Property directory has %d entries (limit %d); caching recently used ones only",
+                count,
+                self._max_entries,
+            )
+
+        with self._lock:
+            # Skip storing if a write invalidated the directory while we were loading
+            if generation == self._generation:
+                self._entries = entries
+                self._oversized = entries is None
+                # Recently used entries expire with the snapshot
+                self._recent.clear()
+                self._loaded_at = time.monotonic()
+        return entries
+
+    def _get_recent(self, property_id: int) -> PropertyEntry | None:
+        with self._lock:
+            entry = self._recent.get(property_id)
+            if entry is not None:
+                self._recent.move_to_end(property_id)
+                return entry
+            generation = self._generation
+
+        rows = self._rows([property_id])
+        if not rows:
+            return None
+        entry = PropertyEntry._make(rows[0])
+        with self._lock:
+            if generation == self._generation:
+                self._recent[property_id] = entry
+                while len(self._recent) > self._max_entries:
+                    self._recent.popitem(last=False)
+        return entry
+
+    def all(self) -> list[PropertyEntry]:
+        """All properties, ordered by id."""
+        entries = self._snapshot()
+        if entries is None:
+            return [PropertyEntry._make(row) for row in self._rows()]
+        return sorted(entries.values())
+
+    def active(self) -> list[PropertyEntry]:
+        """Active properties, ordered by id."""
+        return [e for e in self.all() if e.is_active]
+
+    def get(self, property_id: int) -> PropertyEntry | None:
+        """Entry for one property, or None if it does not exist."""
+        entries = self._snapshot()
+        if entries is None:
+            return self._get_recent(property_id)
+        return entries.get(property_id)
+
+    def count(self, active_only: bool = False) -> int:
+        """Number of (active) properties, without listing them when not snapshotted."""
+        entries = self._snapshot()
+        if entries is None:
+            return self._count(active_only)
+        if active_only:
+            return sum(1 for e in entries.values() if e.is_active)
+        return len(entries)
+
+    def choices(self, active_only: bool = False) -> list[tuple[int, str]]:
+        """(id, "address, city") pairs for select fields."""
+        entries = self.active() if active_only else self.all()
+        return [(e.id, e.label) for e in entries]
+
+
+property_directory = PropertyDirectory()
@@ -1,19 +1,82 @@
 """Property repository."""
 
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+
 from app.models.property import Property
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, LoadPlan
+from app.repositories.property_directory import property_directory
+from app.repositories.rows import PropertyRow, SearchHit, SearchPage
+from app.repositories.search_index import PROPERTY, SearchIndexRepository
 
 
 class PropertyRepository(BaseRepository[Property]):
     """Repository for Property operations."""
 
+    load_plans = {
+        # Occupancy: current tenants per property
+        "with_tenants": lambda: (selectinload(Property.tenants),),
+    }
+
     def __init__(self, session=None):
         """Initialize with Property model."""
         super().__init__(Property, session)
 
-    def get_active(self) -> list[Property]:
+    def create(self, data: dict) -> Property:
+        """Create a property and refresh the cached directory."""
+        instance = super().create(data)
+        property_directory.invalidate()
+        return instance
+
+    def update(self, id: int, data: dict) -> Property | None:
+        """Update a property and refresh the cached directory."""
+        instance = super().update(id, data)
+        property_directory.invalidate()
+        return instance
+
+    def delete(self, id: int) -> bool:
+        """Delete a property and refresh the cached directory."""
+        deleted = super().delete(id)
+        property_directory.invalidate()
+        return deleted
+
+    def get_directory_rows(self, ids: list[int] | None = None) -> list[tuple]:
+        """(id, address, city, postal_code, monthly_rent, is_active) for every property.
+
+        Args:
+            ids: Only these properties
+        """
+        query = self._session.query(
+            Property.id,
+            Property.address,
+            Property.city,
+            Property.postal_code,
+            Property.monthly_rent,
+            Property.is_active,
+        )
+        if ids is not None:
+            query = query.filter(Property.id.in_(ids))
+        return query.order_by(Property.id).all()
+
+    def count_active(self) -> int:
+        """Number of active properties."""
+        return (
+            self._session.query(func.count(Property.id))
+            .filter(Property.is_active.is_(True))
+            .scalar()
+        )
+
+    def total_active_rent(self):
+        """Sum of the monthly rent of active properties (0 when there are none)."""
+        return (
+            self._session.query(func.coalesce(func.sum(Property.monthly_rent), 0))
+            .filter(Property.is_active.is_(True))
+            .scalar()
+        )
+
+    def get_active(self, load: LoadPlan = None) -> list[Property]:
         """Get all active properties."""
-        return self._session.query(Property).filter(Property.is_active == True).all()
+        return self._query(load).filter(Property.is_active.is_(True)).all()
 
     def get_with_tenant_count(self) -> list[tuple[Property, int]]:
         """Get properties with tenant counts.
@@ -32,10 +95,60 @@ class PropertyRepository(BaseRepository[Property]):
             .all()
         )
 
-    def get_by_city(self, city: str) -> list[Property]:
-        """Get properties by city."""
+    def get_by_city(self, city: str, load: LoadPlan = None) -> list[Property]:
+        """Get properties by city (case-insensitive substring)."""
+        return self._query(load).filter(Property.city.ilike(f"%{city}%")).all()
+
+    def search(self, text: str, page: int = 1, per_page: int = 20) -> SearchPage:
+        """Ranked search over property address, city and postal code.
+
+        Args:
+            text: Search text; each word matches the start of an indexed word
+            page: 1-based page number
+            per_page: Results per page
+
+        Returns:
+            SearchPage of SearchHit(PropertyRow, score), best match first
+        """
+        page = max(page, 1)
+        ranked, total = SearchIndexRepository(self._session).match(
+            PROPERTY, text, limit=per_page, offset=(page - 1) * per_page
+        )
+        rows = {}
+        if ranked:
+            query = self._session.query(
+                Property.id,
+                Property.address,
+                Property.city,
+                Property.postal_code,
+                Property.monthly_rent,
+                Property.is_active,
+            ).filter(Property.id.in_([id for id, _ in ranked]))
+            rows = {row[0]: PropertyRow._make(row) for row in query}
+        hits = [SearchHit(rows[id], score) for id, score in ranked if id in rows]
+        return SearchPage(hits, total, page, per_page)
+
+    def search_prefix(
+        self, term: str, limit: int = 10, active_only: bool = False
+    ) -> list[tuple]:
+        """Typeahead lookup: address, city or postal code words starting with ``term``.
+
+        Served from the search index; terms shorter than two characters
+        return nothing.
+
+        Returns:
+            List of (id, address, city, postal_code) tuples, best match first
+        """
+        matches = SearchIndexRepository(self._session).matching(PROPERTY, term)
+        if matches is None:
+            return []
+        query = self._session.query(
+            Property.id, Property.address, Property.city, Property.postal_code
+        ).join(matches, matches.c.entity_id == Property.id)
+        if active_only:
+            query = query.filter(Property.is_active.is_(True))
         return (
-            self._session.query(Property)
-            .filter(Property.city.ilike(f"%{city}%"))
+            query.order_by(matches.c.score.desc(), Property.address, Property.id)
+            .limit(limit)
             .all()
         )
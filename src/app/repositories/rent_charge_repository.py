@@ -1,8 +1,11 @@
 """Rent charge repository."""
 
+from collections.abc import Iterator
 from datetime import date
+from decimal import Decimal
 
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.orm import Query, joinedload, load_only, selectinload
 
 from app.domain.charge_states import (
     statuses_in_total_arrears_money,
@@ -11,45 +14,110 @@ from app.domain.charge_states import (
     statuses_upcoming_dues,
     statuses_in_arrears_report,
 )
+from app.models.payment_allocation import PaymentAllocation
+from app.models.property import Property
 from app.models.rent_charge import ChargeStatus, RentCharge
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, LoadPlan
+from app.repositories.rows import RentChargeRow, RowVersion
 
 
 class RentChargeRepository(BaseRepository[RentCharge]):
     """Repository for RentCharge operations."""
 
+    load_plans = {
+        # Lists showing allocated / remaining amounts
+        "list": lambda: (selectinload(RentCharge.payment_allocations),),
+        # Rows showing the property address or city
+        "with_property": lambda: (joinedload(RentCharge.property),),
+        # Dashboard rows: due date, amount and status badge only
+        "summary": lambda: (
+            load_only(
+                RentCharge.id, RentCharge.due_date, RentCharge.amount_due, RentCharge.status
+            ),
+        ),
+        # Status recompute in PaymentService
+        "allocations": lambda: (joinedload(RentCharge.payment_allocations),),
+        # Detail page: property plus each allocation's payment date
+        "detail": lambda: (
+            joinedload(RentCharge.property),
+            joinedload(RentCharge.payment_allocations).joinedload(PaymentAllocation.payment),
+        ),
+        # Arrears report: property and its tenants per charge
+        "arrears": lambda: (
+            joinedload(RentCharge.property).selectinload(Property.tenants),
+        ),
+    }
+
     def __init__(self, session=None):
         """Initialize with RentCharge model."""
         super().__init__(RentCharge, session)
 
-    def get_by_property(self, property_id: int) -> list[RentCharge]:
+    def get_by_property(self, property_id: int, load: LoadPlan = None) -> list[RentCharge]:
         """Get all rent charges for a property."""
         return (
-            self._session.query(RentCharge)
+            self._query(load)
             .filter(RentCharge.property_id == property_id)
             .order_by(RentCharge.due_date.desc())
             .all()
         )
 
-    def get_by_status(self, status: ChargeStatus) -> list[RentCharge]:
+    def get_by_status(self, status: ChargeStatus, load: LoadPlan = None) -> list[RentCharge]:
         """Get rent charges by status."""
         return (
-            self._session.query(RentCharge)
+            self._query(load)
             .filter(RentCharge.status == status)
             .order_by(RentCharge.due_date)
             .all()
         )
 
-    def get_charges_for_arrears_report(self) -> list[RentCharge]:
+    def count_by_status(self) -> dict[ChargeStatus, int]:
+        """Number of rent charges per status (every status present, zero if none)."""
+        counts = dict.fromkeys(ChargeStatus, 0)
+        for status, count in (
+            self._session.query(RentCharge.status, func.count(RentCharge.id))
+            .group_by(RentCharge.status)
+        ):
+            counts[status] = count
+        return counts
+
+    def get_allocated_version(self, payment_id: int) -> RowVersion:
+        """``get_version`` for the charges a payment is allocated to."""
+        row = (
+            self._session.query(
+                func.count(RentCharge.id), func.max(RentCharge.id), func.max(RentCharge.updated_at)
+            )
+            .join(PaymentAllocation, PaymentAllocation.rent_charge_id == RentCharge.id)
+            .filter(PaymentAllocation.payment_id == payment_id)
+            .one()
+        )
+        return RowVersion._make(row)
+
+    def count_and_total(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> tuple[int, Decimal]:
+        """Number and total amount due of the charges whose period lies in a range."""
+        query = self._session.query(
+            func.count(RentCharge.id), func.coalesce(func.sum(RentCharge.amount_due), 0)
+        )
+        if start_date:
+            query = query.filter(RentCharge.period_start >= start_date)
+        if end_date:
+            query = query.filter(RentCharge.period_end <= end_date)
+        count, total = query.one()
+        return count, total
+
+    def get_charges_for_arrears_report(self, load: LoadPlan = None) -> list[RentCharge]:
         """Charges included in tenant arrears report (asks domain which statuses qualify)."""
         return (
-            self._session.query(RentCharge)
+            self._query(load)
             .filter(RentCharge.status.in_(statuses_in_arrears_report()))
             .order_by(RentCharge.due_date)
             .all()
         )
 
-    def get_overdue(self, as_of_date: date | None = None) -> list[RentCharge]:
+    def get_overdue(
+        self, as_of_date: date | None = None, load: LoadPlan = None
+    ) -> list[RentCharge]:
         """Get overdue charges (due date passed, not fully paid).
 
         Args:
@@ -59,7 +127,7 @@ class RentChargeRepository(BaseRepository[RentCharge]):
             as_of_date = date.today()
 
         return (
-            self._session.query(RentCharge)
+            self._query(load)
             .filter(
                 RentCharge.due_date < as_of_date,
                 RentCharge.status.in_(statuses_overdue_due_passed()),
@@ -68,13 +136,13 @@ class RentChargeRepository(BaseRepository[RentCharge]):
             .all()
         )
 
-    def get_upcoming(self, days: int = 7) -> list[RentCharge]:
+    def get_upcoming(self, days: int = 7, load: LoadPlan = None) -> list[RentCharge]:
         """Get charges due within the next N days."""
         today = date.today()
         future = date.fromordinal(today.toordinal() + days)
 
         return (
-            self._session.query(RentCharge)
+            self._query(load)
             .filter(
                 RentCharge.due_date >= today,
                 RentCharge.due_date <= future,
@@ -84,10 +152,12 @@ class RentChargeRepository(BaseRepository[RentCharge]):
             .all()
         )
 
-    def get_outstanding_by_property(self, property_id: int) -> list[RentCharge]:
+    def get_outstanding_by_property(
+        self, property_id: int, load: LoadPlan = None
+    ) -> list[RentCharge]:
         """Get outstanding (unpaid) charges for a property, ordered by due_date (oldest first)."""
         return (
-            self._session.query(RentCharge)
+            self._query(load)
             .filter(
                 RentCharge.property_id == property_id,
                 RentCharge.status.in_(statuses_outstanding_charges()),
@@ -98,24 +168,16 @@ class RentChargeRepository(BaseRepository[RentCharge]):
 
     def get_total_arrears(self) -> float:
         """Get total amount in arrears across all properties."""
-        from app.models.payment_allocation import PaymentAllocation
-
-        # Subquery for allocated amounts
+        # Allocated total per charge, looked up by rent_charge_id for the
+        # matching charges only (not grouped over every allocation)
         allocated = (
-            self._session.query(
-                PaymentAllocation.rent_charge_id.label("charge_id"),
-                func.sum(PaymentAllocation.amount).label("total_allocated"),
-            )
-            .group_by(PaymentAllocation.rent_charge_id)
-            .subquery()
+            select(func.coalesce(func.sum(PaymentAllocation.amount), 0))
+            .where(PaymentAllocation.rent_charge_id == RentCharge.id)
+            .scalar_subquery()
         )
 
-        # Get charges in arrears with their outstanding amounts
         result = (
-            self._session.query(
-                func.sum(RentCharge.amount_due - func.coalesce(allocated.c.total_allocated, 0))
-            )
-            .outerjoin(allocated, RentCharge.id == allocated.c.charge_id)
+            self._session.query(func.sum(RentCharge.amount_due - allocated))
             .filter(
                 RentCharge.status.in_(statuses_in_total_arrears_money()),
             )
@@ -124,19 +186,22 @@ class RentChargeRepository(BaseRepository[RentCharge]):
 
         return float(result) if result else 0.0
 
-    def get_with_allocations(self, charge_id: int) -> RentCharge | None:
+    def get_with_allocations(
+        self, charge_id: int, load: LoadPlan = "allocations"
+    ) -> RentCharge | None:
         """Get rent charge with its payment allocations."""
-        from sqlalchemy.orm import joinedload
-
         return (
-            self._session.query(RentCharge)
-            .options(joinedload(RentCharge.payment_allocations))
+            self._query(load)
             .filter(RentCharge.id == charge_id)
             .first()
         )
 
     def get_by_date_range(
-        self, start_date: date, end_date: date, property_id: int | None = None
+        self,
+        start_date: date,
+        end_date: date,
+        property_id: int | None = None,
+        load: LoadPlan = None,
     ) -> list[RentCharge]:
         """Get rent charges within a date range (by period).
 
@@ -144,16 +209,35 @@ class RentChargeRepository(BaseRepository[RentCharge]):
             start_date: Start date (inclusive)
             end_date: End date (inclusive)
             property_id: Optional property filter
+            load: Optional load plan name
         """
-        query = self._session.query(RentCharge).filter(
+        return self._date_range_query(start_date, end_date, property_id, load).all()
+
+    def iter_by_date_range(
+        self,
+        start_date: date,
+        end_date: date,
+        property_id: int | None = None,
+        load: LoadPlan = None,
+        chunk_size: int | None = None,
+    ) -> Iterator[RentCharge]:
+        """Stream ``get_by_date_range`` results, ``chunk_size`` rows per fetch."""
+        return self._stream(
+            self._date_range_query(start_date, end_date, property_id, load), chunk_size
+        )
+
+    def _date_range_query(
+        self, start_date: date, end_date: date, property_id: int | None, load: LoadPlan
+    ) -> Query:
+        query = self._query(load).filter(
             RentCharge.period_start >= start_date,
             RentCharge.period_end <= end_date,
         )
         if property_id:
             query = query.filter(RentCharge.property_id == property_id)
-        return query.order_by(RentCharge.due_date).all()
+        return query.order_by(RentCharge.due_date, RentCharge.id)
 
-    def get_recent(self, days: int = 30) -> list[RentCharge]:
+    def get_recent(self, days: int = 30, load: LoadPlan = None) -> list[RentCharge]:
         """Get rent charges created within the past N days.
 
         Args:
@@ -163,8 +247,74 @@ class RentChargeRepository(BaseRepository[RentCharge]):
         past = date.fromordinal(today.toordinal() - days)
 
         return (
-            self._session.query(RentCharge)
+            self._query(load)
             .filter(RentCharge.created_at >= past)
             .order_by(RentCharge.created_at.desc())
             .all()
         )
+
+    def list_rows(
+        self,
+        property_id: int | None = None,
+        status: ChargeStatus | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[RentChargeRow]:
+        """Rent charges as read-only rows with property address and allocated total.
+
+        Args:
+            property_id: Optional property filter
+            status: Optional status filter
+            start_date: Optional period start lower bound (inclusive)
+            end_date: Optional period end upper bound (inclusive)
+        """
+        query = self._rows_query(property_id, status, start_date, end_date)
+        return [RentChargeRow._make(row) for row in query]
+
+    def iter_rows(
+        self,
+        property_id: int | None = None,
+        status: ChargeStatus | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        chunk_size: int | None = None,
+    ) -> Iterator[RentChargeRow]:
+        """Stream ``list_rows`` results, ``chunk_size`` rows per fetch."""
+        query = self._rows_query(property_id, status, start_date, end_date)
+        for row in self._stream(query, chunk_size):
+            yield RentChargeRow._make(row)
+
+    def _rows_query(
+        self,
+        property_id: int | None,
+        status: ChargeStatus | None,
+        start_date: date | None,
+        end_date: date | None,
+    ) -> Query:
+        allocated = (
+            select(func.coalesce(func.sum(PaymentAllocation.amount), 0))
+            .where(PaymentAllocation.rent_charge_id == RentCharge.id)
+            .scalar_subquery()
+        )
+        query = self._session.query(
+            RentCharge.id,
+            RentCharge.property_id,
+            RentCharge.period_start,
+            RentCharge.period_end,
+            RentCharge.amount_due,
+            RentCharge.due_date,
+            RentCharge.status,
+            allocated,
+            Property.address,
+            Property.city,
+        ).join(Property, Property.id == RentCharge.property_id)
+
+        if property_id:
+            query = query.filter(RentCharge.property_id == property_id)
+        if status:
+            query = query.filter(RentCharge.status == status)
+        if start_date:
+            query = query.filter(RentCharge.period_start >= start_date)
+        if end_date:
+            query = query.filter(RentCharge.period_end <= end_date)
+        return query.order_by(RentCharge.due_date.desc(), RentCharge.id.desc())
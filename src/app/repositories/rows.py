@@ -0,0 +1,131 @@
+"""Read-only row types returned by repository projection queries.
+
+List and report pages only render a handful of columns. Projection queries
+select exactly those (plus the property address and allocation totals) into
+these tuples, skipping ORM hydration, the identity map and change tracking.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, NamedTuple, Optional
+
+from app.models.rent_charge import ChargeStatus
+
+
+class PaymentRow(NamedTuple):
+    """Payment list / report row."""
+
+    id: int
+    property_id: int
+    payment_date: date
+    amount: Decimal
+    notes: Optional[str]
+    allocated: Decimal
+    allocation_count: int
+    property_address: str
+    property_city: str
+
+    @property
+    def unallocated(self) -> Decimal:
+        return self.amount - self.allocated
+
+
+class RentChargeRow(NamedTuple):
+    """Rent charge list / report row."""
+
+    id: int
+    property_id: int
+    period_start: date
+    period_end: date
+    amount_due: Decimal
+    due_date: date
+    status: ChargeStatus
+    allocated: Decimal
+    property_address: str
+    property_city: str
+
+    @property
+    def remaining(self) -> Decimal:
+        return self.amount_due - self.allocated
+
+
+class AllocationRow(NamedTuple):
+    """Payment allocation export row: the payment and charge it links."""
+
+    id: int
+    payment_id: int
+    rent_charge_id: int
+    amount: Decimal
+    payment_date: date
+    period_start: date
+    period_end: date
+    property_id: int
+    property_address: str
+    property_city: str
+
+
+class TenantRow(NamedTuple):
+    """Tenant list row."""
+
+    id: int
+    property_id: int
+    name: str
+    email: Optional[str]
+    phone: Optional[str]
+    move_in_date: date
+    move_out_date: Optional[date]
+    property_address: str
+    property_city: str
+
+
+class PropertyRow(NamedTuple):
+    """Property search row."""
+
+    id: int
+    address: str
+    city: str
+    postal_code: str
+    monthly_rent: Decimal
+    is_active: bool
+
+
+class RowVersion(NamedTuple):
+    """Cheap change marker for a set of rows (see ``BaseRepository.get_version``)."""
+
+    count: int
+    max_id: Optional[int]
+    last_modified: Optional[datetime]
+
+
+class ChangeRow(NamedTuple):
+    """One change feed entry (see ``app.repositories.change_log``)."""
+
+    seq: int
+    entity_type: str
+    entity_id: int
+    operation: str
+    #: Column values after the change (changed columns for updates, None for deletes)
+    data: Optional[dict]
+    created_at: datetime
+
+
+class SearchHit(NamedTuple):
+    """One ranked search result: a row and its score (0-1)."""
+
+    row: Any
+    score: float
+
+
+class SearchPage(NamedTuple):
+    """One page of ranked search results."""
+
+    hits: list[SearchHit]
+    total: int
+    page: int
+    per_page: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.per_page))
@@ -0,0 +1,296 @@
+"""Word-prefix search index for tenants and properties.
+
+``ilike('%x%')`` cannot use a B-tree index, so every search scanned the
+whole table. Instead each searchable field is split into normalized words
+and every prefix of every word is stored in ``search_terms``, indexed by
+(entity type, term). A query word is then one index lookup, and a search
+for "jo smi" returns entities with a word starting "jo" *and* one starting
+"smi", ranked with complete-word matches first.
+
+Words are lowercased and stripped of accents, so "montreal" finds
+"Montréal". Substrings inside a word ("mit" in "Smith") are not matched.
+
+Terms are written in the same transaction as the Tenant / Property change by
+a session ``after_flush`` hook. Rows inserted behind the ORM's back (bulk
+loads, raw SQL) need ``SearchIndexRepository().rebuild()``
+(``project-search rebuild``).
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import case, delete, event, func, inspect, literal_column
+from sqlalchemy.orm import Session
+
+from app.database import bulk_insert
+from app.models.property import Property
+from app.models.search_term import SearchTerm
+from app.models.tenant import Tenant
+from app.repositories.base_repository import BaseRepository
+
+PROPERTY = "property"
+TENANT = "tenant"
+
+#: Shortest indexed / searchable word
+MIN_WORD_LENGTH = 2
+#: Longest stored prefix (search_terms.term is String(12))
+MAX_TERM_LENGTH = 12
+
+_WORD = re.compile(r"[^\W_]+")
+_DIGITS = re.compile(r"\D+")
+
+
+def _phone_words(value: str) -> list[str]:
+    """Digit groups plus the full digit string, so "555-1234" and "5551234" both match."""
+    groups = _WORD.findall(value)
+    joined = _DIGITS.sub("", value)
+    return groups + [joined] if joined and joined not in groups else groups
+
+
+#: entity type -> (model, {field: (column, word splitter)})
+INDEXED_FIELDS: dict[str, tuple[type, dict[str, tuple]]] = {
+    PROPERTY: (
+        Property,
+        {
+            "address": (Property.address, None),
+            "city": (Property.city, None),
+            "postal_code": (Property.postal_code, None),
+        },
+    ),
+    TENANT: (
+        Tenant,
+        {
+            "name": (Tenant.name, None),
+            "email": (Tenant.email, None),
+            "phone": (Tenant.phone, _phone_words),
+        },
+    ),
+}
+
+_ENTITY_TYPES = {model: entity_type for entity_type, (model, _) in INDEXED_FIELDS.items()}
+
+
+def normalize(value: str) -> str:
+    """Lowercase and strip accents ("Montréal" -> "montreal")."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def words(value: str | None, splitter: Callable[[str], list[str]] | None = None) -> list[str]:
+    """Normalized words of a field value."""
+    if not value:
+        return []
+    value = normalize(value)
+    return splitter(value) if splitter else _WORD.findall(value)
+
+
+def index_terms(word_list: Iterable[str]) -> set[str]:
+    """Prefixes of each word, plus ``word$`` marking the complete word.
+
+    "maple" -> {"ma", "map", "mapl", "maple", "maple$"}. Prefixes are capped
+    at MAX_TERM_LENGTH characters; longer words get no complete-word marker.
+    """
+    terms = set()
+    for word in word_list:
+        if len(word) < MIN_WORD_LENGTH:
+            continue
+        stop = min(len(word), MAX_TERM_LENGTH)
+        terms.update(word[:k] for k in range(MIN_WORD_LENGTH, stop + 1))
+        if len(word) < MAX_TERM_LENGTH:
+            terms.add(f"{word}$")
+    return terms
+
+
+def query_terms(word_list: Iterable[str]) -> tuple[set[str], set[str]]:
+    """(prefix terms, complete-word terms) to look up for the query words.
+
+    Every query word must match an indexed word by prefix; complete-word
+    matches rank higher. Words shorter than MIN_WORD_LENGTH are ignored.
+    """
+    prefixes, complete = set(), set()
+    for word in word_list:
+        if len(word) < MIN_WORD_LENGTH:
+            continue
+        prefixes.add(word[:MAX_TERM_LENGTH])
+        if len(word) < MAX_TERM_LENGTH:
+            complete.add(f"{word}$")
+    return prefixes, complete
+
+
+def entity_terms(entity_type: str, values: dict[str, str | None]) -> list[dict]:
+    """search_terms rows for one entity's field values (without entity_id)."""
+    _, fields = INDEXED_FIELDS[entity_type]
+    rows = []
+    for field, (_, splitter) in fields.items():
+        for term in sorted(index_terms(words(values.get(field), splitter))):
+            rows.append({"entity_type": entity_type, "field": field, "term": term})
+    return rows
+
+
+class SearchIndexRepository(BaseRepository[SearchTerm]):
+    """Maintains and queries the ``search_terms`` word-prefix index."""
+
+    #: Insert batch size for rebuild()
+    BATCH_SIZE = 2000
+
+    def __init__(self, session=None):
+        """Initialize with SearchTerm model."""
+        super().__init__(SearchTerm, session)
+
+    def _matching(self, entity_type: str, text: str, fields: Iterable[str] | None):
+        """Grouped (entity_id, score) query of entities matching every query word.
+
+        Returns None if the text has no word long enough to look up.
+        """
+        prefixes, complete = query_terms(words(text))
+        if not prefixes:
+            return None
+
+        matched_words = func.count(
+            func.distinct(case((SearchTerm.term.in_(prefixes), SearchTerm.term)))
+        )
+        query = self._session.query(
+            SearchTerm.entity_id, func.count(func.distinct(SearchTerm.term)).label("score")
+        ).filter(
+            SearchTerm.entity_type == entity_type,
+            SearchTerm.term.in_(prefixes | complete),
+        )
+        if fields:
+            query = query.filter(SearchTerm.field.in_(fields))
+        return query.group_by(SearchTerm.entity_id).having(matched_words == len(prefixes))
+
+    def match(
+        self,
+        entity_type: str,
+        text: str,
+        limit: int = 20,
+        offset: int = 0,
+        fields: Iterable[str] | None = None,
+    ) -> tuple[list[tuple[int, float]], int]:
+        """Entities whose indexed words start with every word of ``text``, best first.
+
+        Complete-word matches score higher than prefix matches; the score is
+        1.0 when every query word matched a whole word.
+
+        Args:
+            entity_type: ``"tenant"`` or ``"property"``
+            text: Search text
+            limit: Page size
+            offset: Rows to skip
+            fields: Optional subset of the entity's indexed fields
+
+        Returns:
+            ([(entity_id, score), ...], total number of matches)
+        """
+        query = self._matching(entity_type, text, fields)
+        if query is None:
+            return [], 0
+
+        prefixes, complete = query_terms(words(text))
+        best = len(prefixes) + len(complete)
+        total = self._session.query(func.count()).select_from(query.subquery()).scalar()
+        rows = (
+            query.order_by(literal_column("score").desc(), SearchTerm.entity_id)
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
+        return [(entity_id, min(score / best, 1.0)) for entity_id, score in rows], total
+
+    def matching(self, entity_type: str, text: str, fields: Iterable[str] | None = None):
+        """Subquery of (entity_id, score) for joining against the entity table.
+
+        Returns None if ``text`` has no word long enough to look up.
+        """
+        query = self._matching(entity_type, text, fields)
+        return None if query is None else query.subquery("matches")
+
+    def ids(
+        self, entity_type: str, text: str, fields: Iterable[str] | None = None
+    ) -> list[int] | None:
+        """Ids of all entities matching every word of ``text`` (unranked).
+
+        Returns None if ``text`` has no word long enough to look up; the
+        caller should then fall back to a scan.
+        """
+        query = self._matching(entity_type, text, fields)
+        if query is None:
+            return None
+        return [entity_id for entity_id, _ in query]
+
+    def rebuild(self, entity_types: Iterable[str] | None = None) -> dict[str, int]:
+        """Re-index every tenant and property from scratch.
+
+        Returns:
+            Number of entities indexed per entity type
+        """
+        counts = {}
+        connection = self._session.connection()
+        table = SearchTerm.__table__
+        for entity_type in entity_types or INDEXED_FIELDS:
+            model, fields = INDEXED_FIELDS[entity_type]
+            connection.execute(delete(table).where(table.c.entity_type == entity_type))
+
+            names = list(fields)
+            columns = [column for column, _ in fields.values()]
+            batch, count = [], 0
+            for row in self._session.query(model.id, *columns).yield_per(self.BATCH_SIZE):
+                for term in entity_terms(entity_type, dict(zip(names, row[1:]))):
+                    batch.append({**term, "entity_id": row[0]})
+                count += 1
+                if len(batch) >= self.BATCH_SIZE:
+                    bulk_insert(connection, table, batch)
+                    batch = []
+            bulk_insert(connection, table, batch)
+            counts[entity_type] = count
+        self._session.commit()
+        return counts
+
+
+def _changed(instance, fields: dict) -> bool:
+    state = inspect(instance)
+    return any(state.attrs[column.key].history.has_changes() for column, _ in fields.values())
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session: Session, flush_context) -> None:
+    """Rewrite the search terms of tenants / properties changed by this flush."""
+    stale: list[tuple[str, int]] = []
+    fresh: list[tuple[str, object]] = []
+
+    for instance in session.new:
+        entity_type = _ENTITY_TYPES.get(type(instance))
+        if entity_type:
+            fresh.append((entity_type, instance))
+    for instance in session.dirty:
+        entity_type = _ENTITY_TYPES.get(type(instance))
+        if entity_type and _changed(instance, INDEXED_FIELDS[entity_type][1]):
+            stale.append((entity_type, instance.id))
+            fresh.append((entity_type, instance))
+    for instance in session.deleted:
+        entity_type = _ENTITY_TYPES.get(type(instance))
+        if entity_type:
+            stale.append((entity_type, instance.id))
+
+    if not stale and not fresh:
+        return
+
+    connection = session.connection()
+    table = SearchTerm.__table__
+    for entity_type in {entity_type for entity_type, _ in stale}:
+        ids = [entity_id for t, entity_id in stale if t == entity_type]
+        connection.execute(
+            delete(table).where(table.c.entity_type == entity_type, table.c.entity_id.in_(ids))
+        )
+
+    rows = []
+    for entity_type, instance in fresh:
+        fields = INDEXED_FIELDS[entity_type][1]
+        values = {field: getattr(instance, column.key) for field, (column, _) in fields.items()}
+        rows.extend(
+            {**term, "entity_id": instance.id} for term in entity_terms(entity_type, values)
+        )
+    bulk_insert(connection, table, rows)
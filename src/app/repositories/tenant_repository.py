@@ -1,29 +1,45 @@
 """Tenant repository."""
 
+from collections.abc import Iterator
+from datetime import date
+
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+
+from app.models.property import Property
 from app.models.tenant import Tenant
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, LoadPlan
+from app.repositories.rows import SearchHit, SearchPage, TenantRow
+from app.repositories.search_index import TENANT, SearchIndexRepository
 
 
 class TenantRepository(BaseRepository[Tenant]):
     """Repository for Tenant operations."""
 
+    load_plans = {
+        # Rows or pages showing the tenant's property
+        "with_property": lambda: (joinedload(Tenant.property),),
+    }
+
     def __init__(self, session=None):
         """Initialize with Tenant model."""
         super().__init__(Tenant, session)
 
-    def get_by_property(self, property_id: int) -> list[Tenant]:
+    def get_by_property(self, property_id: int, load: LoadPlan = None) -> list[Tenant]:
         """Get all tenants for a property."""
         return (
-            self._session.query(Tenant)
+            self._query(load)
             .filter(Tenant.property_id == property_id)
             .order_by(Tenant.move_in_date.desc())
             .all()
         )
 
-    def get_active_by_property(self, property_id: int) -> list[Tenant]:
+    def get_active_by_property(
+        self, property_id: int, load: LoadPlan = None
+    ) -> list[Tenant]:
         """Get active tenants (not moved out) for a property."""
         return (
-            self._session.query(Tenant)
+            self._query(load)
             .filter(
                 Tenant.property_id == property_id,
                 Tenant.move_out_date.is_(None),
@@ -32,20 +48,120 @@ class TenantRepository(BaseRepository[Tenant]):
             .all()
         )
 
-    def get_current(self) -> list[Tenant]:
+    def get_current(self, load: LoadPlan = None) -> list[Tenant]:
         """Get all current tenants (not moved out)."""
         return (
-            self._session.query(Tenant)
+            self._query(load)
             .filter(Tenant.move_out_date.is_(None))
             .order_by(Tenant.name)
             .all()
         )
 
-    def search_by_name(self, name: str) -> list[Tenant]:
-        """Search tenants by name."""
+    def search_by_name(self, name: str, load: LoadPlan = None) -> list[Tenant]:
+        """Search tenants by name (case-insensitive substring)."""
         return (
-            self._session.query(Tenant)
+            self._query(load)
             .filter(Tenant.name.ilike(f"%{name}%"))
             .order_by(Tenant.name)
             .all()
         )
+
+    def search(self, text: str, page: int = 1, per_page: int = 20) -> SearchPage:
+        """Ranked search over tenant name, email and phone.
+
+        Args:
+            text: Search text; each word matches the start of an indexed word
+            page: 1-based page number
+            per_page: Results per page
+
+        Returns:
+            SearchPage of SearchHit(TenantRow, score), best match first
+        """
+        page = max(page, 1)
+        ranked, total = SearchIndexRepository(self._session).match(
+            TENANT, text, limit=per_page, offset=(page - 1) * per_page
+        )
+        rows = {}
+        if ranked:
+            query = self._rows_query().filter(Tenant.id.in_([id for id, _ in ranked]))
+            rows = {row[0]: TenantRow._make(row) for row in query}
+        hits = [SearchHit(rows[id], score) for id, score in ranked if id in rows]
+        return SearchPage(hits, total, page, per_page)
+
+    def _rows_query(self):
+        return self._session.query(
+            Tenant.id,
+            Tenant.property_id,
+            Tenant.name,
+            Tenant.email,
+            Tenant.phone,
+            Tenant.move_in_date,
+            Tenant.move_out_date,
+            Property.address,
+            Property.city,
+        ).join(Property, Property.id == Tenant.property_id)
+
+    def list_rows(self, property_id: int | None = None) -> list[TenantRow]:
+        """Tenants as read-only rows with their property address.
+
+        Args:
+            property_id: Optional property filter
+        """
+        query = self._rows_query()
+        if property_id:
+            query = query.filter(Tenant.property_id == property_id)
+        query = query.order_by(Tenant.move_in_date.desc(), Tenant.id.desc())
+        return [TenantRow._make(row) for row in query]
+
+    def iter_rows(
+        self,
+        property_id: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        chunk_size: int | None = None,
+    ) -> Iterator[TenantRow]:
+        """Stream tenant rows, optionally only tenancies overlapping a date range.
+
+        Args:
+            property_id: Optional property filter
+            start_date: Optional: skip tenants who moved out before this date
+            end_date: Optional: skip tenants who moved in after this date
+            chunk_size: Rows per fetch
+        """
+        query = self._rows_query()
+        if property_id:
+            query = query.filter(Tenant.property_id == property_id)
+        if start_date:
+            query = query.filter(
+                or_(Tenant.move_out_date.is_(None), Tenant.move_out_date >= start_date)
+            )
+        if end_date:
+            query = query.filter(Tenant.move_in_date <= end_date)
+        query = query.order_by(Tenant.move_in_date.desc(), Tenant.id.desc())
+        for row in self._stream(query, chunk_size):
+            yield TenantRow._make(row)
+
+    def search_prefix(self, term: str, limit: int = 10) -> list[tuple]:
+        """Typeahead lookup: tenant name or email words starting with ``term``.
+
+        Served from the search index; terms shorter than two characters
+        return nothing.
+
+        Returns:
+            List of (id, name, email, property address, property city) tuples
+        """
+        matches = SearchIndexRepository(self._session).matching(
+            TENANT, term, fields=("name", "email")
+        )
+        if matches is None:
+            return []
+        return (
+            self._session.query(
+                Tenant.id, Tenant.name, Tenant.email, Property.address, Property.city
+            )
+            .join(matches, matches.c.entity_id == Tenant.id)
+            .join(Property, Property.id == Tenant.property_id)
+            .order_by(matches.c.score.desc(), Tenant.name, Tenant.id)
+            .limit(limit)
+            .all()
+        )
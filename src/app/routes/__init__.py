@@ -1,10 +1,13 @@
 """Flask routes (blueprints)."""
 
 from app.routes.allocations import bp as allocations_bp
+from app.routes.api import bp as api_bp
 from app.routes.dashboard import bp as dashboard_bp
+from app.routes.exports import bp as exports_bp
 from app.routes.payments import bp as payments_bp
 from app.routes.properties import bp as properties_bp
 from app.routes.reports import bp as reports_bp
+from app.routes.search import bp as search_bp
 from app.routes.tenants import bp as tenants_bp
 
 __all__ = [
@@ -14,4 +17,7 @@ __all__ = [
     "payments_bp",
     "allocations_bp",
     "reports_bp",
+    "search_bp",
+    "exports_bp",
+    "api_bp",
 ]
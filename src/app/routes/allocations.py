@@ -1,18 +1,94 @@
-"""Allocation routes."""
-
-from flask import Blueprint, flash, redirect, render_template, url_for
-
+"""Allocation routes.
+
+Each action also answers ``Accept: application/json`` requests (sent by
+``static/js/main.js``) with the payment's new balance, its allocation rows as
+an HTML fragment, and the status badge and remaining amount of each charge it
+is allocated to, so the page updates in place instead of redirecting and
+re-rendering. The write is one transaction, followed by one query (the
+``panel`` load plan) for the response.
+"""
+
+from flask import (
+    Blueprint,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
+
+from app.domain.charge_states import get_behavior
 from app.forms.allocation_forms import AllocationForm, AutoAllocationForm
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.rent_charge_repository import RentChargeRepository
-from app.services.payment_service import PaymentService
+from app.services.payment_service import AllocationConflict, PaymentService
 
 bp = Blueprint("allocations", __name__)
 
 
+def _wants_json() -> bool:
+    """Whether the caller asked for a partial update rather than a page."""
+    best = request.accept_mimetypes.best_match(["text/html", "application/json"])
+    return best == "application/json"
+
+
+def _error(message: str, status: int = 400):
+    return jsonify(error=message), status
+
+
+def _partial(payment_id: int, message: str):
+    """JSON partial update for a payment after an allocation change."""
+    payment = PaymentRepository().get_with_allocations(payment_id, load="panel")
+    if not payment:
+        return _error("Payment not found.", 404)
+
+    allocated = sum(a.amount for a in payment.allocations)
+    balance = payment.amount - allocated
+    charges = {a.rent_charge.id: a.rent_charge for a in payment.allocations}
+    return jsonify(
+        message=message,
+        allocated=f"{allocated:.2f}",
+        balance=f"{balance:.2f}",
+        charges=[
+            {
+                "id": charge.id,
+                "status": charge.status.value,
+                "badge_class": get_behavior(charge.status).badge_bootstrap_class(),
+                "badge_label": get_behavior(charge.status).badge_label(),
+                "remaining": "%.2f" % (
+                    charge.amount_due - sum(a.amount for a in charge.payment_allocations)
+                ),
+            }
+            for charge in charges.values()
+        ],
+        html={
+            "allocations": render_template(
+                "payments/_allocations.html", payment=payment, balance=balance
+            )
+        },
+    )
+
+
 @bp.route("/<int:payment_id>/allocate", methods=["GET", "POST"])
 def allocate(payment_id: int):
-    """Allocate payment to rent charges."""
+    """Allocate payment to one or more rent charges."""
+    if request.method == "POST" and _wants_json():
+        # The submitted lines carry their charge IDs; allocate_many checks them
+        form = AllocationForm()
+        if not form.validate():
+            errors = form.form_errors + [
+                error for line in form.lines for error in line.amount.errors
+            ]
+            return _error(errors[0] if errors else "Invalid allocation.")
+        try:
+            allocations = PaymentService().allocate_many(payment_id, form.amounts())
+        except ValueError as e:
+            return _error(str(e))
+        if allocations is None:
+            return _error("Payment not found.", 404)
+        return _partial(payment_id, f"Payment allocated to {len(allocations)} charge(s)!")
+
     payment_repo = PaymentRepository()
     payment = payment_repo.get_with_allocations(payment_id)
 
@@ -22,13 +98,13 @@ def allocate(payment_id: int):
 
     # Get outstanding charges for this property (ordered oldest first)
     charge_repo = RentChargeRepository()
-    outstanding = charge_repo.get_outstanding_by_property(payment.property_id)
+    outstanding = charge_repo.get_outstanding_by_property(payment.property_id, load="list")
 
-    # Calculate remaining balance
+    # Remaining balance from the allocations already loaded
     service = PaymentService()
-    balance = service.get_payment_balance(payment_id)
+    balance = payment.amount - sum(a.amount for a in payment.allocations)
 
-    form = AllocationForm(property_id=payment.property_id)
+    form = AllocationForm(outstanding)
     auto_form = AutoAllocationForm()
 
     # Validate that there are charges to allocate to
@@ -45,12 +121,11 @@ def allocate(payment_id: int):
 
     if form.validate_on_submit():
         try:
-            service.allocate_payment(
-                payment_id=payment_id,
-                rent_charge_id=form.rent_charge_id.data,
-                amount=float(form.amount.data),
-            )
-            flash("Payment allocated successfully!", "success")
+            allocations = service.allocate_many(payment_id, form.amounts())
+            if allocations is None:
+                flash("Payment not found.", "danger")
+                return redirect(url_for("payments.list_payments"))
+            flash(f"Payment allocated to {len(allocations)} charge(s)!", "success")
             return redirect(url_for("payments.detail", payment_id=payment_id))
         except ValueError as e:
             flash(str(e), "danger")
@@ -68,23 +143,28 @@ def allocate(payment_id: int):
 @bp.route("/<int:payment_id>/auto-allocate", methods=["POST"])
 def auto_allocate(payment_id: int):
     """Auto-allocate payment to outstanding charges (oldest first by due date)."""
-    payment_repo = PaymentRepository()
-    payment = payment_repo.get_with_allocations(payment_id)
-
-    if not payment:
-        flash("Payment not found.", "danger")
-        return redirect(url_for("payments.list_payments"))
-
     service = PaymentService()
-    allocations = service.auto_allocate_payment(payment_id)
+    try:
+        allocations = service.auto_allocate_payment(payment_id)
+    except ValueError as e:
+        # AllocationConflict: other requests kept changing these charges
+        if _wants_json():
+            return _error(str(e), 409)
+        flash(str(e), "danger")
+        return redirect(url_for("payments.detail", payment_id=payment_id))
 
     if allocations:
-        flash(
-            f"Payment auto-allocated to {len(allocations)} charge(s).", "success"
-        )
+        message, category = f"Payment auto-allocated to {len(allocations)} charge(s).", "success"
     else:
-        flash("No outstanding charges to allocate to.", "warning")
+        message, category = "No outstanding charges to allocate to.", "warning"
+
+    if _wants_json():
+        return _partial(payment_id, message)
 
+    if not allocations and not PaymentRepository().get_by_id(payment_id):
+        flash("Payment not found.", "danger")
+        return redirect(url_for("payments.list_payments"))
+    flash(message, category)
     return redirect(url_for("payments.detail", payment_id=payment_id))
 
 
@@ -92,21 +172,22 @@ def auto_allocate(payment_id: int):
 def delete_allocation(allocation_id: int):
     """Delete a payment allocation."""
     service = PaymentService()
-    success = service.delete_allocation(allocation_id)
-
-    if success:
-        flash("Allocation removed successfully!", "success")
-    else:
+    try:
+        allocation = service.delete_allocation(allocation_id)
+    except AllocationConflict as e:
+        if _wants_json():
+            return _error(str(e), 409)
+        flash(str(e), "danger")
+        return redirect(request.referrer or url_for("payments.list_payments"))
+
+    if not allocation:
+        if _wants_json():
+            return _error("Allocation not found.", 404)
         flash("Allocation not found.", "danger")
+        return redirect(url_for("payments.list_payments"))
 
-    # Redirect back to payment detail (need to find payment_id from allocation)
-    from app.database import db_session
-    from app.models.payment_allocation import PaymentAllocation
-
-    allocation = db_session.get(PaymentAllocation, allocation_id)
-    if allocation:
-        return redirect(
-            url_for("payments.detail", payment_id=allocation.payment_id)
-        )
+    if _wants_json():
+        return _partial(allocation.payment_id, "Allocation removed successfully!")
 
-    return redirect(url_for("payments.list_payments"))
+    flash("Allocation removed successfully!", "success")
+    return redirect(url_for("payments.detail", payment_id=allocation.payment_id))
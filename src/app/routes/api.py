@@ -0,0 +1,213 @@
+"""Versioned JSON API (``/api/v1``).
+
+``GET /api/v1/`` lists the resources, their fields and filters, and the
+reports. ``GET /api/v1/<resource>`` pages through a ledger table:
+
+* ``limit`` (default ``API_PAGE_SIZE``, at most ``API_MAX_PAGE_SIZE``) and
+  ``after``, the cursor from the previous page's ``next`` link;
+* ``fields=id,amount,...`` to select only those columns;
+* ``start_date`` / ``end_date`` on the resource's date column, and equality
+  filters on its indexed columns, e.g. ``property_id=3&status=paid``.
+
+``GET /api/v1/<resource>/<id>`` returns one row and ``GET
+/api/v1/reports/<name>`` a report (``start_date``, ``end_date``,
+``property_id``, ``tenant_id``). Amounts are strings, dates ISO 8601.
+
+``GET /api/v1/changes?since=<seq>`` is the change feed: NDJSON, one ledger
+insert, update or delete per line, at most ``limit`` of them, optionally
+only for ``tables=payments,...``. ``X-Next-Since`` carries the sequence
+number to ask for next; an empty body means the consumer is up to date.
+Entries from the last ``CHANGE_FEED_SETTLE_SECONDS`` are served on a later
+call, once concurrent writes with lower sequence numbers have committed.
+
+``POST /api/v1/payments/<id>/allocations`` with ``{"allocations":
+[{"rent_charge_id": 1, "amount": "250.00"}, ...]}`` allocates a payment to
+several charges in one transaction (``PaymentService.allocate_many``).
+Responses of ``API_GZIP_MIN_BYTES`` or more are gzipped for clients that
+accept it.
+"""
+
+import gzip
+import json
+from datetime import date
+
+from flask import Blueprint, current_app, request, url_for
+
+from app.services.api_service import ApiService
+from app.services.payment_service import PaymentService
+from app.services.export_service import ExportFilters, json_default
+
+bp = Blueprint("api", __name__)
+
+#: Query parameters that are not column filters
+_RESERVED = {"fields", "limit", "after", "start_date", "end_date"}
+
+
+class ApiError(Exception):
+    """Rendered as a JSON error body with ``status``."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+@bp.errorhandler(ApiError)
+def _api_error(error: ApiError):
+    return _json({"error": str(error)}, error.status)
+
+
+def _json(payload, status: int = 200):
+    body = json.dumps(payload, default=json_default, separators=(",", ":")).encode()
+    return _respond(body, "application/json", status)
+
+
+def _respond(body: bytes, mimetype: str, status: int = 200):
+    response = current_app.response_class(body, status=status, mimetype=mimetype)
+    response.vary.add("Accept-Encoding")
+    if (
+        len(body) >= current_app.config["API_GZIP_MIN_BYTES"]
+        and "gzip" in request.accept_encodings
+    ):
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def _date_arg(name: str) -> date | None:
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(f"{name} must be a YYYY-MM-DD date") from None
+
+
+def _list_arg(name: str) -> list[str] | None:
+    value = request.args.get(name)
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+
+def _limit_arg() -> int:
+    config = current_app.config
+    limit = request.args.get("limit", config["API_PAGE_SIZE"], type=int)
+    if not 1 <= limit <= config["API_MAX_PAGE_SIZE"]:
+        raise ApiError(f"limit must be between 1 and {config['API_MAX_PAGE_SIZE']}")
+    return limit
+
+
+@bp.route("/")
+def index():
+    """Resources, fields, filters and reports."""
+    return _json(ApiService.describe())
+
+
+@bp.route("/changes")
+def changes():
+    """Change feed: ledger mutations after ``since`` as NDJSON."""
+    since = request.args.get("since", 0, type=int)
+    try:
+        entries, next_since = ApiService().changes(
+            since,
+            _limit_arg(),
+            _list_arg("tables"),
+            current_app.config["CHANGE_FEED_SETTLE_SECONDS"],
+        )
+    except ValueError as e:
+        raise ApiError(str(e)) from None
+
+    body = "".join(
+        json.dumps(entry, default=json_default, separators=(",", ":")) + "\n"
+        for entry in entries
+    )
+    response = _respond(body.encode(), "application/x-ndjson")
+    response.headers["X-Next-Since"] = str(next_since)
+    return response
+
+
+@bp.route("/<resource>")
+def list_resource(resource: str):
+    """One page of a ledger table."""
+    limit = _limit_arg()
+    filters = {name: value for name, value in request.args.items() if name not in _RESERVED}
+
+    try:
+        rows, cursor = ApiService().page(
+            resource,
+            fields=_list_arg("fields"),
+            filters=filters,
+            start_date=_date_arg("start_date"),
+            end_date=_date_arg("end_date"),
+            after=request.args.get("after", type=int),
+            limit=limit,
+        )
+    except KeyError:
+        raise ApiError(f"Unknown resource {resource!r}", 404) from None
+    except ValueError as e:
+        raise ApiError(str(e)) from None
+
+    next_url = None
+    if cursor is not None:
+        args = {**request.args.to_dict(), "after": cursor}
+        next_url = url_for("api.list_resource", resource=resource, **args)
+    return _json({"data": rows, "next": next_url})
+
+
+@bp.route("/<resource>/<int:id>")
+def get_resource(resource: str, id: int):
+    """One ledger row by id."""
+    try:
+        row = ApiService().get(resource, id, fields=_list_arg("fields"))
+    except KeyError:
+        raise ApiError(f"Unknown resource {resource!r}", 404) from None
+    except ValueError as e:
+        raise ApiError(str(e)) from None
+
+    if row is None:
+        raise ApiError(f"{resource} {id} not found", 404)
+    return _json({"data": row})
+
+
+@bp.route("/payments/<int:payment_id>/allocations", methods=["POST"])
+def allocate(payment_id: int):
+    """Allocate a payment to several rent charges at once."""
+    body = request.get_json(silent=True)
+    lines = body.get("allocations") if isinstance(body, dict) else None
+    if not isinstance(lines, list):
+        raise ApiError('Expected a JSON object with an "allocations" list')
+    try:
+        amounts = [(int(line["rent_charge_id"]), str(line["amount"])) for line in lines]
+    except (KeyError, TypeError, ValueError):
+        raise ApiError('Each allocation needs "rent_charge_id" and "amount"') from None
+
+    service = PaymentService()
+    try:
+        allocations = service.allocate_many(payment_id, amounts)
+    except ValueError as e:
+        raise ApiError(str(e)) from None
+    if allocations is None:
+        raise ApiError(f"payments {payment_id} not found", 404)
+
+    data = [
+        {"id": a.id, "rent_charge_id": a.rent_charge_id, "amount": a.amount}
+        for a in allocations
+    ]
+    return _json({"data": data, "balance": service.get_payment_balance(payment_id)}, 201)
+
+
+@bp.route("/reports/<name>")
+def report(name: str):
+    """A report, one object per row."""
+    filters = ExportFilters(
+        start_date=_date_arg("start_date"),
+        end_date=_date_arg("end_date"),
+        property_id=request.args.get("property_id", type=int),
+        tenant_id=request.args.get("tenant_id", type=int),
+    )
+    try:
+        rows = ApiService().report(name, filters)
+    except KeyError:
+        raise ApiError(f"Unknown report {name!r}", 404) from None
+    except ValueError as e:
+        raise ApiError(str(e)) from None
+    return _json({"data": rows})
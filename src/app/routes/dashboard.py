@@ -9,11 +9,12 @@ bp = Blueprint("dashboard", __name__)
 
 @bp.route("/")
 def index():
-    """Dashboard home page."""
-    service = ReportService()
-    summary = service.get_dashboard_summary()
+    """Dashboard home page.
 
+    Each panel is a cached fragment that asks ``reports`` for its data only
+    when it has to be rendered.
+    """
     return render_template(
         "dashboard.html",
-        summary=summary,
+        reports=ReportService(),
     )
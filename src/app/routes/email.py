@@ -1,20 +1,24 @@
-"""Email routes for sending notifications."""
+"""Email routes for sending notifications.
+
+The views are async: the Gmail API calls are awaited through
+``AsyncEmailService`` instead of blocking on ``requests``.
+"""
 
 from flask import Blueprint, jsonify, request
 
-from app.services.email_service import EmailService
+from app.services.email_service import AsyncEmailService
 
 bp = Blueprint("email", __name__, url_prefix="/email")
 
 
 @bp.route("/send-reminder", methods=["POST"])
-def send_reminder():
+async def send_reminder():
     """Send a payment reminder email."""
     data = request.get_json()
 
     try:
-        email_service = EmailService()
-        result = email_service.send_payment_reminder(
+        email_service = AsyncEmailService()
+        result = await email_service.send_payment_reminder(
             tenant_email=data["tenant_email"],
             tenant_name=data["tenant_name"],
             property_address=data["property_address"],
@@ -27,13 +31,13 @@ def send_reminder():
 
 
 @bp.route("/send-arrears", methods=["POST"])
-def send_arrears():
+async def send_arrears():
     """Send an arrears notice email."""
     data = request.get_json()
 
     try:
-        email_service = EmailService()
-        result = email_service.send_arrears_notice(
+        email_service = AsyncEmailService()
+        result = await email_service.send_arrears_notice(
             tenant_email=data["tenant_email"],
             tenant_name=data["tenant_name"],
             property_address=data["property_address"],
@@ -46,13 +50,13 @@ def send_arrears():
 
 
 @bp.route("/send-receipt", methods=["POST"])
-def send_receipt():
+async def send_receipt():
     """Send a rent payment receipt email."""
     data = request.get_json()
 
     try:
-        email_service = EmailService()
-        result = email_service.send_rent_receipt(
+        email_service = AsyncEmailService()
+        result = await email_service.send_rent_receipt(
             tenant_email=data["tenant_email"],
             tenant_name=data["tenant_name"],
             property_address=data["property_address"],
@@ -65,12 +69,12 @@ def send_receipt():
 
 
 @bp.route("/test", methods=["GET"])
-def test_email():
+async def test_email():
     """Test email configuration."""
     try:
-        email_service = EmailService()
+        email_service = AsyncEmailService()
         # Just try to get an access token to verify credentials
-        token = email_service._get_access_token()
+        token = await email_service._get_access_token()
         return jsonify({"success": True, "message": "Email service configured correctly"})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 400
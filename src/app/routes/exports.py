@@ -0,0 +1,51 @@
+"""Export routes.
+
+``GET /exports/<dataset>.<csv|ndjson>`` streams a ledger table or report
+(see ``app.services.export_service.DATASETS``). Query parameters:
+``start_date`` / ``end_date`` (YYYY-MM-DD), ``property_id``, ``tenant_id``
+and ``gzip=1`` for a gzip-encoded body.
+"""
+
+from datetime import date
+
+from flask import Blueprint, Response, abort, request, stream_with_context
+
+from app.services.export_service import DATASETS, FORMATS, ExportFilters, ExportService
+
+bp = Blueprint("exports", __name__)
+
+
+def _date_arg(name: str) -> date | None:
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400, f"{name} must be a YYYY-MM-DD date")
+
+
+@bp.route("/<dataset>.<format>")
+def export(dataset: str, format: str):
+    """Stream a dataset as CSV or NDJSON."""
+    if dataset not in DATASETS or format not in FORMATS:
+        abort(404)
+
+    filters = ExportFilters(
+        start_date=_date_arg("start_date"),
+        end_date=_date_arg("end_date"),
+        property_id=request.args.get("property_id", type=int),
+        tenant_id=request.args.get("tenant_id", type=int),
+    )
+    compress = request.args.get("gzip", type=int) == 1
+    try:
+        chunks = ExportService().stream(dataset, format, filters, compress=compress)
+    except ValueError as e:
+        abort(400, str(e))
+
+    filename = f"{dataset}-{date.today().isoformat()}.{format}"
+    response = Response(stream_with_context(chunks), mimetype=FORMATS[format])
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
@@ -2,36 +2,60 @@
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 
+from app.conditional import Validator, conditional
 from app.factories.payment_factory import PaymentFactory
 from app.forms.payment_forms import PaymentFilterForm, PaymentForm
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.property_repository import PropertyRepository
+from app.repositories.rent_charge_repository import RentChargeRepository
 from app.services.payment_service import PaymentService
+from app.streaming import RowStream, stream_page
 
 bp = Blueprint("payments", __name__)
 
 
+def _list_version() -> Validator:
+    repo = PaymentRepository()
+    property_id = request.args.get("property_id", type=int)
+    filters = {"property_id": property_id} if property_id else {}
+    return Validator(
+        (
+            repo.get_version(**filters),
+            repo.get_allocation_version(property_id=property_id),
+            PropertyRepository().get_version(),
+        )
+    )
+
+
+def _detail_version(payment_id: int) -> Validator | None:
+    repo = PaymentRepository()
+    payment = repo.get_by_id(payment_id)
+    if not payment:
+        return None
+    return Validator(
+        (
+            repo.get_version(id=payment_id),
+            repo.get_allocation_version(payment_id=payment_id),
+            # Status badges of the allocated charges, which other payments also change
+            RentChargeRepository().get_allocated_version(payment_id),
+            PropertyRepository().get_version(id=payment.property_id),
+        )
+    )
+
+
 @bp.route("/")
+@conditional(_list_version)
 def list_payments():
     """List all payments."""
     repo = PaymentRepository()
     filter_form = PaymentFilterForm(request.args)
 
     property_id = request.args.get("property_id", type=int)
+    payments = RowStream(repo.iter_rows(property_id=property_id))
 
-    if property_id:
-        payments = repo.get_by_property(property_id)
-    else:
-        payments = repo.get_all()
-
-    # Get property names for display
-    prop_repo = PropertyRepository()
-    properties = {p.id: p for p in prop_repo.get_all()}
-
-    return render_template(
+    return stream_page(
         "payments/list.html",
         payments=payments,
-        properties=properties,
         filter_form=filter_form,
     )
 
@@ -67,10 +91,11 @@ def create():
 
 
 @bp.route("/<int:payment_id>")
+@conditional(_detail_version)
 def detail(payment_id: int):
     """Payment detail page."""
     repo = PaymentRepository()
-    payment = repo.get_with_allocations(payment_id)
+    payment = repo.get_with_allocations(payment_id, load="detail")
 
     if not payment:
         flash("Payment not found.", "danger")
@@ -2,15 +2,27 @@
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 
+from app.conditional import Validator, conditional
 from app.factories.property_factory import PropertyFactory
 from app.forms.property_forms import PropertyEditForm, PropertyForm
 from app.repositories.property_repository import PropertyRepository
+from app.repositories.tenant_repository import TenantRepository
 from app.services.report_service import ReportService
 
 bp = Blueprint("properties", __name__)
 
 
+def _list_version() -> Validator:
+    return Validator((PropertyRepository().get_version(), TenantRepository().get_version()))
+
+
+def _detail_version(property_id: int) -> Validator | None:
+    versions = ReportService().get_property_report_versions(property_id)
+    return Validator(versions) if versions else None
+
+
 @bp.route("/")
+@conditional(_list_version)
 def list_properties():
     """List all properties."""
     repo = PropertyRepository()
@@ -48,6 +60,7 @@ def create():
 
 
 @bp.route("/<int:property_id>")
+@conditional(_detail_version)
 def detail(property_id: int):
     """Property detail page."""
     report_service = ReportService()
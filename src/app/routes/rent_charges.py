@@ -2,19 +2,51 @@
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 
+from app.conditional import Validator, conditional
 from app.config import is_email_configured
 from app.forms.rent_charge_forms import RentChargeFilterForm, RentChargeForm
 from app.models.rent_charge import ChargeStatus
+from app.repositories.payment_repository import PaymentRepository
 from app.repositories.property_repository import PropertyRepository
 from app.repositories.rent_charge_repository import RentChargeRepository
 from app.repositories.tenant_repository import TenantRepository
 from app.services.email_service import EmailService
 from app.services.payment_service import PaymentService
+from app.streaming import RowStream, stream_page
 
 bp = Blueprint("rent_charges", __name__)
 
 
+def _list_version() -> Validator:
+    property_id = request.args.get("property_id", type=int)
+    status = request.args.get("status")
+    filters = {"property_id": property_id} if property_id else {}
+    if status:
+        filters["status"] = ChargeStatus(status)
+    return Validator(
+        (
+            RentChargeRepository().get_version(**filters),
+            PaymentRepository().get_allocation_version(property_id=property_id),
+            PropertyRepository().get_version(),
+        )
+    )
+
+
+def _detail_version(charge_id: int) -> Validator | None:
+    charge = RentChargeRepository().get_by_id(charge_id)
+    if not charge:
+        return None
+    return Validator(
+        (
+            RentChargeRepository().get_version(id=charge_id),
+            PaymentRepository().get_allocation_version(rent_charge_id=charge_id),
+            PropertyRepository().get_version(id=charge.property_id),
+        )
+    )
+
+
 @bp.route("/")
+@conditional(_list_version)
 def list_charges():
     """List all rent charges."""
     repo = RentChargeRepository()
@@ -23,21 +55,16 @@ def list_charges():
     property_id = request.args.get("property_id", type=int)
     status = request.args.get("status")
 
-    if property_id:
-        charges = repo.get_by_property(property_id)
-    elif status:
-        charges = repo.get_by_status(ChargeStatus(status))
-    else:
-        charges = repo.get_all()
-
-    # Get property names for display
-    prop_repo = PropertyRepository()
-    properties = {p.id: p for p in prop_repo.get_all()}
+    charges = RowStream(
+        repo.iter_rows(
+            property_id=property_id,
+            status=ChargeStatus(status) if status else None,
+        )
+    )
 
-    return render_template(
+    return stream_page(
         "rent_charges/list.html",
         charges=charges,
-        properties=properties,
         filter_form=filter_form,
     )
 
@@ -45,13 +72,8 @@ def list_charges():
 @bp.route("/new", methods=["GET", "POST"])
 def create():
     """Create new rent charge (for backfilling historical data)."""
-    form = RentChargeForm()
-
     # Pre-populate property_id from query param if provided
-    if request.method == "GET":
-        property_id = request.args.get("property_id", type=int)
-        if property_id:
-            form.property_id.data = property_id
+    form = RentChargeForm(property_id=request.args.get("property_id", type=int))
 
     if form.validate_on_submit():
         # Validate property selection
@@ -134,10 +156,11 @@ def create():
 
 
 @bp.route("/<int:charge_id>")
+@conditional(_detail_version)
 def detail(charge_id: int):
     """Rent charge detail page."""
     repo = RentChargeRepository()
-    charge = repo.get_with_allocations(charge_id)
+    charge = repo.get_with_allocations(charge_id, load="detail")
 
     if not charge:
         flash("Rent charge not found.", "danger")
@@ -1,16 +1,41 @@
-"""Report routes."""
+"""Report routes.
+
+Report pages are async views: reports run on ``AsyncReportService`` (read
+replica unless this client just wrote) and independent reports are awaited
+concurrently. The arrears and property pages stream their HTML as it renders
+(``app.streaming``) and answer conditional GETs from row versions
+(``app.conditional``).
+"""
+
+import asyncio
 
 from flask import Blueprint, flash, redirect, render_template, url_for
 
+from app.conditional import Validator, conditional
 from app.config import is_email_configured
+from app.database import is_pinned_to_primary
 from app.forms.report_forms import DateRangeForm, PropertyReportForm
 from app.repositories.tenant_repository import TenantRepository
-from app.services.email_service import EmailService
-from app.services.report_service import ReportService
+from app.services.email_service import AsyncEmailService
+from app.services.report_service import AsyncReportService, ReportService
+from app.streaming import stream_page
 
 bp = Blueprint("reports", __name__)
 
 
+def _report_service() -> AsyncReportService:
+    return AsyncReportService(replica=not is_pinned_to_primary())
+
+
+def _arrears_version() -> Validator:
+    return Validator(ReportService().get_arrears_report_versions())
+
+
+def _property_report_version(property_id: int) -> Validator | None:
+    versions = ReportService().get_property_report_versions(property_id)
+    return Validator(versions) if versions else None
+
+
 @bp.route("/")
 def index():
     """Reports dashboard."""
@@ -20,12 +45,12 @@ def index():
 
 
 @bp.route("/arrears")
-def arrears():
+@conditional(_arrears_version, daily=True)
+async def arrears():
     """Arrears report."""
-    service = ReportService()
-    arrears_data = service.get_arrears_report()
+    arrears_data = await _report_service().get_arrears_report()
 
-    return render_template(
+    return stream_page(
         "reports/arrears.html",
         arrears=arrears_data,
         email_configured=is_email_configured(),
@@ -33,7 +58,7 @@ def arrears():
 
 
 @bp.route("/arrears/send-notice/<int:tenant_id>", methods=["POST"])
-def send_arrears_notice(tenant_id: int):
+async def send_arrears_notice(tenant_id: int):
     """Send arrears notice email to a tenant from the arrears report."""
     if not is_email_configured():
         flash("Email is not configured. Set Google Gmail API variables in .env.", "warning")
@@ -45,8 +70,7 @@ def send_arrears_notice(tenant_id: int):
         flash("Tenant not found or has no email address.", "danger")
         return redirect(url_for("reports.arrears"))
 
-    service = ReportService()
-    arrears_data = service.get_arrears_report()
+    arrears_data = await AsyncReportService(replica=False).get_arrears_report()
     row = next((x for x in arrears_data if x["tenant"].id == tenant_id), None)
     if not row:
         flash("No arrears on record for this tenant.", "warning")
@@ -56,7 +80,7 @@ def send_arrears_notice(tenant_id: int):
     address = f"{prop.address}, {prop.city}"
 
     try:
-        EmailService().send_arrears_notice(
+        await AsyncEmailService().send_arrears_notice(
             tenant_email=tenant.email,
             tenant_name=tenant.name,
             property_address=address,
@@ -71,19 +95,19 @@ def send_arrears_notice(tenant_id: int):
 
 
 @bp.route("/property/<int:property_id>")
-def property_report(property_id: int):
+@conditional(_property_report_version, daily=True)
+async def property_report(property_id: int):
     """Property payment history report."""
-    service = ReportService()
-    report = service.get_property_report(property_id)
+    service = _report_service()
+    report, timeline = await asyncio.gather(
+        service.get_property_report(property_id), service.get_payment_timeline(property_id)
+    )
 
     if not report:
         flash("Property not found.", "danger")
         return redirect(url_for("reports.index"))
 
-    # Get timeline data
-    timeline = service.get_payment_timeline(property_id)
-
-    return render_template(
+    return stream_page(
         "reports/property_history.html",
         report=report,
         timeline=timeline,
@@ -107,23 +131,19 @@ def select_property():
 
 
 @bp.route("/financial", methods=["GET", "POST"])
-def financial():
+async def financial():
     """Financial summary report."""
-    from datetime import date
-
     form = DateRangeForm()
-    report = None
+    service = _report_service()
 
     if form.validate_on_submit():
-        service = ReportService()
-        report = service.get_financial_summary(
+        report = await service.get_financial_summary(
             start_date=form.start_date.data,
             end_date=form.end_date.data,
         )
     else:
         # Default to current year
-        service = ReportService()
-        report = service.get_financial_summary()
+        report = await service.get_financial_summary()
 
     return render_template(
         "reports/financial.html",
@@ -0,0 +1,54 @@
+"""Typeahead and full-text search routes (JSON)."""
+
+from flask import Blueprint, jsonify, request
+
+from app.services.search_service import SearchService
+
+bp = Blueprint("search", __name__)
+
+_CACHE_CONTROL = "private, max-age=30"
+
+
+@bp.route("/")
+def search():
+    """Ranked search: ``type`` is tenants or properties, paginated with ``page``."""
+    kind = request.args.get("type", "tenants")
+    text = request.args.get("q", "")
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", 20, type=int)
+
+    try:
+        payload = SearchService().search(kind, text, page, per_page)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = jsonify(payload)
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+    return response
+
+
+@bp.route("/properties")
+def properties():
+    """Properties matching ``q`` by address, city or postal code word prefix."""
+    term = request.args.get("q", "")
+    limit = request.args.get("limit", 10, type=int)
+    active_only = request.args.get("active", 0, type=int) == 1
+
+    results = SearchService().search_properties(term, limit, active_only)
+
+    response = jsonify({"query": term, "results": results})
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+    return response
+
+
+@bp.route("/tenants")
+def tenants():
+    """Tenants matching ``q`` by name or email word prefix."""
+    term = request.args.get("q", "")
+    limit = request.args.get("limit", 10, type=int)
+
+    results = SearchService().search_tenants(term, limit)
+
+    response = jsonify({"query": term, "results": results})
+    response.headers["Cache-Control"] = _CACHE_CONTROL
+    return response
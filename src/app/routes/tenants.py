@@ -2,34 +2,51 @@
 
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 
+from app.conditional import Validator, conditional
 from app.forms.tenant_forms import TenantEditForm, TenantFilterForm, TenantForm
 from app.repositories.property_repository import PropertyRepository
+from app.repositories.rent_charge_repository import RentChargeRepository
 from app.repositories.tenant_repository import TenantRepository
+from app.streaming import RowStream, stream_page
 
 bp = Blueprint("tenants", __name__)
 
 
+def _list_version() -> Validator:
+    property_id = request.args.get("property_id", type=int)
+    filters = {"property_id": property_id} if property_id else {}
+    return Validator(
+        (TenantRepository().get_version(**filters), PropertyRepository().get_version())
+    )
+
+
+def _detail_version(tenant_id: int) -> Validator | None:
+    tenant = TenantRepository().get_by_id(tenant_id)
+    if not tenant:
+        return None
+    return Validator(
+        (
+            TenantRepository().get_version(id=tenant_id),
+            PropertyRepository().get_version(id=tenant.property_id),
+            RentChargeRepository().get_version(property_id=tenant.property_id),
+        ),
+        extra=(tenant.property_id,),
+    )
+
+
 @bp.route("/")
+@conditional(_list_version)
 def list_tenants():
     """List all tenants."""
     repo = TenantRepository()
     filter_form = TenantFilterForm(request.args)
 
     property_id = request.args.get("property_id", type=int)
+    tenants = RowStream(repo.iter_rows(property_id=property_id))
 
-    if property_id:
-        tenants = repo.get_by_property(property_id)
-    else:
-        tenants = repo.get_all()
-
-    # Get property names for display
-    prop_repo = PropertyRepository()
-    properties = {p.id: p for p in prop_repo.get_all()}
-
-    return render_template(
+    return stream_page(
         "tenants/list.html",
         tenants=tenants,
-        properties=properties,
         filter_form=filter_form,
     )
 
@@ -60,6 +77,7 @@ def create():
 
 
 @bp.route("/<int:tenant_id>")
+@conditional(_detail_version)
 def detail(tenant_id: int):
     """Tenant detail page."""
     repo = TenantRepository()
@@ -70,8 +88,6 @@ def detail(tenant_id: int):
         return redirect(url_for("tenants.list_tenants"))
 
     # Get tenant's charges
-    from app.repositories.rent_charge_repository import RentChargeRepository
-
     charge_repo = RentChargeRepository()
     charges = charge_repo.get_by_property(tenant.property_id)
 
@@ -0,0 +1,162 @@
+"""Search index maintenance and benchmark (``project-search``).
+
+``project-search rebuild`` re-indexes every tenant and property, e.g. after a
+bulk import that bypassed the ORM.
+
+``project-search benchmark`` times the word-prefix index search against the old
+``ilike('%x%')`` scan for a few queries on the configured database.
+``--synthetic N`` runs it on the testing database (in-memory SQLite unless
+``TEST_DATABASE_URL`` is set) filled by ``app.seed`` with N properties and a
+year of history.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from sqlalchemy import or_
+
+from app import create_app
+from app.database import db_session, init_db
+from app.models.property import Property
+from app.models.tenant import Tenant
+from app.repositories.property_repository import PropertyRepository
+from app.repositories.search_index import SearchIndexRepository
+from app.repositories.tenant_repository import TenantRepository
+from app.seed import SeedOptions, seed_portfolio
+
+DEFAULT_QUERIES = [
+    "smith", "jo smi", "maple street", "toronto", "montreal", "555 01", "example.com",
+]
+
+
+def _ilike_tenants(text: str, per_page: int) -> tuple[list, int]:
+    pattern = f"%{text}%"
+    query = db_session.query(Tenant.id).filter(
+        or_(Tenant.name.ilike(pattern), Tenant.email.ilike(pattern), Tenant.phone.ilike(pattern))
+    )
+    return query.order_by(Tenant.name).limit(per_page).all(), query.count()
+
+
+def _ilike_properties(text: str, per_page: int) -> tuple[list, int]:
+    pattern = f"%{text}%"
+    query = db_session.query(Property.id).filter(
+        or_(
+            Property.address.ilike(pattern),
+            Property.city.ilike(pattern),
+            Property.postal_code.ilike(pattern),
+        )
+    )
+    return query.order_by(Property.address).limit(per_page).all(), query.count()
+
+
+def _time(func, repeat: int) -> tuple[list[float], int]:
+    timings, total = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, total
+
+
+def benchmark(queries: list[str], repeat: int = 20, per_page: int = 20) -> list[dict]:
+    """Time index vs. ilike search for each query (first page, with total count).
+
+    Returns:
+        One dict per (query, entity, method) with median / p95 ms and match count
+    """
+    tenants, properties = TenantRepository(), PropertyRepository()
+    methods = {
+        "tenants": {
+            "index": lambda q: tenants.search(q, 1, per_page).total,
+            "ilike": lambda q: _ilike_tenants(q, per_page)[1],
+        },
+        "properties": {
+            "index": lambda q: properties.search(q, 1, per_page).total,
+            "ilike": lambda q: _ilike_properties(q, per_page)[1],
+        },
+    }
+
+    results = []
+    for text in queries:
+        for entity, funcs in methods.items():
+            for method, func in funcs.items():
+                timings, total = _time(lambda: func(text), repeat)
+                timings.sort()
+                results.append(
+                    {
+                        "query": text,
+                        "entity": entity,
+                        "method": method,
+                        "median_ms": round(statistics.median(timings), 3),
+                        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 3),
+                        "matches": total,
+                    }
+                )
+    return results
+
+
+def _print_results(results: list[dict]) -> None:
+    print(
+        f"{'query':<16} {'entity':<11} {'method':<6} "
+        f"{'median ms':>10} {'p95 ms':>9} {'matches':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['query']:<16} {r['entity']:<11} {r['method']:<6} "
+            f"{r['median_ms']:>10.3f} {r['p95_ms']:>9.3f} {r['matches']:>8}"
+        )
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="project-search", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--env", default=os.environ.get("FLASK_ENV", "development"), help="Config name"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rebuild", help="Re-index all tenants and properties")
+    rebuild.add_argument(
+        "--only", choices=["tenant", "property"], help="Re-index one entity type only"
+    )
+
+    bench = commands.add_parser(
+        "benchmark", help="Compare word-prefix index search with ilike scans"
+    )
+    bench.add_argument("queries", nargs="*", help=f"Search texts (default: {DEFAULT_QUERIES})")
+    bench.add_argument("--repeat", type=int, default=20, help="Runs per query (default 20)")
+    bench.add_argument("--per-page", type=int, default=20)
+    bench.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="N",
+        help="Use the testing database filled with N generated properties",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Run the search index CLI."""
+    args = _parse_args(argv)
+
+    if args.command == "benchmark" and args.synthetic:
+        args.env = "testing"
+
+    app = create_app(args.env)
+    with app.app_context():
+        if args.command == "rebuild":
+            counts = SearchIndexRepository().rebuild([args.only] if args.only else None)
+            for entity_type, count in counts.items():
+                print(f"Indexed {count} {entity_type} rows")
+            return
+
+        if args.synthetic:
+            init_db()
+            seed_portfolio(SeedOptions(properties=args.synthetic, months=12))
+        _print_results(benchmark(args.queries or DEFAULT_QUERIES, args.repeat, args.per_page))
+        db_session.remove()
+
+
+if __name__ == "__main__":
+    main()
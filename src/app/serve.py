@@ -0,0 +1,206 @@
+"""Production server: pre-forked gunicorn workers running the Flask app.
+
+The dev entry point (``app.main:main``) runs the single-process Werkzeug server
+with the debugger on. ``serve`` preloads the app once in the master, forks
+``--workers`` processes each running ``--threads`` threads, and recycles
+workers gracefully (``--max-requests``, ``kill -HUP <master>``).
+"""
+
+import argparse
+import hmac
+import ipaddress
+import logging
+import multiprocessing
+import os
+import threading
+import time
+
+from flask import abort, current_app, jsonify, request
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerStats:
+    """Request counters for the current worker process (reset after fork)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start counting from zero (called in each freshly forked worker)."""
+        with self._lock:
+            self.pid = os.getpid()
+            self.started_at = time.time()
+            self.requests = 0
+            self.errors = 0
+            self.in_flight = 0
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, status_code: int):
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            if status_code >= 500:
+                self.errors += 1
+
+    def snapshot(self) -> dict:
+        """Counters as a JSON-friendly dict."""
+        with self._lock:
+            return {
+                "pid": self.pid,
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+            }
+
+
+worker_stats = WorkerStats()
+
+
+def default_workers() -> int:
+    """Worker processes: WEB_CONCURRENCY, else 2 x cores + 1."""
+    env = os.environ.get("WEB_CONCURRENCY")
+    if env:
+        return int(env)
+    return multiprocessing.cpu_count() * 2 + 1
+
+
+def default_threads() -> int:
+    """Threads per worker: WEB_THREADS, else 4."""
+    return int(os.environ.get("WEB_THREADS", 4))
+
+
+# --- gunicorn server hooks ---------------------------------------------------
+
+
+def _post_fork(server, worker):
+    """Drop pooled connections inherited from the master; each worker opens its own."""
+    from app.database import dispose_engine
+
+    dispose_engine(close=False)
+    worker_stats.reset()
+
+
+def _pre_request(worker, req):
+    worker_stats.request_started()
+
+
+def _post_request(worker, req, environ, resp):
+    worker_stats.request_finished(resp.status_code or 0)
+
+
+def _worker_exit(server, worker):
+    logger.info("Worker exiting: %s", worker_stats.snapshot())
+
+
+def _worker_stats_view():
+    """Counters of the worker process that served this request.
+
+    Only for direct loopback clients presenting ``WORKER_STATS_TOKEN``. The
+    loopback check alone proves nothing behind a reverse proxy on the same
+    host (every request comes from 127.0.0.1), so proxied requests are
+    refused and the token is what grants access.
+    """
+    token = current_app.config["WORKER_STATS_TOKEN"]
+    presented = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    if (
+        "X-Forwarded-For" in request.headers
+        or "Forwarded" in request.headers
+        or not ipaddress.ip_address(request.remote_addr or "0.0.0.0").is_loopback
+        or not hmac.compare_digest(presented.encode(), token.encode())
+    ):
+        abort(404)
+    return jsonify(worker_stats.snapshot())
+
+
+def register_worker_stats(app) -> None:
+    """Add ``GET /_worker/stats`` to ``app`` when ``WORKER_STATS_TOKEN`` is set."""
+    if app.config["WORKER_STATS_TOKEN"]:
+        app.add_url_rule("/_worker/stats", "worker_stats", _worker_stats_view)
+
+
+def build_options(args: argparse.Namespace) -> dict:
+    """Translate CLI arguments into gunicorn settings."""
+    return {
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread" if args.threads > 1 else "sync",
+        "preload_app": True,
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "keepalive": 5,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests // 10 if args.max_requests else 0,
+        "accesslog": "-" if args.access_log else None,
+        "post_fork": _post_fork,
+        "pre_request": _pre_request,
+        "post_request": _post_request,
+        "worker_exit": _worker_exit,
+    }
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run RentTrack under gunicorn.")
+    parser.add_argument(
+        "--bind", default=os.environ.get("BIND", "0.0.0.0:8000"), help="host:port to listen on"
+    )
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--threads", type=int, default=default_threads())
+    parser.add_argument("--timeout", type=int, default=30, help="Worker timeout (seconds)")
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=30,
+        help="Seconds a worker may finish in-flight requests on restart",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=1000,
+        help="Recycle a worker after this many requests (0 disables)",
+    )
+    parser.add_argument("--access-log", action="store_true", help="Log requests to stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the production server."""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit(
+            "gunicorn is not installed (it does not run on Windows); "
+            "use `project` for local development."
+        )
+
+    class RentTrackServer(BaseApplication):
+        """gunicorn application that serves the preloaded Flask app."""
+
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            from app.wsgi import app
+
+            register_worker_stats(app)
+            return app
+
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    RentTrackServer(build_options(args)).run()
+
+
+if __name__ == "__main__":
+    main()
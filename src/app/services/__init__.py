@@ -1,6 +1,16 @@
 """Service layer for business logic."""
 
-from app.services.payment_service import PaymentService
+from app.services.api_service import ApiService
+from app.services.export_service import ExportService
+from app.services.payment_service import AllocationConflict, PaymentService
 from app.services.report_service import ReportService
+from app.services.search_service import SearchService
 
-__all__ = ["PaymentService", "ReportService"]
+__all__ = [
+    "AllocationConflict",
+    "ApiService",
+    "ExportService",
+    "PaymentService",
+    "ReportService",
+    "SearchService",
+]
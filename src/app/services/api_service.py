@@ -0,0 +1,260 @@
+"""JSON API over the ledger tables and reports.
+
+Ledger resources are read with keyset pagination (``BaseRepository.keyset_page``):
+a page asks for rows after the last id it has seen, so following ``next``
+links costs the same on page 1000 as on page 1, and an integration that
+remembers its last id pulls only rows added since. ``fields`` selects just
+the requested columns, and filters are limited to indexed columns so every
+query stays an index seek.
+
+Reports are the report datasets of ``app.services.export_service``, one
+JSON object per row. ``changes`` reads the change log
+(``app.repositories.change_log``), so consumers can follow updates and
+deletes too.
+"""
+
+from collections.abc import Callable, Mapping, Sequence
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple
+
+from app.database import db_session, reads_from_replica
+from app.models import Payment, PaymentAllocation, Property, RentCharge, Tenant
+from app.repositories.base_repository import BaseRepository
+from app.repositories.change_log import LOGGED_MODELS, ChangeLogRepository
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.property_repository import PropertyRepository
+from app.repositories.rent_charge_repository import RentChargeRepository
+from app.repositories.tenant_repository import TenantRepository
+from app.services.export_service import DATASETS, ExportFilters, ExportService
+
+
+class Resource(NamedTuple):
+    """A ledger table served by the API."""
+
+    model: type
+    repository: Callable[..., BaseRepository]
+    #: Selectable columns, also the default projection
+    fields: tuple[str, ...]
+    #: Indexed columns clients may filter on by equality
+    filters: tuple[str, ...] = ()
+    #: Indexed date column that ``start_date`` / ``end_date`` bound
+    date_field: str | None = None
+
+
+RESOURCES: dict[str, Resource] = {
+    "properties": Resource(
+        Property,
+        PropertyRepository,
+        (
+            "id", "address", "city", "postal_code", "monthly_rent", "is_active",
+            "created_at", "updated_at",
+        ),
+        filters=("city", "postal_code", "is_active"),
+    ),
+    "tenants": Resource(
+        Tenant,
+        TenantRepository,
+        (
+            "id", "property_id", "name", "email", "phone", "move_in_date", "move_out_date",
+            "created_at", "updated_at",
+        ),
+        filters=("property_id", "email"),
+        date_field="move_in_date",
+    ),
+    "payments": Resource(
+        Payment,
+        PaymentRepository,
+        ("id", "property_id", "amount", "payment_date", "notes", "created_at", "updated_at"),
+        filters=("property_id",),
+        date_field="payment_date",
+    ),
+    "rent-charges": Resource(
+        RentCharge,
+        RentChargeRepository,
+        (
+            "id", "property_id", "period_start", "period_end", "amount_due", "due_date",
+            "status", "created_at", "updated_at",
+        ),
+        filters=("property_id", "status"),
+        date_field="period_start",
+    ),
+    "allocations": Resource(
+        PaymentAllocation,
+        lambda session: BaseRepository(PaymentAllocation, session),
+        ("id", "payment_id", "rent_charge_id", "amount", "created_at"),
+        filters=("payment_id", "rent_charge_id"),
+    ),
+}
+
+#: Export datasets served under ``/api/v1/reports/``
+REPORTS = (
+    "dashboard",
+    "property-report",
+    "arrears",
+    "payment-timeline",
+    "financial",
+    "occupancy",
+    "tenant-history",
+)
+
+
+def _parse(column, value: str):
+    """Convert a query-string ``value`` to ``column``'s Python type."""
+    python_type = column.type.python_type
+    if python_type is bool:
+        if value.lower() in ("1", "true"):
+            return True
+        if value.lower() in ("0", "false"):
+            return False
+        raise ValueError(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+class ApiService:
+    """Reads resources and reports as JSON-ready dicts."""
+
+    def __init__(self, session=None):
+        """Initialize on ``session`` (default the thread-local session)."""
+        self._session = session or db_session
+
+    @staticmethod
+    def describe() -> dict:
+        """Resources with their fields and filters, and the report names."""
+        return {
+            "resources": {
+                name: {
+                    "fields": spec.fields,
+                    "filters": spec.filters,
+                    "date_field": spec.date_field,
+                }
+                for name, spec in RESOURCES.items()
+            },
+            "reports": {name: DATASETS[name].description for name in REPORTS},
+            "changes": {"tables": list(LOGGED_MODELS.values())},
+        }
+
+    @staticmethod
+    def _columns(spec: Resource, fields: Sequence[str] | None) -> list[str]:
+        if not fields:
+            return list(spec.fields)
+        unknown = [name for name in fields if name not in spec.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        # The id is always returned: it is the pagination cursor
+        return ["id", *(name for name in spec.fields if name in fields and name != "id")]
+
+    @staticmethod
+    def _filters(spec: Resource, filters: Mapping[str, str]) -> dict:
+        parsed = {}
+        for name, value in filters.items():
+            if name not in spec.filters:
+                raise ValueError(
+                    f"Cannot filter on {name!r} (filters: {', '.join(spec.filters) or 'none'})"
+                )
+            try:
+                parsed[name] = _parse(getattr(spec.model, name), value)
+            except ValueError:
+                raise ValueError(f"Invalid {name}: {value!r}") from None
+        return parsed
+
+    @reads_from_replica
+    def page(
+        self,
+        resource: str,
+        fields: Sequence[str] | None = None,
+        filters: Mapping[str, str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        after: int | None = None,
+        limit: int = 100,
+    ) -> tuple[list[dict], int | None]:
+        """One page of ``resource`` rows and the cursor for the next page.
+
+        Args:
+            resource: Key of ``RESOURCES``
+            fields: Columns to return (default all); ``id`` is always included
+            filters: Column name -> query-string value, for indexed columns only
+            start_date: Lower bound on the resource's ``date_field``
+            end_date: Upper bound on the resource's ``date_field``
+            after: Cursor from the previous page
+            limit: Page size
+
+        Returns:
+            (rows, next cursor or None on the last page)
+
+        Raises:
+            KeyError: Unknown resource
+            ValueError: Unknown field, unsupported filter or bad filter value
+        """
+        spec = RESOURCES[resource]
+        columns = self._columns(spec, fields)
+        parsed = self._filters(spec, filters or {})
+        ranges = None
+        if start_date or end_date:
+            if spec.date_field is None:
+                raise ValueError(f"{resource} cannot be filtered by date")
+            ranges = {spec.date_field: (start_date, end_date)}
+
+        repo = spec.repository(self._session)
+        # One extra row tells whether there is a next page
+        rows = repo.keyset_page(columns, after, limit + 1, ranges, **parsed)
+        more = len(rows) > limit
+        rows = rows[:limit]
+        return [row._asdict() for row in rows], rows[-1].id if more else None
+
+    @reads_from_replica
+    def get(self, resource: str, id: int, fields: Sequence[str] | None = None) -> dict | None:
+        """One ``resource`` row by id, or None.
+
+        Raises:
+            KeyError: Unknown resource
+            ValueError: Unknown field
+        """
+        spec = RESOURCES[resource]
+        rows = spec.repository(self._session).keyset_page(
+            self._columns(spec, fields), limit=1, id=id
+        )
+        return rows[0]._asdict() if rows else None
+
+    @reads_from_replica
+    def changes(
+        self,
+        since: int = 0,
+        limit: int = 1000,
+        tables: Sequence[str] | None = None,
+        settle_seconds: float = 0,
+    ) -> tuple[list[dict], int]:
+        """Change log entries after sequence number ``since`` and the cursor to resume from.
+
+        Entries written in the last ``settle_seconds`` are held back, along
+        with everything after them, until lower sequence numbers still being
+        committed have had time to appear.
+
+        Returns:
+            (entries, sequence number to pass as ``since`` next time)
+
+        Raises:
+            ValueError: Unknown table
+        """
+        unknown = set(tables or ()) - set(LOGGED_MODELS.values())
+        if unknown:
+            raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))}")
+        settled_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            seconds=settle_seconds
+        )
+        rows = ChangeLogRepository(self._session).since(since, limit, tables, settled_before)
+        return [row._asdict() for row in rows], rows[-1].seq if rows else since
+
+    def report(self, name: str, filters: ExportFilters = ExportFilters()) -> list[dict]:
+        """Rows of report ``name`` as dicts.
+
+        Raises:
+            KeyError: Unknown report
+            ValueError: A filter the report requires is missing
+        """
+        if name not in REPORTS:
+            raise KeyError(name)
+        columns, rows = ExportService(self._session).rows(name, filters)
+        return [dict(zip(columns, row)) for row in rows]
@@ -1,11 +1,13 @@
 """Email service using Google Gmail API."""
 
 import os
+import asyncio
 from base64 import urlsafe_b64encode
 from datetime import date
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
+import httpx
 import requests
 from dotenv import load_dotenv
 
@@ -19,6 +21,9 @@ def _format_date(d: date) -> str:
 class EmailService:
     """Service for sending emails via Google Gmail API."""
 
+    TOKEN_URL = "https://oauth2.googleapis.com/token"
+    SEND_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages/send"
+
     def __init__(self):
         """Initialize with credentials from environment."""
         self.client_id = os.environ.get("GOOGLE_CLIENT_ID")
@@ -36,20 +41,21 @@ class EmailService:
         if self.access_token:
             return self.access_token
 
-        token_url = "https://oauth2.googleapis.com/token"
-        data = {
+        response = requests.post(self.TOKEN_URL, data=self._token_request())
+        response.raise_for_status()
+
+        self.access_token = response.json()["access_token"]
+        return self.access_token
+
+    def _token_request(self) -> dict:
+        """Form data exchanging the refresh token for an access token."""
+        return {
             "client_id": self.client_id,
             "client_secret": self.client_secret,
             "refresh_token": self.refresh_token,
             "grant_type": "refresh_token",
         }
 
-        response = requests.post(token_url, data=data)
-        response.raise_for_status()
-
-        self.access_token = response.json()["access_token"]
-        return self.access_token
-
     def _create_message(
         self, to_email: str, subject: str, html_body: str, text_body: str = None
     ) -> dict:
@@ -90,13 +96,12 @@ class EmailService:
         access_token = self._get_access_token()
         message = self._create_message(to_email, subject, html_body, text_body)
 
-        url = "https://gmail.googleapis.com/gmail/v1/users/me/messages/send"
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
         }
 
-        response = requests.post(url, headers=headers, json=message)
+        response = requests.post(self.SEND_URL, headers=headers, json=message)
         response.raise_for_status()
 
         return response.json()
@@ -199,3 +204,49 @@ class EmailService:
         """
 
         return self.send_email(tenant_email, subject, html_body)
+
+
+class AsyncEmailService(EmailService):
+    """``EmailService`` over ``httpx.AsyncClient``: sends are awaitable.
+
+    The message builders are inherited; ``send_email`` and the helpers that
+    call it (``send_payment_reminder``, ``send_arrears_notice``, ...) return
+    coroutines. One access token is fetched and shared by concurrent sends.
+    Pass a ``client`` to reuse its connection pool across sends.
+    """
+
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        """Initialize with credentials from environment and an optional HTTP client."""
+        super().__init__()
+        self._client = client
+        self._token_lock = asyncio.Lock()
+
+    async def _post(self, url: str, **kwargs) -> dict:
+        if self._client is not None:
+            response = await self._client.post(url, **kwargs)
+        else:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_access_token(self) -> str:
+        """Get fresh access token using refresh token."""
+        async with self._token_lock:
+            if not self.access_token:
+                token = await self._post(self.TOKEN_URL, data=self._token_request())
+                self.access_token = token["access_token"]
+        return self.access_token
+
+    async def send_email(
+        self, to_email: str, subject: str, html_body: str, text_body: str = None
+    ) -> dict:
+        """Send an email via Gmail API.
+
+        Raises:
+            httpx.HTTPStatusError: If API call fails
+        """
+        access_token = await self._get_access_token()
+        message = self._create_message(to_email, subject, html_body, text_body)
+        headers = {"Authorization": f"Bearer {access_token}"}
+        return await self._post(self.SEND_URL, headers=headers, json=message)
@@ -0,0 +1,384 @@
+"""Streaming CSV / NDJSON exports of the ledger tables and reports.
+
+Ledger datasets (payments, rent charges, allocations, tenants) are read
+through the repositories' ``iter_*`` generators, so rows are fetched from a
+server-side cursor ``SQL_STREAM_CHUNK_SIZE`` at a time and encoded as they
+arrive: the header goes out before the first fetch and memory stays flat
+however many years the export covers. Reports are computed by
+``ReportService`` and flattened to one row per tenant, property or month.
+
+``stream`` returns an iterator of byte chunks suitable for a streaming
+Flask response or for writing to a file, optionally gzip-compressed on the
+fly.
+"""
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import NamedTuple
+
+from app.database import db_session
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.rent_charge_repository import RentChargeRepository
+from app.repositories.tenant_repository import TenantRepository
+from app.services.report_service import ReportService
+
+#: Export format -> response mimetype
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+#: Encoded output is handed on in chunks of about this many bytes
+FLUSH_BYTES = 64 * 1024
+
+
+class ExportFilters(NamedTuple):
+    """Filters applied to an export; which ones a dataset honours is in its ``filters``."""
+
+    start_date: date | None = None
+    end_date: date | None = None
+    property_id: int | None = None
+    tenant_id: int | None = None
+
+
+class Dataset(NamedTuple):
+    """An exportable table or report."""
+
+    description: str
+    columns: tuple[str, ...]
+    rows: Callable[["ExportService", ExportFilters], Iterable[Sequence]]
+    #: Filters the dataset honours
+    filters: tuple[str, ...] = ("start_date", "end_date", "property_id")
+    #: Filters that must be given
+    required: tuple[str, ...] = ()
+
+
+def _payments(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    for p in service.payment_repo.iter_rows(f.property_id, f.start_date, f.end_date):
+        yield (
+            p.id, p.payment_date, p.property_id, p.property_address, p.property_city,
+            p.amount, p.allocated, p.unallocated, p.allocation_count, p.notes,
+        )
+
+
+def _rent_charges(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    rows = service.charge_repo.iter_rows(
+        f.property_id, start_date=f.start_date, end_date=f.end_date
+    )
+    for c in rows:
+        yield (
+            c.id, c.property_id, c.property_address, c.property_city, c.period_start,
+            c.period_end, c.due_date, c.amount_due, c.allocated, c.remaining, c.status,
+        )
+
+
+def _allocations(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    for a in service.payment_repo.iter_allocation_rows(f.property_id, f.start_date, f.end_date):
+        yield (
+            a.id, a.payment_id, a.payment_date, a.rent_charge_id, a.period_start,
+            a.period_end, a.amount, a.property_id, a.property_address, a.property_city,
+        )
+
+
+def _tenants(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    for t in service.tenant_repo.iter_rows(f.property_id, f.start_date, f.end_date):
+        yield (
+            t.id, t.name, t.email, t.phone, t.move_in_date, t.move_out_date,
+            t.property_id, t.property_address, t.property_city,
+        )
+
+
+def _dashboard(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    summary = service.reports.get_dashboard_summary()
+    counts = summary["charges_by_status"]
+    yield (
+        summary["total_properties"], summary["total_tenants"],
+        summary["monthly_rent_expected"], summary["total_arrears"],
+        counts["charged"], counts["paid"], counts["late"], counts["in_arrears"],
+    )
+
+
+def _property_report(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    report = service.reports.get_property_report(f.property_id)
+    if report is None:
+        return
+    prop = report["property"]
+    yield (
+        prop.id, prop.address, prop.city, prop.monthly_rent, len(report["current_tenants"]),
+        len(report["payments"]), report["total_payments"],
+        len(report["charges"]), report["total_charges"], report["balance"],
+    )
+
+
+def _arrears(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    for row in service.reports.get_arrears_report():
+        tenant, prop = row["tenant"], row["property"]
+        if f.property_id and prop.id != f.property_id:
+            continue
+        yield (
+            tenant.id, tenant.name, tenant.email, prop.id, prop.address, len(row["charges"]),
+            row["total_outstanding"], row["oldest_due"], row["days_overdue"],
+        )
+
+
+def _payment_timeline(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    months = 12
+    if f.start_date:
+        months = max(1, -(-(date.today() - f.start_date).days // 30))
+    for row in service.reports.get_payment_timeline(f.property_id, months):
+        yield row["month"], row["payment_count"], row["total"]
+
+
+def _financial(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    s = service.reports.get_financial_summary(f.start_date, f.end_date)
+    yield (
+        s["start_date"], s["end_date"], s["total_received"], s["total_charged"],
+        s["outstanding"], s["payment_count"], s["charge_count"],
+    )
+
+
+def _occupancy(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    for row in service.reports.get_occupancy_report():
+        prop = row["property"]
+        if f.property_id and prop.id != f.property_id:
+            continue
+        yield (
+            prop.id, prop.address, prop.city, prop.is_active, row["is_occupied"],
+            row["tenant_count"], "; ".join(t.name for t in row["tenants"]),
+        )
+
+
+def _tenant_history(service: "ExportService", f: ExportFilters) -> Iterator[tuple]:
+    history = service.reports.get_tenant_payment_history(f.tenant_id)
+    if history is None:
+        return
+    tenant = history["tenant"]
+    for a in history["allocations"]:
+        yield tenant.id, tenant.name, a.id, a.payment_id, a.rent_charge_id, a.amount
+
+
+DATASETS: dict[str, Dataset] = {
+    "payments": Dataset(
+        "Payments with allocated / unallocated totals",
+        (
+            "id", "payment_date", "property_id", "property_address", "property_city",
+            "amount", "allocated", "unallocated", "allocation_count", "notes",
+        ),
+        _payments,
+    ),
+    "rent-charges": Dataset(
+        "Rent charges with allocated and remaining amounts (period within the dates)",
+        (
+            "id", "property_id", "property_address", "property_city", "period_start",
+            "period_end", "due_date", "amount_due", "allocated", "remaining", "status",
+        ),
+        _rent_charges,
+    ),
+    "allocations": Dataset(
+        "Payment allocations with payment date and charge period",
+        (
+            "id", "payment_id", "payment_date", "rent_charge_id", "period_start",
+            "period_end", "amount", "property_id", "property_address", "property_city",
+        ),
+        _allocations,
+    ),
+    "tenants": Dataset(
+        "Tenants whose tenancy overlaps the dates",
+        (
+            "id", "name", "email", "phone", "move_in_date", "move_out_date",
+            "property_id", "property_address", "property_city",
+        ),
+        _tenants,
+    ),
+    "dashboard": Dataset(
+        "Dashboard summary (one row)",
+        (
+            "total_properties", "total_tenants", "monthly_rent_expected", "total_arrears",
+            "charges_charged", "charges_paid", "charges_late", "charges_in_arrears",
+        ),
+        _dashboard,
+        filters=(),
+    ),
+    "property-report": Dataset(
+        "Property report totals (one row)",
+        (
+            "property_id", "address", "city", "monthly_rent", "current_tenants",
+            "payment_count", "total_payments", "charge_count", "total_charges", "balance",
+        ),
+        _property_report,
+        filters=("property_id",),
+        required=("property_id",),
+    ),
+    "arrears": Dataset(
+        "Arrears report, one row per tenant",
+        (
+            "tenant_id", "tenant_name", "tenant_email", "property_id", "property_address",
+            "charge_count", "total_outstanding", "oldest_due", "days_overdue",
+        ),
+        _arrears,
+        filters=("property_id",),
+    ),
+    "payment-timeline": Dataset(
+        "Monthly payment counts and totals for a property since start_date (default 12 months)",
+        ("month", "payment_count", "total"),
+        _payment_timeline,
+        filters=("property_id", "start_date"),
+        required=("property_id",),
+    ),
+    "financial": Dataset(
+        "Financial summary for the dates (one row)",
+        (
+            "start_date", "end_date", "total_received", "total_charged", "outstanding",
+            "payment_count", "charge_count",
+        ),
+        _financial,
+        filters=("start_date", "end_date"),
+    ),
+    "occupancy": Dataset(
+        "Occupancy report, one row per property",
+        (
+            "property_id", "address", "city", "is_active", "is_occupied", "tenant_count",
+            "tenants",
+        ),
+        _occupancy,
+        filters=("property_id",),
+    ),
+    "tenant-history": Dataset(
+        "Allocations to the charges of a tenant's property",
+        ("tenant_id", "tenant_name", "allocation_id", "payment_id", "rent_charge_id", "amount"),
+        _tenant_history,
+        filters=("tenant_id",),
+        required=("tenant_id",),
+    ),
+}
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def json_default(value):
+    """``json.dumps`` default: amounts as strings, ISO dates, enum values."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__} as JSON")
+
+
+def encode_csv(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    """CSV text chunks: the header at once, then rows about ``FLUSH_BYTES`` at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow([_text(value) for value in row])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def encode_ndjson(columns: Sequence[str], rows: Iterable[Sequence]) -> Iterator[str]:
+    """NDJSON text chunks, one object per row, about ``FLUSH_BYTES`` at a time.
+
+    Amounts are strings so no precision is lost to floats.
+    """
+    lines, size = [], 0
+    for row in rows:
+        line = json.dumps(dict(zip(columns, row)), default=json_default) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(lines)
+            lines, size = [], 0
+    if lines:
+        yield "".join(lines)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly, emitting each chunk's compressed bytes as it comes."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        # Sync flush so each chunk reaches the client instead of waiting in the compressor
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+class ExportService:
+    """Encodes datasets as streams of CSV or NDJSON bytes."""
+
+    def __init__(self, session=None):
+        """Initialize with repositories (on ``session``, default the thread-local session)."""
+        session = session or db_session
+        self.payment_repo = PaymentRepository(session)
+        self.charge_repo = RentChargeRepository(session)
+        self.tenant_repo = TenantRepository(session)
+        self.reports = ReportService(session)
+
+    def rows(self, dataset: str, filters: ExportFilters) -> tuple[tuple[str, ...], Iterator]:
+        """Columns and a lazy row iterator for ``dataset``.
+
+        Raises:
+            KeyError: Unknown dataset
+            ValueError: A filter the dataset requires is missing, or one it
+                does not support is given (the export would look filtered
+                but not be)
+        """
+        spec = DATASETS[dataset]
+        unsupported = [
+            name
+            for name in ExportFilters._fields
+            if getattr(filters, name) is not None and name not in spec.filters
+        ]
+        if unsupported:
+            supported = ", ".join(spec.filters) or "none"
+            raise ValueError(
+                f"{dataset} export does not support {', '.join(unsupported)} "
+                f"(supported filters: {supported})"
+            )
+        missing = [name for name in spec.required if getattr(filters, name) is None]
+        if missing:
+            raise ValueError(f"{dataset} export requires {', '.join(missing)}")
+        return spec.columns, iter(spec.rows(self, filters))
+
+    def stream(
+        self,
+        dataset: str,
+        format: str = "csv",
+        filters: ExportFilters = ExportFilters(),
+        compress: bool = False,
+    ) -> Iterator[bytes]:
+        """Byte chunks of ``dataset`` encoded as ``format`` ("csv" or "ndjson").
+
+        Arguments are checked here; no rows are read until the iterator is
+        consumed.
+
+        Raises:
+            KeyError: Unknown dataset
+            ValueError: Unknown format, a required filter is missing or an
+                unsupported one is given
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format {format!r}")
+        columns, rows = self.rows(dataset, filters)
+        encode = encode_csv if format == "csv" else encode_ndjson
+        chunks = (text.encode() for text in encode(columns, rows))
+        return gzip_chunks(chunks) if compress else chunks
+
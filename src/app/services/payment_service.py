@@ -1,15 +1,83 @@
-"""Payment service for business logic."""
-
+"""Payment service for business logic.
+
+Allocation writes are guarded by optimistic concurrency control. Every
+change to a payment's or a charge's allocations bumps that row's
+``version`` with a compare-and-swap ``UPDATE ... WHERE version = <read>``.
+The CAS runs in the same transaction as the change. A write validated
+against allocations that another request has since changed matches no
+row, so it is rolled back and retried from a fresh read, up to
+``ALLOCATION_ATTEMPTS`` times. Only writers touching the same payment or
+charge contend. On the database, the swap's row lock makes them
+serialize, and the loser sees the new version.
+"""
+
+import random
+import time
+from collections.abc import Callable, Sequence
 from datetime import date
 from decimal import Decimal
+from typing import TypeVar
+
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
 
 from app.database import db_session
 from app.domain.charge_states import ChargeStatusResolver
+from app.models.payment import Payment
 from app.models.payment_allocation import PaymentAllocation
 from app.models.rent_charge import ChargeStatus, RentCharge
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.rent_charge_repository import RentChargeRepository
 
+T = TypeVar("T")
+
+#: Tries at an allocation write before giving up on concurrent changes
+ALLOCATION_ATTEMPTS = 5
+
+
+class AllocationConflict(ValueError):
+    """The payment or a charge kept changing while an allocation was being written."""
+
+
+class _StaleRead(Exception):
+    """A version claim found the row changed since it was read."""
+
+
+def _claim_versions(rows: Sequence[Payment | RentCharge]) -> None:
+    """Bump each row's version, provided it is still the version that was read.
+
+    Payments are claimed before charges, and charges in ID order. Writers
+    therefore lock rows in the same order and cannot deadlock.
+
+    Raises:
+        _StaleRead: A row's version has moved on (or the row is gone)
+    """
+    for row in rows:
+        model = type(row)
+        result = db_session.execute(
+            update(model)
+            .where(model.id == row.id, model.version == row.version)
+            .values(version=model.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise _StaleRead(f"{model.__tablename__} {row.id}")
+
+
+def _retrying(write: Callable[[], T]) -> T:
+    """Run ``write``, re-running it from fresh reads while its version claims fail."""
+    for attempt in range(1, ALLOCATION_ATTEMPTS + 1):
+        try:
+            return write()
+        except _StaleRead:
+            db_session.rollback()
+            if attempt < ALLOCATION_ATTEMPTS:
+                # Jitter so colliding writers do not collide again
+                time.sleep(random.uniform(0, 0.005 * attempt))
+    raise AllocationConflict(
+        "The payment or its charges changed while allocating; please try again."
+    )
+
 
 class PaymentService:
     """Service for payment-related business logic."""
@@ -24,45 +92,109 @@ class PaymentService:
     ) -> PaymentAllocation | None:
         """Allocate a payment to a rent charge.
 
+        A one-line ``allocate_many``, so both paths apply the same checks.
+        The allocation and the charge's new status are written in one
+        transaction, retried if the payment or charge changes meanwhile.
+
         Args:
             payment_id: Payment ID
             rent_charge_id: Rent charge ID
             amount: Amount to allocate
 
         Returns:
-            Created allocation or None if invalid
+            Created allocation or None if the payment does not exist
+
+        Raises:
+            ValueError: The charge is unknown or of another property, or the
+                amount is not positive, exceeds the payment's unallocated
+                balance or exceeds what the charge still owes
+            AllocationConflict: Concurrent changes outlasted every retry
         """
-        # Load payment with allocations to avoid lazy loading issues
-        payment = self._payment_repo.get_with_allocations(payment_id)
-        # Load charge with allocations
-        charge = self._charge_repo.get_with_allocations(rent_charge_id)
+        allocations = self.allocate_many(payment_id, [(rent_charge_id, amount)])
+        return allocations[0] if allocations else None
 
-        if not payment or not charge:
-            return None
+    def allocate_many(
+        self, payment_id: int, amounts: Sequence[tuple[int, Decimal | float | str]]
+    ) -> list[PaymentAllocation] | None:
+        """Allocate a payment to several rent charges at once.
 
-        # Check payment has remaining unallocated amount
-        total_allocated = sum(a.amount for a in payment.allocations)
-        remaining = payment.amount - total_allocated
+        Every (charge, amount) pair is checked against one snapshot of the
+        payment's balance and the charges' remaining amounts; then all
+        allocations are written in one transaction and each charge's status
+        is recomputed once. If another request changes the payment or one of
+        the charges in between, the batch is re-checked against a fresh
+        snapshot.
+
+        Args:
+            payment_id: Payment ID
+            amounts: (rent charge ID, amount) pairs
+
+        Returns:
+            Created allocations (in the order given) or None if payment not found
+
+        Raises:
+            ValueError: A charge is unknown, repeated or of another property, an
+                amount is not positive or exceeds what the charge still owes, or
+                the total exceeds the payment's unallocated balance
+            AllocationConflict: Concurrent changes outlasted every retry
+        """
+        return _retrying(lambda: self._allocate_many(payment_id, amounts))
+
+    def _allocate_many(
+        self, payment_id: int, amounts: Sequence[tuple[int, Decimal | float | str]]
+    ) -> list[PaymentAllocation] | None:
+        payment = self._payment_repo.get_with_allocations(payment_id)
+        if not payment:
+            return None
+        if not amounts:
+            raise ValueError("No allocations given")
+
+        charge_ids = [charge_id for charge_id, _ in amounts]
+        if len(set(charge_ids)) != len(charge_ids):
+            raise ValueError("Each rent charge may appear only once")
+        charges = {
+            c.id: c for c in self._charge_repo.get_many(charge_ids, load="allocations")
+        }
 
-        if Decimal(str(amount)) > remaining:
+        # Validate everything against this snapshot before writing anything
+        lines = []
+        for charge_id, amount in amounts:
+            charge = charges.get(charge_id)
+            if charge is None or charge.property_id != payment.property_id:
+                raise ValueError(f"Rent charge {charge_id} is not a charge of this property")
+            try:
+                amount = Decimal(str(amount)).quantize(Decimal("0.01"))
+            except ArithmeticError:
+                raise ValueError(f"Invalid amount {amount!r}") from None
+            if not amount.is_finite() or amount <= 0:
+                raise ValueError("Allocation amounts must be positive")
+            owed = charge.amount_due - sum(a.amount for a in charge.payment_allocations)
+            if amount > owed:
+                raise ValueError(
+                    f"${amount:,.2f} exceeds the ${owed:,.2f} still owed on rent charge "
+                    f"{charge_id}"
+                )
+            lines.append((charge, amount))
+
+        remaining = payment.amount - sum(a.amount for a in payment.allocations)
+        total = sum(amount for _, amount in lines)
+        if total > remaining:
             raise ValueError("Allocation amount exceeds remaining payment amount")
 
-        # Create allocation
-        allocation = PaymentAllocation(
-            payment_id=payment_id,
-            rent_charge_id=rent_charge_id,
-            amount=Decimal(str(amount)),
-        )
+        _claim_versions([payment] + sorted((charge for charge, _ in lines), key=lambda c: c.id))
 
-        db_session.add(allocation)
+        allocations = []
+        for charge, amount in lines:
+            allocation = PaymentAllocation(payment=payment, amount=amount)
+            charge.payment_allocations.append(allocation)
+            allocations.append(allocation)
+        for charge, _ in lines:
+            self._resolve_charge_status(charge)
         db_session.commit()
 
-        # Update charge status
-        self._update_charge_status(charge)
-
-        return allocation
+        return allocations
 
-    def _update_charge_status(self, charge: RentCharge) -> None:
+    def _resolve_charge_status(self, charge: RentCharge) -> None:
         total_allocated = Decimal(
             str(sum(a.amount for a in charge.payment_allocations))
         )
@@ -72,6 +204,9 @@ class PaymentService:
             amount_due,
             charge.due_date,
         )
+
+    def _update_charge_status(self, charge: RentCharge) -> None:
+        self._resolve_charge_status(charge)
         db_session.commit()
 
     def update_charge_status(self, charge: RentCharge) -> ChargeStatus:
@@ -127,24 +262,35 @@ class PaymentService:
     def auto_allocate_payment(self, payment_id: int) -> list[PaymentAllocation]:
         """Auto-allocate payment to outstanding charges (oldest first by due_date).
 
+        The plan is made and written in one retried step, so a concurrent
+        allocation to the same charges makes it re-plan from a fresh read.
+
         Args:
             payment_id: Payment ID
 
         Returns:
             List of created allocations
+
+        Raises:
+            AllocationConflict: Concurrent changes outlasted every retry
         """
+        return _retrying(lambda: self._auto_allocate(payment_id))
+
+    def _auto_allocate(self, payment_id: int) -> list[PaymentAllocation]:
         payment = self._payment_repo.get_with_allocations(payment_id)
         if not payment:
             return []
 
-        remaining = self.get_payment_balance(payment_id)
+        remaining = payment.amount - sum(a.amount for a in payment.allocations)
         if remaining <= 0:
             return []
 
         # Get outstanding charges ordered by due_date (oldest first)
-        charges = self._charge_repo.get_outstanding_by_property(payment.property_id)
+        charges = self._charge_repo.get_outstanding_by_property(
+            payment.property_id, load="list"
+        )
 
-        allocations = []
+        amounts = []
         for charge in charges:
             if remaining <= 0:
                 break
@@ -158,36 +304,54 @@ class PaymentService:
 
             # Allocate as much as possible (up to the charge remaining)
             alloc_amount = min(remaining, charge_remaining)
+            amounts.append((charge.id, alloc_amount))
+            remaining -= alloc_amount
 
-            allocation = self.allocate_payment(
-                payment_id, charge.id, float(alloc_amount)
-            )
-            if allocation:
-                allocations.append(allocation)
-                remaining -= alloc_amount
-
-        return allocations
+        if not amounts:
+            return []
+        # One transaction and one status pass for all of them (retried by the caller)
+        return self._allocate_many(payment_id, amounts)
 
-    def delete_allocation(self, allocation_id: int) -> bool:
+    def delete_allocation(self, allocation_id: int) -> PaymentAllocation | None:
         """Delete a payment allocation and update charge status.
 
+        The delete and the charge's new status are written in one transaction.
+
         Args:
             allocation_id: Allocation ID to delete
 
         Returns:
-            True if deleted, False if not found
-        """
-        from app.database import db_session
+            The deleted allocation (its ``payment_id`` and ``rent_charge_id``
+            stay readable) or None if not found
 
-        allocation = db_session.get(PaymentAllocation, allocation_id)
+        Raises:
+            AllocationConflict: Concurrent changes outlasted every retry
+        """
+        return _retrying(lambda: self._delete_allocation(allocation_id))
+
+    def _delete_allocation(self, allocation_id: int) -> PaymentAllocation | None:
+        allocation = (
+            db_session.query(PaymentAllocation)
+            .options(
+                joinedload(PaymentAllocation.payment),
+                joinedload(PaymentAllocation.rent_charge).joinedload(
+                    RentCharge.payment_allocations
+                ),
+            )
+            .filter(PaymentAllocation.id == allocation_id)
+            .first()
+        )
         if not allocation:
-            return False
+            return None
 
         charge = allocation.rent_charge
+        _claim_versions([allocation.payment, charge])
+        charge.payment_allocations.remove(allocation)
         db_session.delete(allocation)
-        db_session.commit()
+        db_session.flush()
 
         # Update charge status after removal
-        self._update_charge_status(charge)
+        self._resolve_charge_status(charge)
+        db_session.commit()
 
-        return True
+        return allocation
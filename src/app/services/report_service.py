@@ -1,13 +1,22 @@
 """Report service for generating reports and summaries."""
 
+from contextlib import nullcontext
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
+from app.database import (
+    async_available,
+    async_session,
+    db_session,
+    primary_reads,
+    reads_from_replica,
+)
 from app.models.rent_charge import ChargeStatus
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.property_repository import PropertyRepository
 from app.repositories.rent_charge_repository import RentChargeRepository
+from app.repositories.rows import RowVersion
 from app.repositories.tenant_repository import TenantRepository
 
 if TYPE_CHECKING:
@@ -15,64 +24,73 @@ if TYPE_CHECKING:
 
 
 class ReportService:
-    """Service for generating reports."""
+    """Service for generating reports.
 
-    def __init__(self):
-        """Initialize with repositories."""
-        self._property_repo = PropertyRepository()
-        self._tenant_repo = TenantRepository()
-        self._payment_repo = PaymentRepository()
-        self._charge_repo = RentChargeRepository()
+    Reports only read, so they run on the read replica when one is configured.
+    """
 
+    def __init__(self, session=None):
+        """Initialize with repositories (on ``session``, default the thread-local session)."""
+        self._session = session or db_session
+        self._property_repo = PropertyRepository(self._session)
+        self._tenant_repo = TenantRepository(self._session)
+        self._payment_repo = PaymentRepository(self._session)
+        self._charge_repo = RentChargeRepository(self._session)
+
+    @reads_from_replica
     def get_dashboard_summary(self) -> dict:
         """Get dashboard summary statistics.
 
         Returns:
             Dict with summary data
         """
-        # Total counts
-        total_properties = self._property_repo.count()
-        total_tenants = self._tenant_repo.count()
-
-        # Monthly rent expected from active properties
-        properties = self._property_repo.get_all()
-        monthly_rent_expected = sum(
-            p.monthly_rent for p in properties if p.is_active
-        )
-
-        # Arrears
-        total_arrears = self._charge_repo.get_total_arrears()
-
-        # Recent payments
-        recent_payments = self._payment_repo.get_recent(limit=5)
-
-        # Upcoming dues
-        upcoming_charges = self._charge_repo.get_upcoming(days=7)
-
-        # Recent rent charges (past 30 days)
-        recent_charges = self._charge_repo.get_recent(days=30)
+        return {
+            **self.get_dashboard_totals(),
+            "recent_payments": self.get_recent_payments(),
+            "upcoming_charges": self.get_upcoming_charges(),
+            "recent_charges": self.get_recent_charges(),
+            "charges_by_status": self.get_charge_status_counts(),
+        }
 
-        # Charge counts by status
-        charges_by_status = {
-            "charged": len(self._charge_repo.get_by_status(ChargeStatus.CHARGED)),
-            "paid": len(self._charge_repo.get_by_status(ChargeStatus.PAID)),
-            "late": len(self._charge_repo.get_by_status(ChargeStatus.LATE)),
-            "in_arrears": len(
-                self._charge_repo.get_by_status(ChargeStatus.IN_ARREARS)
-            ),
+    @reads_from_replica
+    def get_dashboard_totals(self) -> dict:
+        """Property and tenant counts, expected monthly rent and total arrears."""
+        return {
+            "total_properties": self._property_repo.count(),
+            "total_tenants": self._tenant_repo.count(),
+            # Monthly rent expected from active properties; from the database, not the
+            # per-process directory, since the cached fragment is keyed on database versions
+            "monthly_rent_expected": self._property_repo.total_active_rent(),
+            "total_arrears": self._charge_repo.get_total_arrears(),
         }
 
+    @reads_from_replica
+    def get_recent_payments(self, limit: int = 5) -> list:
+        """Latest payments across all properties, with their property."""
+        return self._payment_repo.get_recent(limit=limit, load="with_property")
+
+    @reads_from_replica
+    def get_upcoming_charges(self, days: int = 7) -> list:
+        """Charges due in the next ``days`` days, with their property."""
+        return self._charge_repo.get_upcoming(days=days, load="with_property")
+
+    @reads_from_replica
+    def get_recent_charges(self, days: int = 30) -> list:
+        """Charges created in the past ``days`` days."""
+        return self._charge_repo.get_recent(days=days, load="summary")
+
+    @reads_from_replica
+    def get_charge_status_counts(self) -> dict:
+        """Number of charges in each status, keyed by status value."""
+        counts = self._charge_repo.count_by_status()
         return {
-            "total_properties": total_properties,
-            "total_tenants": total_tenants,
-            "monthly_rent_expected": monthly_rent_expected,
-            "total_arrears": total_arrears,
-            "recent_payments": recent_payments,
-            "upcoming_charges": upcoming_charges,
-            "recent_charges": recent_charges,
-            "charges_by_status": charges_by_status,
+            "charged": counts[ChargeStatus.CHARGED],
+            "paid": counts[ChargeStatus.PAID],
+            "late": counts[ChargeStatus.LATE],
+            "in_arrears": counts[ChargeStatus.IN_ARREARS],
         }
 
+    @reads_from_replica
     def get_property_report(self, property_id: int) -> dict | None:
         """Get detailed report for a property.
 
@@ -91,11 +109,11 @@ class ReportService:
         current_tenants = [t for t in tenants if t.move_out_date is None]
 
         # Payments
-        payments = self._payment_repo.get_by_property(property_id)
+        payments = self._payment_repo.list_rows(property_id=property_id)
         total_payments = sum(p.amount for p in payments)
 
         # Rent charges
-        charges = self._charge_repo.get_by_property(property_id)
+        charges = self._charge_repo.list_rows(property_id=property_id)
         total_charges = sum(c.amount_due for c in charges)
 
         # Balance
@@ -112,6 +130,25 @@ class ReportService:
             "balance": balance,
         }
 
+    @reads_from_replica
+    def get_property_report_versions(self, property_id: int) -> list[RowVersion] | None:
+        """Row versions of what ``get_property_report`` and ``get_payment_timeline`` read.
+
+        Returns:
+            List of ``RowVersion`` or None if property not found
+        """
+        property_version = self._property_repo.get_version(id=property_id)
+        if not property_version.count:
+            return None
+        return [
+            property_version,
+            self._tenant_repo.get_version(property_id=property_id),
+            self._payment_repo.get_version(property_id=property_id),
+            self._charge_repo.get_version(property_id=property_id),
+            self._payment_repo.get_allocation_version(property_id=property_id),
+        ]
+
+    @reads_from_replica
     def get_arrears_report(self) -> list[dict]:
         """Get arrears report with tenant information.
 
@@ -121,7 +158,7 @@ class ReportService:
         from collections import defaultdict
 
         # Charges whose state behavior says they belong in arrears reporting
-        all_overdue = self._charge_repo.get_charges_for_arrears_report()
+        all_overdue = self._charge_repo.get_charges_for_arrears_report(load="arrears")
 
         # Group by tenant
         by_tenant = defaultdict(list)
@@ -156,6 +193,17 @@ class ReportService:
 
         return report
 
+    @reads_from_replica
+    def get_arrears_report_versions(self) -> list[RowVersion]:
+        """Row versions of what ``get_arrears_report`` reads."""
+        return [
+            self._charge_repo.get_version(),
+            self._payment_repo.get_allocation_version(),
+            self._tenant_repo.get_version(),
+            self._property_repo.get_version(),
+        ]
+
+    @reads_from_replica
     def get_payment_timeline(self, property_id: int, months: int = 12) -> list[dict]:
         """Get payment timeline for a property.
 
@@ -169,29 +217,29 @@ class ReportService:
         end_date = date.today()
         start_date = end_date - timedelta(days=30 * months)
 
-        payments = self._payment_repo.get_by_date_range(start_date, end_date)
-        payments = [p for p in payments if p.property_id == property_id]
+        payments = self._payment_repo.iter_rows(
+            property_id=property_id, start_date=start_date, end_date=end_date
+        )
 
-        # Group by month
+        # Count and total by month
         by_month = {}
         for p in payments:
             month_key = p.payment_date.strftime("%Y-%m")
-            if month_key not in by_month:
-                by_month[month_key] = []
-            by_month[month_key].append(p)
+            count, total = by_month.get(month_key, (0, 0))
+            by_month[month_key] = (count + 1, total + p.amount)
 
         # Build timeline
         timeline = []
         current = start_date
         while current <= end_date:
             month_key = current.strftime("%Y-%m")
-            month_payments = by_month.get(month_key, [])
+            payment_count, total = by_month.get(month_key, (0, 0))
 
             timeline.append(
                 {
                     "month": current.strftime("%B %Y"),
-                    "payment_count": len(month_payments),
-                    "total": sum(p.amount for p in month_payments),
+                    "payment_count": payment_count,
+                    "total": total,
                 }
             )
 
@@ -203,6 +251,7 @@ class ReportService:
 
         return timeline
 
+    @reads_from_replica
     def get_financial_summary(
         self, start_date: date | None = None, end_date: date | None = None
     ) -> dict:
@@ -220,13 +269,9 @@ class ReportService:
         if end_date is None:
             end_date = date.today()
 
-        payments = self._payment_repo.get_by_date_range(start_date, end_date)
-        total_received = sum(p.amount for p in payments)
-
-        charges = self._charge_repo.get_by_date_range(
-            start_date, end_date
-        )
-        total_charged = sum(c.amount_due for c in charges)
+        # One aggregate query per table: the range may cover the whole history
+        payment_count, total_received = self._payment_repo.count_and_total(start_date, end_date)
+        charge_count, total_charged = self._charge_repo.count_and_total(start_date, end_date)
 
         return {
             "start_date": start_date,
@@ -234,17 +279,18 @@ class ReportService:
             "total_received": total_received,
             "total_charged": total_charged,
             "outstanding": total_charged - total_received,
-            "payment_count": len(payments),
-            "charge_count": len(charges),
+            "payment_count": payment_count,
+            "charge_count": charge_count,
         }
 
+    @reads_from_replica
     def get_occupancy_report(self) -> list[dict]:
         """Get occupancy report for all properties.
 
         Returns:
             List of property occupancy data
         """
-        properties = self._property_repo.get_all()
+        properties = self._property_repo.get_all(load="with_tenants")
         report = []
 
         for prop in properties:
@@ -265,6 +311,7 @@ class ReportService:
 
         return report
 
+    @reads_from_replica
     def get_tenant_payment_history(self, tenant_id: int) -> dict | None:
         """Get payment history for a tenant.
 
@@ -274,8 +321,6 @@ class ReportService:
         Returns:
             Payment history dict or None
         """
-        from app.database import db_session
-
         tenant = self._tenant_repo.get_by_id(tenant_id)
         if not tenant:
             return None
@@ -287,7 +332,7 @@ class ReportService:
         from app.models.payment_allocation import PaymentAllocation
 
         allocations = (
-            db_session.query(PaymentAllocation)
+            self._session.query(PaymentAllocation)
             .join(PaymentAllocation.payment)
             .filter(PaymentAllocation.payment.has(property_id=property_id))
             .all()
@@ -307,3 +352,58 @@ class ReportService:
                 "move_out": tenant.move_out_date,
             },
         }
+
+
+class AsyncReportService:
+    """Awaitable ``ReportService``.
+
+    Every call opens its own ``AsyncSession`` (on the read replica when one
+    is configured and current) and runs the sync report in it, so several
+    reports can be awaited concurrently, e.g. with ``asyncio.gather``. On a
+    database the async drivers cannot reach (in-memory SQLite) the report
+    runs synchronously on a session of its own instead.
+    """
+
+    def __init__(self, replica: bool = True):
+        """Initialize; ``replica=False`` keeps reports on the primary."""
+        self._replica = replica
+
+    async def _run(self, method: str, *args, **kwargs):
+        if not async_available():
+            with db_session.session_factory() as session:
+                with nullcontext() if self._replica else primary_reads(session):
+                    return getattr(ReportService(session), method)(*args, **kwargs)
+        async with async_session(replica=self._replica) as session:
+            return await session.run_sync(
+                lambda sync_session: getattr(ReportService(sync_session), method)(*args, **kwargs)
+            )
+
+    async def get_dashboard_summary(self) -> dict:
+        """See ``ReportService.get_dashboard_summary``."""
+        return await self._run("get_dashboard_summary")
+
+    async def get_property_report(self, property_id: int) -> dict | None:
+        """See ``ReportService.get_property_report``."""
+        return await self._run("get_property_report", property_id)
+
+    async def get_arrears_report(self) -> list[dict]:
+        """See ``ReportService.get_arrears_report``."""
+        return await self._run("get_arrears_report")
+
+    async def get_payment_timeline(self, property_id: int, months: int = 12) -> list[dict]:
+        """See ``ReportService.get_payment_timeline``."""
+        return await self._run("get_payment_timeline", property_id, months)
+
+    async def get_financial_summary(
+        self, start_date: date | None = None, end_date: date | None = None
+    ) -> dict:
+        """See ``ReportService.get_financial_summary``."""
+        return await self._run("get_financial_summary", start_date, end_date)
+
+    async def get_occupancy_report(self) -> list[dict]:
+        """See ``ReportService.get_occupancy_report``."""
+        return await self._run("get_occupancy_report")
+
+    async def get_tenant_payment_history(self, tenant_id: int) -> dict | None:
+        """See ``ReportService.get_tenant_payment_history``."""
+        return await self._run("get_tenant_payment_history", tenant_id)
@@ -0,0 +1,151 @@
+"""Typeahead and ranked full-text search for properties and tenants."""
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.repositories.property_repository import PropertyRepository
+from app.repositories.tenant_repository import TenantRepository
+
+MAX_RESULTS = 50
+MAX_PER_PAGE = 100
+
+
+class _TTLCache:
+    """Small LRU of recent typeahead results; entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if time.monotonic() - stored_at > self._ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+
+_cache = _TTLCache()
+
+
+class SearchService:
+    """Prefix search for selectors and ranked search for the search API."""
+
+    def __init__(self):
+        """Initialize with repositories."""
+        self._property_repo = PropertyRepository()
+        self._tenant_repo = TenantRepository()
+
+    def search_properties(
+        self, term: str, limit: int = 10, active_only: bool = False
+    ) -> list[dict]:
+        """Properties with an address, city or postal code word starting with ``term``."""
+        term = term.strip()
+        if not term:
+            return []
+        limit = max(1, min(limit, MAX_RESULTS))
+
+        key = ("properties", term.lower(), limit, active_only)
+        results = _cache.get(key)
+        if results is None:
+            rows = self._property_repo.search_prefix(term, limit, active_only)
+            results = [
+                {
+                    "id": id,
+                    "label": f"{address}, {city}",
+                    "postal_code": postal_code,
+                }
+                for id, address, city, postal_code in rows
+            ]
+            _cache.set(key, results)
+        return results
+
+    def search_tenants(self, term: str, limit: int = 10) -> list[dict]:
+        """Tenants with a name or email word starting with ``term``."""
+        term = term.strip()
+        if not term:
+            return []
+        limit = max(1, min(limit, MAX_RESULTS))
+
+        key = ("tenants", term.lower(), limit)
+        results = _cache.get(key)
+        if results is None:
+            rows = self._tenant_repo.search_prefix(term, limit)
+            results = [
+                {
+                    "id": id,
+                    "label": name,
+                    "email": email,
+                    "property": f"{address}, {city}",
+                }
+                for id, name, email, address, city in rows
+            ]
+            _cache.set(key, results)
+        return results
+
+    def search(self, kind: str, text: str, page: int = 1, per_page: int = 20) -> dict:
+        """Ranked, paginated search over the word-prefix index.
+
+        Args:
+            kind: ``"tenants"`` or ``"properties"``
+            text: Search text
+            page: 1-based page number
+            per_page: Results per page (capped at MAX_PER_PAGE)
+
+        Raises:
+            ValueError: If ``kind`` is unknown
+        """
+        text = text.strip()
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        if kind == "tenants":
+            result = self._tenant_repo.search(text, page, per_page)
+            results = [
+                {
+                    "id": hit.row.id,
+                    "label": hit.row.name,
+                    "email": hit.row.email,
+                    "phone": hit.row.phone,
+                    "property": f"{hit.row.property_address}, {hit.row.property_city}",
+                    "score": round(hit.score, 3),
+                }
+                for hit in result.hits
+            ]
+        elif kind == "properties":
+            result = self._property_repo.search(text, page, per_page)
+            results = [
+                {
+                    "id": hit.row.id,
+                    "label": f"{hit.row.address}, {hit.row.city}",
+                    "postal_code": hit.row.postal_code,
+                    "is_active": hit.row.is_active,
+                    "score": round(hit.score, 3),
+                }
+                for hit in result.hits
+            ]
+        else:
+            raise ValueError(f"Unknown search type: {kind}")
+
+        return {
+            "query": text,
+            "type": kind,
+            "page": result.page,
+            "per_page": result.per_page,
+            "pages": result.pages,
+            "total": result.total,
+            "results": results,
+        }
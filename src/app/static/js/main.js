@@ -1,5 +1,10 @@
 /* Main JavaScript for RentTrack */
 
+// Each showing of a page, including one restored by Back, submits with new keys
+window.addEventListener('pageshow', function() {
+    refreshIdempotencyKeys(document);
+});
+
 // Initialize on document ready
 document.addEventListener('DOMContentLoaded', function() {
     // Initialize Bootstrap tooltips
@@ -39,6 +44,19 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
 
+    // Typeahead for large property selects (see forms/property_choices.py)
+    document.querySelectorAll('select[data-typeahead]').forEach(initTypeahead);
+
+    // Allocation forms update the page in place (see routes/allocations.py).
+    // Delegated, since their rows are replaced after each update.
+    document.addEventListener('submit', function(e) {
+        const form = e.target;
+        if (form.matches('form[data-partial]') && window.fetch) {
+            e.preventDefault();
+            submitPartial(form);
+        }
+    });
+
     // Amount input validation
     document.querySelectorAll('input[type="number"]').forEach(function(input) {
         if (input.step === '0.01') {
@@ -51,6 +69,111 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 });
 
+// Give forms new idempotency keys (see app/idempotency.py). A resubmission
+// with the old key is a retry and gets the first result back.
+function refreshIdempotencyKeys(root) {
+    if (!window.crypto || !crypto.randomUUID) {
+        return;
+    }
+    root.querySelectorAll('input[name="idempotency_key"]').forEach(function(input) {
+        input.value = crypto.randomUUID().replace(/-/g, '');
+    });
+}
+
+// Show a dismissible alert above the page content, like a flashed message
+function showAlert(message, category) {
+    const alert = document.createElement('div');
+    alert.className = 'alert alert-' + category + ' alert-dismissible fade show';
+    alert.setAttribute('role', 'alert');
+    alert.textContent = message;
+
+    const close = document.createElement('button');
+    close.type = 'button';
+    close.className = 'btn-close';
+    close.setAttribute('data-bs-dismiss', 'alert');
+    alert.appendChild(close);
+
+    document.querySelector('main').prepend(alert);
+    setTimeout(function() {
+        bootstrap.Alert.getOrCreateInstance(alert).close();
+    }, 5000);
+}
+
+// Post a form asking for JSON and apply the partial update it returns
+function submitPartial(form) {
+    const buttons = form.querySelectorAll('button, input[type="submit"]');
+    buttons.forEach(function(button) {
+        button.disabled = true;
+    });
+
+    fetch(form.action, {
+        method: 'POST',
+        body: new FormData(form),
+        headers: { 'Accept': 'application/json' },
+        credentials: 'same-origin'
+    }).then(function(response) {
+        return response.json().then(function(data) {
+            if (!response.ok) {
+                throw new Error(data.error || 'Request failed.');
+            }
+            applyPartial(data);
+            if (form.isConnected) {
+                form.reset();
+                refreshIdempotencyKeys(form);
+            }
+            showAlert(data.message, 'success');
+        });
+    }).catch(function(error) {
+        showAlert(error.message, 'danger');
+    }).finally(function() {
+        buttons.forEach(function(button) {
+            button.disabled = false;
+        });
+    });
+}
+
+// Update balances, fragments and charge badges from an allocation response
+function applyPartial(data) {
+    const balance = parseFloat(data.balance);
+
+    document.querySelectorAll('[data-field="allocated"]').forEach(function(el) {
+        el.textContent = formatCurrency(data.allocated);
+    });
+    document.querySelectorAll('[data-field="balance"]').forEach(function(el) {
+        el.textContent = formatCurrency(balance);
+        if (el.classList.contains('text-warning') || el.classList.contains('text-success')) {
+            el.classList.toggle('text-warning', balance > 0);
+            el.classList.toggle('text-success', balance <= 0);
+        }
+    });
+    document.querySelectorAll('[data-needs-balance]').forEach(function(el) {
+        el.hidden = balance <= 0;
+    });
+
+    Object.keys(data.html).forEach(function(name) {
+        document.querySelectorAll('[data-fragment="' + name + '"]').forEach(function(el) {
+            el.innerHTML = data.html[name];
+        });
+    });
+
+    data.charges.forEach(function(charge) {
+        document.querySelectorAll('[data-charge-badge="' + charge.id + '"]').forEach(function(badge) {
+            badge.className = 'badge ' + charge.badge_class;
+            badge.textContent = charge.badge_label;
+        });
+        document.querySelectorAll('[data-charge-remaining="' + charge.id + '"]').forEach(function(el) {
+            el.textContent = formatCurrency(charge.remaining);
+        });
+        const row = document.querySelector('[data-charge-row="' + charge.id + '"]');
+        if (row) {
+            row.querySelectorAll('input[type="number"]').forEach(function(input) {
+                input.max = charge.remaining;
+                input.disabled = parseFloat(charge.remaining) <= 0;
+            });
+        }
+    });
+}
+
 // Format currency
 function formatCurrency(amount) {
     return new Intl.NumberFormat('en-US', {
@@ -74,3 +197,42 @@ function daysBetween(date1, date2) {
     const oneDay = 24 * 60 * 60 * 1000;
     return Math.round((date2 - date1) / oneDay);
 }
+
+// Turn a <select data-typeahead="/search/..."> into a search box feeding its options
+function initTypeahead(select) {
+    const input = document.createElement('input');
+    input.type = 'search';
+    input.className = 'form-control form-control-sm mb-1';
+    input.placeholder = 'Type to search...';
+    input.autocomplete = 'off';
+    select.parentNode.insertBefore(input, select);
+
+    // Keep the leading "All / Select" option and the current selection
+    const fixed = Array.from(select.options).filter(function(opt) {
+        return opt.value === '0' || opt.value === '' || opt.selected;
+    });
+
+    let timer = null;
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        const term = input.value.trim();
+        if (term.length < 2) {
+            return;
+        }
+        timer = setTimeout(function() {
+            const url = new URL(select.dataset.typeahead, window.location.origin);
+            url.searchParams.set('q', term);
+            fetch(url)
+                .then(function(response) { return response.json(); })
+                .then(function(data) {
+                    select.innerHTML = '';
+                    fixed.forEach(function(opt) { select.appendChild(opt); });
+                    data.results.forEach(function(result) {
+                        if (!fixed.some(function(opt) { return opt.value === String(result.id); })) {
+                            select.appendChild(new Option(result.label, result.id));
+                        }
+                    });
+                });
+        }, 200);
+    });
+}
@@ -0,0 +1,88 @@
+"""Streamed page rendering for long list and report pages.
+
+``stream_page`` renders a template with ``flask.stream_template`` and sends
+the output as it is produced instead of building the whole HTML string
+first. Pass it rows from a repository ``iter_*`` generator wrapped in
+``RowStream`` and the page chrome (head, navigation, filters, table header)
+reaches the browser before the query runs, while rows follow in chunks of
+about ``STREAM_TEMPLATE_BUFFER_BYTES``.
+
+Templates mark where buffered output must go out at once with
+``{{ flush() }}`` (``base.html`` does so before the content block); the
+marker renders as nothing under plain ``render_template``.
+
+Rows are rendered while the cursor is still open, so nothing inside the row
+loop may query the database. The request's ``X-DB-*`` query stats are set
+before the body streams and leave out the queries run while rendering.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Generic, TypeVar
+
+from flask import Response, current_app, g, get_flashed_messages, stream_template
+
+T = TypeVar("T")
+
+#: What ``{{ flush() }}`` renders to in a streamed page (a private-use character)
+FLUSH = "\ue000"
+
+_END = object()
+
+
+class RowStream(Generic[T]):
+    """Rows from a generator, for templates that test ``{% if rows %}`` before looping.
+
+    Truth testing reads (and keeps) the first row; iterating yields every row
+    once. Nothing is read until the template gets there.
+    """
+
+    def __init__(self, rows: Iterable[T]):
+        self._rows = iter(rows)
+        self._head: list[T] = []
+
+    def __bool__(self) -> bool:
+        if not self._head:
+            row = next(self._rows, _END)
+            if row is not _END:
+                self._head.append(row)
+        return bool(self._head)
+
+    def __iter__(self) -> Iterator[T]:
+        yield from self._head
+        self._head = []
+        yield from self._rows
+
+
+def flush() -> str:
+    """Template global: ask a streamed page to send what it has rendered so far."""
+    return FLUSH if g.get("_streaming_page") else ""
+
+
+def _buffered(chunks: Iterable[str], size: int) -> Iterator[str]:
+    """Join template output into ``size``-character chunks, splitting at ``FLUSH`` markers."""
+    buffer, length = [], 0
+    for chunk in chunks:
+        if chunk == FLUSH:
+            if buffer:
+                yield "".join(buffer)
+                buffer, length = [], 0
+            continue
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_page(template_name: str, **context) -> Response:
+    """Render ``template_name`` as a streamed HTML response."""
+    g._streaming_page = True
+    # Pop flashed messages now: the session cookie is saved before the body renders
+    get_flashed_messages(with_categories=True)
+    chunks = stream_template(template_name, **context)
+    size = current_app.config["STREAM_TEMPLATE_BUFFER_BYTES"]
+    return Response(_buffered(chunks, size), mimetype="text/html")
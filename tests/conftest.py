@@ -0,0 +1,137 @@
+"""Shared fixtures: apps on fresh databases, small ledgers and commit counting.
+
+``app`` is a testing app on an empty in-memory database, new for each test.
+Modules that share one seeded or file-backed database override it with a
+module-scoped fixture built by ``make_app``::
+
+    @pytest.fixture(scope="module")
+    def app(make_app):
+        with make_app(seed=SeedOptions(properties=5, months=6)) as app:
+            yield app
+
+Test clients end the scoped session before each request, as request
+teardown would, because requests share the fixture's app context.
+"""
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from app import create_app
+from app.database import db_session, get_engine, init_db, init_engine
+from app.factories import PaymentFactory
+from app.models import Base, ChargeStatus, Property, RentCharge
+from app.repositories import property_directory
+from app.seed import SeedOptions, seed_portfolio
+
+
+class SessionResettingClient(FlaskClient):
+    """Test client that starts every request on a new scoped session."""
+
+    def open(self, *args, **kwargs):
+        db_session.remove()
+        return super().open(*args, **kwargs)
+
+
+@contextmanager
+def _make_app(database=None, seed: SeedOptions | None = None, **config):
+    """A testing app inside its app context, on a fresh database.
+
+    Args:
+        database: SQLite file path for tests that need real connections per
+            thread or event loop (default: in-memory)
+        seed: Portfolio to generate with ``seed_portfolio``
+        config: Config overrides
+    """
+    app = create_app("testing")
+    app.config.update(config)
+    if database is not None:
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{database}"
+        init_engine(app.config)
+    app.test_client_class = SessionResettingClient
+    with app.app_context():
+        init_db()
+        if seed is not None:
+            seed_portfolio(seed)
+        property_directory.invalidate()
+        try:
+            yield app
+        finally:
+            db_session.remove()
+            Base.metadata.drop_all(bind=get_engine())
+            get_engine().dispose()
+
+
+@pytest.fixture(scope="session")
+def make_app():
+    """``_make_app``, for modules that build their own ``app`` fixture."""
+    return _make_app
+
+
+@pytest.fixture
+def app(make_app):
+    with make_app() as app:
+        yield app
+
+
+@pytest.fixture
+def make_ledger(app):
+    """Factory for a property with overdue monthly charges and payments.
+
+    Returns a dict of ids: ``property``, ``charges`` (oldest first),
+    ``payments`` and ``payment`` (the first payment, or None).
+    """
+
+    def make(
+        charges: int = 0,
+        amount_due: float = 500,
+        payments: tuple[float, ...] = (),
+        status: ChargeStatus = ChargeStatus.IN_ARREARS,
+        address: str = "1 Ledger Lane",
+    ) -> dict:
+        prop = Property(
+            address=address, city="Ottawa", postal_code="K1A 0A1", monthly_rent=amount_due
+        )
+        db_session.add(prop)
+        db_session.flush()
+        start = date.today().replace(day=1) - timedelta(days=30 * charges + 10)
+        rows = [
+            RentCharge(
+                property_id=prop.id,
+                period_start=start + timedelta(days=31 * i),
+                period_end=start + timedelta(days=31 * i + 27),
+                amount_due=amount_due,
+                due_date=start + timedelta(days=31 * i),
+                status=status,
+            )
+            for i in range(charges)
+        ]
+        db_session.add_all(rows)
+        db_session.commit()
+        payment_ids = [
+            PaymentFactory().create(property_id=prop.id, amount=amount).id for amount in payments
+        ]
+        return {
+            "property": prop.id,
+            "charges": [charge.id for charge in rows],
+            "payments": payment_ids,
+            "payment": payment_ids[0] if payment_ids else None,
+        }
+
+    return make
+
+
+@pytest.fixture
+def commits():
+    """Sessions committed while the test runs (clear it to count from a point)."""
+    committed = []
+
+    def on_commit(session):
+        committed.append(session)
+
+    event.listen(db_session, "after_commit", on_commit)
+    yield committed
+    event.remove(db_session, "after_commit", on_commit)
@@ -0,0 +1,99 @@
+"""JSON API: keyset pagination, sparse fieldsets, indexed filters, gzip and reports."""
+
+import gzip
+import json
+
+import pytest
+
+from app.database import db_session
+from app.models import Payment, RentCharge
+from app.seed import SeedOptions
+
+
+@pytest.fixture(scope="module")
+def app(make_app):
+    with make_app(seed=SeedOptions(properties=5, months=6)) as app:
+        yield app
+
+
+@pytest.fixture
+def get(app):
+    client = app.test_client()
+
+    def get(path, status=200, **headers):
+        response = client.get(path, headers=headers)
+        assert response.status_code == status, response.get_data(as_text=True)
+        return response
+
+    return get
+
+
+def test_index_lists_resources_and_reports(get):
+    body = get("/api/v1/").json
+    assert set(body["resources"]) == {
+        "properties", "tenants", "payments", "rent-charges", "allocations"
+    }
+    assert "arrears" in body["reports"]
+
+
+def test_keyset_pages_cover_every_row_once(get):
+    ids, url = [], "/api/v1/payments?limit=7"
+    while url:
+        body = get(url).json
+        ids += [row["id"] for row in body["data"]]
+        url = body["next"]
+
+    assert ids == sorted(ids)
+    assert ids == [id for (id,) in db_session.query(Payment.id).order_by(Payment.id)]
+
+
+def test_fields_select_only_those_columns(get):
+    rows = get("/api/v1/payments?fields=amount,payment_date&limit=3").json["data"]
+    assert [set(row) for row in rows] == [{"id", "amount", "payment_date"}] * 3
+    assert isinstance(rows[0]["amount"], str)
+
+    assert "Unknown fields" in get("/api/v1/payments?fields=secret", 400).json["error"]
+
+
+def test_filters(get):
+    rows = get("/api/v1/rent-charges?status=paid&property_id=1&limit=1000").json["data"]
+    expected = db_session.query(RentCharge).filter_by(status="paid", property_id=1).count()
+    assert len(rows) == expected
+    assert {(row["status"], row["property_id"]) for row in rows} == {("paid", 1)}
+
+    rows = get("/api/v1/payments?start_date=2000-01-01&end_date=2000-12-31").json["data"]
+    assert rows == []
+
+
+def test_unindexed_and_bad_filters_are_rejected(get):
+    assert "Cannot filter on 'notes'" in get("/api/v1/payments?notes=x", 400).json["error"]
+    assert "Invalid status" in get("/api/v1/rent-charges?status=owed", 400).json["error"]
+    assert "by date" in get("/api/v1/allocations?start_date=2024-01-01", 400).json["error"]
+    get("/api/v1/payments?limit=0", 400)
+    get("/api/v1/ledgers", 404)
+
+
+def test_single_row(get):
+    payment = db_session.query(Payment).first()
+    row = get(f"/api/v1/payments/{payment.id}?fields=amount").json["data"]
+
+    assert row == {"id": payment.id, "amount": f"{payment.amount:.2f}"}
+    get("/api/v1/payments/999999", 404)
+
+
+def test_large_responses_are_gzipped(get):
+    response = get("/api/v1/payments?limit=100", **{"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert len(json.loads(gzip.decompress(response.data))["data"]) == 30
+
+    assert "Content-Encoding" not in get("/api/v1/payments?limit=100").headers
+
+
+def test_reports(get):
+    rows = get("/api/v1/reports/property-report?property_id=1").json["data"]
+    assert rows[0]["property_id"] == 1
+
+    assert "requires property_id" in get("/api/v1/reports/property-report", 400).json["error"]
+    get("/api/v1/reports/payments", 404)
@@ -0,0 +1,123 @@
+"""Bulk allocation: PaymentService.allocate_many, the multi-charge form and the JSON endpoint."""
+
+import re
+
+import pytest
+
+from app.database import db_session
+from app.models import ChargeStatus, PaymentAllocation, RentCharge
+from app.services import PaymentService
+
+
+@pytest.fixture
+def ledger(make_ledger):
+    """A property with three overdue 500.00 charges and a 1200.00 payment."""
+    return make_ledger(charges=3, payments=(1200,))
+
+
+def statuses(ids):
+    db_session.expire_all()
+    return [db_session.get(RentCharge, id).status for id in ids]
+
+
+def test_allocate_many_writes_once(ledger, commits):
+    charges = ledger["charges"]
+    allocations = PaymentService().allocate_many(
+        ledger["payment"], [(charges[0], 500), (charges[1], "450.00")]
+    )
+
+    assert [a.rent_charge_id for a in allocations] == charges[:2]
+    assert len(commits) == 1
+    assert statuses(charges) == [ChargeStatus.PAID, ChargeStatus.LATE, ChargeStatus.IN_ARREARS]
+    assert PaymentService().get_payment_balance(ledger["payment"]) == 250
+
+
+@pytest.mark.parametrize(
+    "amounts, message",
+    [
+        (lambda c: [(c[0], 500), (c[1], 500), (c[2], 300)], "exceeds remaining payment"),
+        (lambda c: [(c[0], 501)], "still owed"),
+        (lambda c: [(c[0], 100), (c[0], 100)], "only once"),
+        (lambda c: [(c[0], 0)], "positive"),
+        (lambda c: [(999999, 10)], "not a charge of this property"),
+        (lambda c: [(c[0], "ten")], "Invalid amount"),
+    ],
+)
+def test_invalid_batches_write_nothing(ledger, amounts, message):
+    with pytest.raises(ValueError, match=message):
+        PaymentService().allocate_many(ledger["payment"], amounts(ledger["charges"]))
+
+    db_session.rollback()
+    assert db_session.query(PaymentAllocation).count() == 0
+
+
+@pytest.mark.parametrize("amount", [0, -50])
+def test_single_allocation_applies_the_same_checks(make_ledger, ledger, amount):
+    other = make_ledger(charges=1, address="2 Other Street")
+    service = PaymentService()
+
+    with pytest.raises(ValueError, match="positive"):
+        service.allocate_payment(ledger["payment"], ledger["charges"][0], amount)
+    with pytest.raises(ValueError, match="not a charge of this property"):
+        service.allocate_payment(ledger["payment"], other["charges"][0], 100)
+
+    db_session.rollback()
+    assert db_session.query(PaymentAllocation).count() == 0
+
+
+def test_auto_allocate_is_one_transaction(ledger, commits):
+    allocations = PaymentService().auto_allocate_payment(ledger["payment"])
+
+    assert [a.amount for a in allocations] == [500, 500, 200]
+    assert len(commits) == 1
+
+
+def test_multi_charge_form(app, ledger):
+    client = app.test_client()
+    url = f"/allocations/{ledger['payment']}/allocate"
+
+    html = client.get(url).get_data(as_text=True)
+    fields = re.findall(r'name="(lines-\d+-rent_charge_id)"[^>]*value="(\d+)"', html)
+    assert [int(value) for _, value in fields] == ledger["charges"]
+
+    response = client.post(
+        url,
+        data={
+            "lines-0-rent_charge_id": ledger["charges"][0],
+            "lines-0-amount": "500.00",
+            "lines-1-rent_charge_id": ledger["charges"][1],
+            "lines-1-amount": "",
+            "lines-2-rent_charge_id": ledger["charges"][2],
+            "lines-2-amount": "100.00",
+        },
+    )
+    assert response.status_code == 302
+    assert db_session.query(PaymentAllocation).count() == 2
+
+    response = client.post(url, data={"lines-0-rent_charge_id": ledger["charges"][1]})
+    assert "at least one charge" in response.get_data(as_text=True)
+
+
+def test_json_endpoint(app, ledger):
+    client = app.test_client()
+    url = f"/api/v1/payments/{ledger['payment']}/allocations"
+    charges = ledger["charges"]
+
+    response = client.post(
+        url,
+        json={
+            "allocations": [
+                {"rent_charge_id": charges[0], "amount": "500"},
+                {"rent_charge_id": charges[1], "amount": 250},
+            ]
+        },
+    )
+    assert response.status_code == 201
+    assert response.json["balance"] == "450.00"
+    assert [line["amount"] for line in response.json["data"]] == ["500.00", "250.00"]
+
+    response = client.post(url, json={"allocations": [{"rent_charge_id": charges[2]}]})
+    assert response.status_code == 400
+
+    body = {"allocations": [{"rent_charge_id": charges[2], "amount": 1}]}
+    assert client.post("/api/v1/payments/999999/allocations", json=body).status_code == 404
@@ -0,0 +1,126 @@
+"""Change log: entries written with ledger writes, and the NDJSON change feed."""
+
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.database import db_session
+from app.factories import PaymentFactory
+from app.models import ChangeLog, Property
+from app.repositories import ChangeLogRepository, PaymentRepository, RentChargeRepository
+from app.services import PaymentService
+
+
+@pytest.fixture
+def prop(make_ledger):
+    return db_session.get(Property, make_ledger(amount_due=900)["property"])
+
+
+def changes(since=0):
+    return [(row.entity_type, row.operation) for row in ChangeLogRepository().since(since)]
+
+
+def test_repository_writes_are_logged(prop):
+    seq = ChangeLogRepository().latest_seq()
+    repo = PaymentRepository()
+    payment = repo.create({"property_id": prop.id, "amount": 100, "payment_date": date.today()})
+    repo.update(payment.id, {"notes": "cheque"})
+    repo.delete(payment.id)
+
+    entries = ChangeLogRepository().since(seq)
+    assert [(e.operation, e.entity_id) for e in entries] == [
+        ("insert", payment.id), ("update", payment.id), ("delete", payment.id)
+    ]
+    assert entries[0].data["property_id"] == prop.id
+    assert entries[1].data == {"notes": "cheque"}
+    assert entries[2].data is None
+
+
+def test_allocations_and_status_changes_are_logged(prop):
+    charge = RentChargeRepository().create(
+        {
+            "property_id": prop.id,
+            "period_start": date.today().replace(day=1),
+            "period_end": date.today().replace(day=1) + timedelta(days=27),
+            "amount_due": 900,
+            "due_date": date.today() - timedelta(days=1),
+        }
+    )
+    payment = PaymentFactory().create(property_id=prop.id, amount=900)
+    seq = ChangeLogRepository().latest_seq()
+
+    allocation = PaymentService().allocate_payment(payment.id, charge.id, 900)
+
+    entries = ChangeLogRepository().since(seq)
+    assert [(e.entity_type, e.operation) for e in entries] == [
+        ("payment_allocations", "insert"), ("rent_charges", "update")
+    ]
+    assert entries[0].entity_id == allocation.id
+    assert entries[1].data == {"status": "paid"}
+
+    seq = ChangeLogRepository().latest_seq()
+    PaymentService().delete_allocation(allocation.id)
+    assert changes(seq) == [("payment_allocations", "delete"), ("rent_charges", "update")]
+
+
+def test_cascaded_deletes_and_noop_updates(prop):
+    payment = PaymentFactory().create(property_id=prop.id, amount=50)
+    seq = ChangeLogRepository().latest_seq()
+
+    PaymentRepository().update(payment.id, {})
+    assert changes(seq) == []
+
+    db_session.delete(prop)
+    db_session.commit()
+    assert sorted(changes(seq)) == [("payments", "delete"), ("properties", "delete")]
+
+
+def test_rolled_back_writes_are_not_logged(prop):
+    seq = ChangeLogRepository().latest_seq()
+    prop.city = "Nowhere"
+    db_session.flush()
+    db_session.rollback()
+
+    assert changes(seq) == []
+
+
+def test_change_feed(app, prop):
+    app.config["CHANGE_FEED_SETTLE_SECONDS"] = 0
+    for amount in (10, 20, 30):
+        PaymentFactory().create(property_id=prop.id, amount=amount)
+    client = app.test_client()
+
+    def feed(query):
+        response = client.get(f"/api/v1/changes?{query}")
+        assert response.status_code == 200, response.data
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        return lines, int(response.headers["X-Next-Since"])
+
+    lines, since = feed("tables=payments&limit=2")
+    assert [line["operation"] for line in lines] == ["insert", "insert"]
+    assert since == lines[-1]["seq"]
+
+    lines, since = feed(f"tables=payments&since={since}&limit=2")
+    assert len(lines) == 1
+    assert feed(f"since={since}") == ([], since)
+
+    assert client.get("/api/v1/changes?tables=secrets").status_code == 400
+
+
+def test_change_feed_holds_back_recent_entries(app, prop):
+    seq = ChangeLogRepository().latest_seq()
+    for amount in (10, 20, 30):
+        PaymentFactory().create(property_id=prop.id, amount=amount)
+    first, second, third = (row.seq for row in ChangeLogRepository().since(seq))
+    # The second entry is recent; the third, although older, waits behind it
+    db_session.query(ChangeLog).filter(ChangeLog.id.in_([first, third])).update(
+        {"created_at": datetime(2000, 1, 1)}
+    )
+    db_session.commit()
+
+    response = app.test_client().get(f"/api/v1/changes?since={seq}")
+
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == [first]
+    assert response.headers["X-Next-Since"] == str(first)
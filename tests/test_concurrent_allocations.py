@@ -0,0 +1,121 @@
+"""Concurrent allocations: optimistic version checks keep every balance non-negative.
+
+Runs on a SQLite file so that each thread has its own connection. Set
+``TEST_DATABASE_URL`` to a MySQL database to hammer a server instead.
+"""
+
+import os
+import random
+import threading
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func
+
+from app.database import db_session
+from app.domain.charge_states import ChargeStatusResolver
+from app.models import ChargeStatus, Payment, PaymentAllocation, RentCharge
+from app.services import AllocationConflict, PaymentService
+
+THREADS = 8
+OPERATIONS = 25
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    database = None if os.environ.get("TEST_DATABASE_URL") else tmp_path / "concurrency.db"
+    with make_app(database) as app:
+        yield app
+
+
+@pytest.fixture
+def ledger(make_ledger):
+    """Three 250.00 payments competing for four 200.00 charges (750 paid, 800 owed)."""
+    ids = make_ledger(
+        charges=4, amount_due=200, payments=(250, 250, 250), status=ChargeStatus.CHARGED
+    )
+    db_session.remove()
+    return ids
+
+
+def hammer(app, ledger, seed, outcomes):
+    rng = random.Random(seed)
+    service = PaymentService()
+    with app.app_context():
+        for _ in range(OPERATIONS):
+            payment_id = rng.choice(ledger["payments"])
+            charge_ids = rng.sample(ledger["charges"], rng.randint(1, 2))
+            operation = rng.choices(["delete", "auto", "allocate"], [15, 20, 65])[0]
+            try:
+                if operation == "delete":
+                    allocation = db_session.query(PaymentAllocation.id).first()
+                    if allocation:
+                        service.delete_allocation(allocation.id)
+                elif operation == "auto":
+                    service.auto_allocate_payment(payment_id)
+                elif len(charge_ids) == 1:
+                    service.allocate_payment(payment_id, charge_ids[0], rng.choice([40, 60, 90]))
+                else:
+                    service.allocate_many(payment_id, [(id, 35) for id in charge_ids])
+                outcomes.append((operation, "ok"))
+            except AllocationConflict:
+                outcomes.append((operation, "conflict"))
+            except ValueError:
+                outcomes.append((operation, "rejected"))
+            finally:
+                db_session.remove()
+
+
+def test_no_balance_goes_negative(app, ledger):
+    outcomes = []
+    threads = [
+        threading.Thread(target=hammer, args=(app, ledger, seed, outcomes))
+        for seed in range(THREADS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(outcomes) == THREADS * OPERATIONS
+    assert ("allocate", "ok") in outcomes and ("auto", "ok") in outcomes
+    # Auto-allocation plans from what it reads, so it is never rejected
+    assert ("auto", "rejected") not in outcomes
+
+    allocated = dict(
+        db_session.query(PaymentAllocation.payment_id, func.sum(PaymentAllocation.amount))
+        .group_by(PaymentAllocation.payment_id)
+        .all()
+    )
+    for payment in db_session.query(Payment):
+        assert payment.amount - Decimal(allocated.get(payment.id, 0)) >= 0, payment.id
+
+    for charge in db_session.query(RentCharge):
+        paid = sum(
+            (a for (a,) in db_session.query(PaymentAllocation.amount).filter_by(
+                rent_charge_id=charge.id
+            )),
+            Decimal(0),
+        )
+        assert paid <= charge.amount_due, charge.id
+        # Status was recomputed from the allocations actually committed
+        assert charge.status == ChargeStatusResolver.resolve_from_ledger(
+            paid, Decimal(charge.amount_due), charge.due_date
+        )
+
+
+def test_routes_report_conflicts(app, ledger, monkeypatch):
+    def conflict(self, *args):
+        raise AllocationConflict("Try again.")
+
+    monkeypatch.setattr(PaymentService, "auto_allocate_payment", conflict)
+    monkeypatch.setattr(PaymentService, "delete_allocation", conflict)
+    client = app.test_client()
+    json = {"Accept": "application/json"}
+
+    for path in (f"/allocations/{ledger['payments'][0]}/auto-allocate", "/allocations/delete/1"):
+        response = client.post(path, headers=json)
+        assert response.status_code == 409
+        assert response.json["error"] == "Try again."
+
+        assert client.post(path).status_code == 302
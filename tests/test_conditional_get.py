@@ -0,0 +1,152 @@
+"""Conditional GET on detail, list and report pages (SQLite file: report pages are async)."""
+
+from datetime import date, datetime
+
+import pytest
+
+from app.database import db_session
+from app.factories import PaymentFactory
+from app.models import ChargeStatus, Payment, Property, RentCharge
+from app.seed import SeedOptions
+from app.services import PaymentService
+
+
+@pytest.fixture(scope="module")
+def app(make_app, tmp_path_factory):
+    database = tmp_path_factory.mktemp("db") / "conditional.db"
+    with make_app(database, seed=SeedOptions(properties=4, months=6)) as app:
+        yield app
+
+
+@pytest.fixture
+def get(app):
+    client = app.test_client()
+
+    def get(path, **headers):
+        response = client.get(path, headers=headers)
+        # Read and close streamed bodies so their contexts are popped in order
+        response.get_data()
+        response.close()
+        return response
+
+    return get
+
+
+@pytest.fixture
+def ids(app):
+    payment = db_session.query(Payment).first()
+    return {"payment": payment.id, "property": payment.property_id}
+
+
+def paths(ids):
+    return [
+        f"/payments/{ids['payment']}",
+        f"/properties/{ids['property']}",
+        f"/reports/property/{ids['property']}",
+        "/payments/",
+        "/rent-charges/?status=paid",
+        "/tenants/",
+        "/properties/",
+        "/reports/arrears",
+    ]
+
+
+def test_pages_send_validators(get, ids):
+    for path in paths(ids):
+        response = get(path)
+        assert response.status_code == 200, path
+        assert response.headers["ETag"], path
+        assert response.headers["Last-Modified"], path
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_matching_etag_skips_the_view(get, ids):
+    for path in paths(ids):
+        etag = get(path).headers["ETag"]
+        response = get(path, **{"If-None-Match": etag})
+
+        assert response.status_code == 304, path
+        assert response.data == b""
+        assert response.headers["ETag"] == etag
+        # Only the version queries ran
+        assert int(response.headers["X-DB-Query-Count"]) <= 6, path
+
+
+def test_if_modified_since(get, ids):
+    path = f"/payments/{ids['payment']}"
+    last_modified = get(path).headers["Last-Modified"]
+
+    assert get(path, **{"If-Modified-Since": last_modified}).status_code == 304
+    assert get(path, **{"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
+
+
+def test_etag_covers_filters(get):
+    assert get("/payments/").headers["ETag"] != get("/payments/?property_id=1").headers["ETag"]
+
+
+def test_writes_change_the_etag(get, ids):
+    paths = ["/payments/", f"/properties/{ids['property']}", f"/reports/property/{ids['property']}"]
+    before = {path: get(path).headers["ETag"] for path in paths}
+
+    PaymentFactory().create(property_id=ids["property"], amount=12.34, payment_date=date.today())
+
+    for path in paths:
+        response = get(path, **{"If-None-Match": before[path]})
+        assert response.status_code == 200, path
+        assert response.headers["ETag"] != before[path]
+
+
+def test_updates_change_the_etag(get, ids):
+    path = f"/payments/{ids['payment']}"
+    before = get(path).headers["ETag"]
+
+    prop = db_session.get(Property, ids["property"])
+    prop.city = "Elsewhere"
+    db_session.commit()
+
+    assert get(path, **{"If-None-Match": before}).status_code == 200
+
+
+def test_missing_rows_are_not_validated(get):
+    response = get("/payments/999999", **{"If-None-Match": "*"})
+
+    assert response.status_code == 302
+    assert "ETag" not in response.headers
+
+
+def test_pending_flash_gets_the_full_page(app, get):
+    etag = get("/payments/").headers["ETag"]
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_flashes"] = [("success", "Saved!")]
+
+    response = client.get("/payments/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert "Saved!" in response.get_data(as_text=True)
+    response.close()
+
+
+def test_charge_status_changes_the_payment_etag(get):
+    charge = db_session.query(RentCharge).filter(RentCharge.status != ChargeStatus.PAID).first()
+    charge_id = charge.id
+    remaining = charge.amount_due - sum(a.amount for a in charge.payment_allocations)
+    first, second = (
+        PaymentFactory()
+        .create(property_id=charge.property_id, amount=remaining, payment_date=date.today())
+        .id
+        for _ in range(2)
+    )
+    PaymentService().allocate_payment(first, charge_id, remaining / 2)
+    # SQLite's CURRENT_TIMESTAMP has whole seconds: keep the next update from sharing one
+    db_session.query(RentCharge).filter_by(id=charge_id).update(
+        {"updated_at": datetime(2000, 1, 1)}
+    )
+    db_session.commit()
+    path = f"/payments/{first}"
+    before = get(path).headers["ETag"]
+
+    # Another payment settles the charge: only its status badge on this page changes
+    PaymentService().allocate_payment(second, charge_id, remaining / 2)
+
+    assert get(path, **{"If-None-Match": before}).status_code == 200
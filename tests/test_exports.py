@@ -0,0 +1,123 @@
+"""Streaming export tests: endpoint, encodings, filters, gzip and the CLI."""
+
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+import pytest
+
+from app.database import db_session
+from app.export import main as export_main
+from app.models import Property
+from app.repositories import PaymentRepository, RentChargeRepository
+from app.seed import SeedOptions
+from app.services.export_service import DATASETS, ExportFilters, ExportService
+
+
+@pytest.fixture(scope="module")
+def app(make_app):
+    with make_app(seed=SeedOptions(properties=8, months=12)) as app:
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope="module")
+def property_id(app):
+    return db_session.query(Property.id).order_by(Property.id).first()[0]
+
+
+def _csv(body: bytes) -> list[dict]:
+    return list(csv.DictReader(io.StringIO(body.decode())))
+
+
+def test_payments_csv_streams_every_row(client):
+    response = client.get("/exports/payments.csv")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert "attachment" in response.headers["Content-Disposition"]
+    rows = _csv(response.data)
+    assert [int(r["id"]) for r in rows] == [p.id for p in PaymentRepository().list_rows()]
+
+
+def test_filters_apply_to_ledger_exports(client, property_id):
+    start, end = date(date.today().year, 1, 1), date.today()
+    response = client.get(
+        f"/exports/rent-charges.ndjson?property_id={property_id}"
+        f"&start_date={start}&end_date={end}"
+    )
+
+    rows = [json.loads(line) for line in response.data.decode().splitlines()]
+    expected = RentChargeRepository().list_rows(
+        property_id=property_id, start_date=start, end_date=end
+    )
+    assert [r["id"] for r in rows] == [c.id for c in expected]
+    assert all(r["property_id"] == property_id for r in rows)
+    assert rows and isinstance(rows[0]["amount_due"], str)  # decimals keep their precision
+
+
+def test_gzip_body_matches_plain(client):
+    plain = client.get("/exports/allocations.csv").data
+    response = client.get("/exports/allocations.csv?gzip=1")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == plain
+
+
+def test_every_dataset_exports(app, property_id):
+    tenant_id = _csv(b"".join(ExportService().stream("tenants")))[0]["id"]
+    given = {"property_id": property_id, "tenant_id": int(tenant_id)}
+    for name, spec in DATASETS.items():
+        filters = ExportFilters(**{k: v for k, v in given.items() if k in spec.filters})
+        rows = _csv(b"".join(ExportService().stream(name, "csv", filters)))
+        assert rows, name
+        assert list(rows[0]) == list(spec.columns), name
+
+
+def test_header_is_sent_before_rows_are_read(app, monkeypatch):
+    def no_rows(*args, **kwargs):
+        raise AssertionError("rows read before the header was sent")
+        yield
+
+    monkeypatch.setattr(PaymentRepository, "iter_rows", no_rows)
+    chunks = ExportService().stream("payments")
+    assert next(chunks).startswith(b"id,payment_date,")
+
+
+def test_bad_requests(client):
+    assert client.get("/exports/nothing.csv").status_code == 404
+    assert client.get("/exports/payments.xlsx").status_code == 404
+    assert client.get("/exports/payments.csv?start_date=yesterday").status_code == 400
+    assert client.get("/exports/property-report.csv").status_code == 400
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/exports/dashboard.csv?start_date=2024-01-01",
+        "/exports/arrears.csv?end_date=2024-12-31",
+        "/exports/payments.ndjson?tenant_id=1",
+    ],
+)
+def test_unsupported_filters_are_rejected(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 400
+    assert b"does not support" in response.data
+
+
+def test_cli_writes_file(app, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.export.create_app", lambda env: app)
+    output = tmp_path / "financial.ndjson.gz"
+
+    export_main(["financial", "--format", "ndjson", "--gzip", "--output", str(output)])
+
+    (row,) = [json.loads(line) for line in gzip.decompress(output.read_bytes()).splitlines()]
+    assert row["end_date"] == date.today().isoformat()
@@ -0,0 +1,128 @@
+"""Fragment cache: backends, version tokens and the cached dashboard panels."""
+
+from datetime import date
+
+import pytest
+
+from app.database import db_session
+from app.factories import PaymentFactory
+from app.fragment_cache import (
+    FileBackend,
+    MemoryBackend,
+    NullBackend,
+    backend_from_url,
+    database_namespace,
+    get_fragment_cache,
+)
+from app.models import Property
+from app.repositories import PropertyRepository, property_directory
+from app.seed import SeedOptions
+
+
+@pytest.fixture(scope="module")
+def app(make_app):
+    with make_app(seed=SeedOptions(properties=5, months=6)) as app:
+        yield app
+
+
+@pytest.fixture
+def dashboard(app):
+    client = app.test_client()
+
+    def get():
+        response = client.get("/")
+        assert response.status_code == 200
+        return response
+
+    return get
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+
+    assert (backend.get("a"), backend.get("b"), backend.get("c")) == ("1", None, "3")
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryBackend()
+    backend.set("a", "1", ttl=0)
+    assert backend.get("a") is None
+
+
+def test_file_backend_is_shared_and_expires(tmp_path):
+    writer, reader = FileBackend(str(tmp_path)), FileBackend(str(tmp_path))
+    writer.set("panel", "<p>é</p>", ttl=60)
+    writer.set("stale", "x", ttl=-1)
+
+    assert reader.get("panel") == "<p>é</p>"
+    assert reader.get("stale") is None
+    assert reader.get("missing") is None
+
+
+def test_backend_from_url(tmp_path):
+    assert isinstance(backend_from_url("memory://"), MemoryBackend)
+    assert isinstance(backend_from_url(f"file://{tmp_path}/cache"), FileBackend)
+    assert isinstance(backend_from_url("null://"), NullBackend)
+    with pytest.raises(ValueError):
+        backend_from_url("memcached://localhost")
+
+
+def test_dashboard_panels_are_served_from_cache(dashboard):
+    def main(response):
+        html = response.get_data(as_text=True)
+        return html[html.index("<main") : html.index("</main>")]
+
+    first = dashboard()
+    second = dashboard()
+
+    assert main(first) == main(second)
+    assert int(first.headers["X-DB-Query-Count"]) > 0
+    assert int(second.headers["X-DB-Query-Count"]) == 0
+
+
+def test_committed_writes_invalidate_dependent_panels(app, dashboard):
+    dashboard()
+    cache = get_fragment_cache()
+    before = {t: cache.version(t) for t in ("payments", "rent_charges")}
+
+    property_id = db_session.query(Property.id).first()[0]
+    PaymentFactory().create(property_id=property_id, amount=4321.09, payment_date=date.today())
+
+    assert cache.version("payments") != before["payments"]
+    assert cache.version("rent_charges") == before["rent_charges"]
+    assert b"$4321.09" in dashboard().data
+
+
+def test_dashboard_totals_come_from_the_database(app, dashboard):
+    dashboard()
+    # Another worker changes a rent; this process's property directory is not invalidated
+    property_directory.all()
+    prop = db_session.query(Property).filter(Property.is_active.is_(True)).first()
+    prop.monthly_rent += 1000
+    db_session.commit()
+    expected = PropertyRepository().total_active_rent()
+
+    assert f"${expected:.2f}".encode() in dashboard().data
+
+
+def test_keys_are_namespaced_by_database(app):
+    namespace = database_namespace(app.config["SQLALCHEMY_DATABASE_URI"])
+
+    assert get_fragment_cache()._prefix == f"{app.config['FRAGMENT_CACHE_PREFIX']}{namespace}:"
+    assert database_namespace("sqlite:///a.db") != database_namespace("sqlite:///b.db")
+
+
+def test_rolled_back_writes_keep_versions(app):
+    cache = get_fragment_cache()
+    before = cache.version("properties")
+
+    prop = db_session.query(Property).first()
+    prop.city = "Nowhere"
+    db_session.flush()
+    db_session.rollback()
+
+    assert cache.version("properties") == before
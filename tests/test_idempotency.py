@@ -0,0 +1,182 @@
+"""Idempotency keys: retried POSTs return the first result without writing again."""
+
+import hashlib
+import re
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from flask import g
+
+from app.database import db_session
+from app.factories import PaymentFactory
+from app.idempotency import ReservationLost
+from app.models import IdempotencyKey, Payment, PaymentAllocation
+from app.repositories import IdempotencyKeyRepository
+
+
+@pytest.fixture
+def app(make_app):
+    with make_app(IDEMPOTENCY_WAIT_SECONDS=0) as app:
+        yield app
+
+
+@pytest.fixture
+def prop(make_ledger):
+    return make_ledger(address="2 Retry Row")["property"]
+
+
+@pytest.fixture
+def post(app):
+    return app.test_client().post
+
+
+def payment_form(prop, key, amount="500.00"):
+    return {
+        "property_id": prop,
+        "amount": amount,
+        "payment_date": date.today().isoformat(),
+        "idempotency_key": key,
+    }
+
+
+def test_double_submitted_form_writes_once(app, prop, post):
+    first = post("/payments/new", data=payment_form(prop, "k1"))
+    retry = post("/payments/new", data=payment_form(prop, "k1"))
+
+    assert first.status_code == retry.status_code == 302
+    assert retry.location == first.location
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db_session.query(Payment).count() == 1
+
+    post("/payments/new", data=payment_form(prop, "k2"))
+    assert db_session.query(Payment).count() == 2
+
+
+def test_failed_requests_release_the_key(prop, post):
+    response = post("/payments/new", data=payment_form(prop, "k1", amount="-5"))
+    assert response.status_code == 200
+    assert db_session.get(IdempotencyKey, "k1") is None
+
+    assert post("/payments/new", data=payment_form(prop, "k1")).status_code == 302
+    assert db_session.query(Payment).count() == 1
+
+
+def test_key_reused_for_another_request(prop, post):
+    post("/payments/new", data=payment_form(prop, "k1"))
+
+    response = post("/payments/new", data=payment_form(prop, "k1", amount="600.00"))
+    assert response.status_code == 302
+    assert db_session.query(Payment).count() == 1
+
+    json = {"Accept": "application/json"}
+    response = post("/payments/new", data=payment_form(prop, "k1", "600.00"), headers=json)
+    assert response.status_code == 422
+    assert post("/payments/1/delete", headers={"Idempotency-Key": "k1", **json}).status_code == 422
+    assert db_session.query(Payment).count() == 1
+
+
+def test_api_allocation_retry(make_ledger, post):
+    ledger = make_ledger(charges=1, payments=(500,))
+    body = {"allocations": [{"rent_charge_id": ledger["charges"][0], "amount": "300.00"}]}
+    url = f"/api/v1/payments/{ledger['payment']}/allocations"
+
+    first = post(url, json=body, headers={"Idempotency-Key": "alloc-1"})
+    retry = post(url, json=body, headers={"Idempotency-Key": "alloc-1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json == first.json
+    assert first.json["balance"] == "200.00"
+    assert db_session.query(PaymentAllocation).count() == 1
+
+
+def test_in_progress_and_expired_keys(app, post):
+    repo = IdempotencyKeyRepository()
+    empty = hashlib.sha256(b"").hexdigest()
+    assert repo.reserve("busy", "POST /payments/new", empty, ttl=60) is None
+    assert repo.reserve("busy", "POST /payments/new", empty, ttl=60).status_code is None
+
+    headers = {"Idempotency-Key": "busy", "Accept": "application/json"}
+    assert post("/payments/new", headers=headers).status_code == 409
+
+    db_session.add(
+        IdempotencyKey(
+            key="old", request_path="POST /", request_hash="x",
+            expires_at=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=1),
+        )
+    )
+    db_session.commit()
+    repo.reserve("new", "POST /payments/new", "x", ttl=60)
+    assert repo.find("old") is None
+
+
+def test_abandoned_reservation_is_taken_over(prop, post):
+    # A worker died after reserving the key, before saving any result
+    body = b'{"address": "3 Lease Lane"}'
+    request_hash = hashlib.sha256(body).hexdigest()
+    repo = IdempotencyKeyRepository()
+    assert repo.reserve("dead", "POST /payments/new", request_hash, ttl=60) is None
+    headers = {"Idempotency-Key": "dead", "Accept": "application/json"}
+
+    def retry():
+        return post("/payments/new", data=body, content_type="application/json", headers=headers)
+
+    assert retry().status_code == 409
+
+    db_session.query(IdempotencyKey).update(
+        {"reserved_at": datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=5)}
+    )
+    db_session.commit()
+    db_session.remove()
+    # Only the same request may take it over
+    assert repo.reserve("dead", "POST /payments/new", "other", ttl=60, lease=30) is not None
+    # Past the lease: the retry runs the request itself
+    assert retry().status_code != 409
+
+
+def test_written_request_is_not_run_again_after_a_crash(prop, post, monkeypatch):
+    def crash(*args, **kwargs):
+        raise RuntimeError("worker died")
+
+    # The payment commits, then the worker dies before saving the response
+    monkeypatch.setattr(IdempotencyKeyRepository, "complete", crash)
+    with pytest.raises(RuntimeError):
+        post("/payments/new", data=payment_form(prop, "k1"))
+    monkeypatch.undo()
+    assert db_session.query(Payment).count() == 1
+    assert db_session.get(IdempotencyKey, "k1").written_at is not None
+
+    db_session.query(IdempotencyKey).update(
+        {"reserved_at": datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)}
+    )
+    db_session.commit()
+    db_session.remove()
+    # Past the lease the retry is still not run
+    json = {"Accept": "application/json"}
+    response = post("/payments/new", data=payment_form(prop, "k1"), headers=json)
+    assert response.status_code == 409
+    assert db_session.query(Payment).count() == 1
+
+
+def test_request_outliving_its_lease_cannot_commit(app, prop):
+    repo = IdempotencyKeyRepository()
+    assert repo.reserve("slow", "POST /payments/new", "x", ttl=60, owner="first") is None
+    # A retry took the key over while the first request was still running
+    db_session.query(IdempotencyKey).update({"owner": "retry"})
+    db_session.commit()
+
+    with app.test_request_context("/payments/new", method="POST"):
+        g.idempotency_key, g.idempotency_owner = "slow", "first"
+        with pytest.raises(ReservationLost):
+            PaymentFactory().create(property_id=prop, amount=500)
+        db_session.rollback()
+        del g.idempotency_key, g.idempotency_owner
+
+    assert db_session.query(Payment).count() == 0
+    saved = repo.find("slow")
+    assert (saved.owner, saved.written_at) == ("retry", None)
+
+
+def test_forms_carry_a_key(app, prop):
+    response = app.test_client().get("/payments/new")
+    keys = re.findall(r'name="idempotency_key" value="(\w+)"', response.get_data(as_text=True))
+    assert len(keys) == 1 and len(keys[0]) == 32
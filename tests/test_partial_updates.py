@@ -0,0 +1,101 @@
+"""Allocation actions answered as JSON partial updates instead of a redirect."""
+
+import pytest
+
+from app.database import db_session
+from app.models import ChargeStatus, PaymentAllocation, RentCharge
+
+JSON = {"Accept": "application/json"}
+
+
+@pytest.fixture
+def ledger(make_ledger):
+    """A property with two overdue 500.00 charges and a 700.00 payment."""
+    return make_ledger(charges=2, payments=(700,))
+
+
+@pytest.fixture
+def post(app, commits):
+    client = app.test_client()
+
+    def post(path, data=None, headers=JSON):
+        commits.clear()
+        response = client.post(path, data=data, headers=headers)
+        response.commits = len(commits)
+        return response
+
+    return post
+
+
+def test_auto_allocate(ledger, post):
+    response = post(f"/allocations/{ledger['payment']}/auto-allocate")
+
+    assert response.status_code == 200
+    assert response.commits == 1
+    # The allocation's reads, version claims and writes, then one query for the response
+    assert int(response.headers["X-DB-Query-Count"]) <= 13
+    body = response.json
+    assert (body["allocated"], body["balance"]) == ("700.00", "0.00")
+    assert [(c["status"], c["remaining"]) for c in body["charges"]] == [
+        ("paid", "0.00"), ("late", "300.00")
+    ]
+    assert body["html"]["allocations"].count("data-charge-badge") == 2
+
+
+def test_manual_allocation_and_errors(ledger, post):
+    url = f"/allocations/{ledger['payment']}/allocate"
+    line = {"lines-0-rent_charge_id": ledger["charges"][1]}
+
+    response = post(url, {**line, "lines-0-amount": "250.00"})
+    assert response.status_code == 200
+    assert response.commits == 1
+    assert response.json["balance"] == "450.00"
+    assert response.json["charges"][0]["remaining"] == "250.00"
+
+    response = post(url, {**line, "lines-0-amount": "300.00"})
+    assert response.status_code == 400
+    assert "still owed" in response.json["error"]
+
+    assert "at least one charge" in post(url, line).json["error"]
+    assert post("/allocations/999999/allocate", {**line, "lines-0-amount": "1"}).status_code == 404
+
+
+@pytest.mark.parametrize("charge_id", ["abc", ""])
+def test_tampered_charge_id_is_rejected(ledger, post, charge_id):
+    url = f"/allocations/{ledger['payment']}/allocate"
+    data = {"lines-0-rent_charge_id": charge_id, "lines-0-amount": "100.00"}
+
+    response = post(url, data)
+    assert response.status_code == 400
+    assert "unknown charge" in response.json["error"]
+
+    response = post(url, data, headers={})
+    assert response.status_code == 200
+    assert "unknown charge" in response.get_data(as_text=True)
+    assert db_session.query(PaymentAllocation).count() == 0
+
+
+def test_delete_allocation(ledger, post):
+    post(f"/allocations/{ledger['payment']}/auto-allocate")
+    allocation = db_session.query(PaymentAllocation).order_by(PaymentAllocation.id).first()
+
+    response = post(f"/allocations/delete/{allocation.id}")
+    assert response.status_code == 200
+    assert response.commits == 1
+    assert response.json["balance"] == "500.00"
+    assert [c["id"] for c in response.json["charges"]] == [ledger["charges"][1]]
+    db_session.expire_all()
+    assert db_session.get(RentCharge, ledger["charges"][0]).status == ChargeStatus.IN_ARREARS
+
+    assert post(f"/allocations/delete/{allocation.id}").status_code == 404
+
+
+def test_pages_still_redirect(ledger, post):
+    response = post(f"/allocations/{ledger['payment']}/auto-allocate", headers={})
+    assert response.status_code == 302
+    assert response.location.endswith(f"/payments/{ledger['payment']}")
+
+    allocation = db_session.query(PaymentAllocation).first()
+    response = post(f"/allocations/delete/{allocation.id}", headers={})
+    assert response.status_code == 302
+    assert response.location.endswith(f"/payments/{ledger['payment']}")
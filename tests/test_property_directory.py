@@ -0,0 +1,92 @@
+"""Property directory cache: full snapshot, and recently used entries above the cap."""
+
+import pytest
+from wtforms import Form, SelectField
+
+from app.forms.property_choices import set_property_choices
+from app.repositories import PropertyDirectory, PropertyRepository, property_directory
+
+
+@pytest.fixture
+def ids(app):
+    repo = PropertyRepository()
+    return [
+        repo.create(
+            {
+                "address": f"{n} Elm Street",
+                "city": "Halifax",
+                "postal_code": "B3H 1A1",
+                "monthly_rent": 1000 + n,
+            }
+        ).id
+        for n in range(3)
+    ]
+
+
+def counting(directory, monkeypatch):
+    """Record the ids argument of each directory load."""
+    loads = []
+    rows = directory._rows
+
+    def record(ids=None):
+        loads.append(ids)
+        return rows(ids)
+
+    monkeypatch.setattr(directory, "_rows", record)
+    return loads
+
+
+def test_snapshot_is_loaded_once(ids, monkeypatch):
+    directory = PropertyDirectory(ttl=60, max_entries=10)
+    loads = counting(directory, monkeypatch)
+
+    assert [e.id for e in directory.all()] == ids
+    assert directory.get(ids[1]).label == "1 Elm Street, Halifax"
+    assert directory.get(999) is None
+    assert loads == [None]
+
+    directory.invalidate()
+    directory.all()
+    assert loads == [None, None]
+
+
+def test_large_directory_keeps_recent_entries(ids, monkeypatch):
+    directory = PropertyDirectory(ttl=60, max_entries=2)
+    loads = counting(directory, monkeypatch)
+
+    for property_id in (ids[0], ids[0], ids[1], ids[2], ids[0]):
+        assert directory.get(property_id).id == property_id
+    # ids[0] was evicted by ids[2] (two entries kept) and loaded again
+    assert loads == [[ids[0]], [ids[1]], [ids[2]], [ids[0]]]
+
+    # Listing everything reads the database instead of caching it
+    assert [e.id for e in directory.all()] == ids
+    assert [e.id for e in directory.all()] == ids
+    assert loads[4:] == [None, None]
+
+
+def test_typeahead_threshold_is_checked_with_a_count(app, ids, monkeypatch):
+    class PropertyForm(Form):
+        property_id = SelectField(coerce=int)
+
+    app.config["TYPEAHEAD_THRESHOLD"] = 2
+    # Too large to snapshot, so listing would read every property
+    monkeypatch.setattr(property_directory, "_max_entries", 2)
+    property_directory.invalidate()
+    monkeypatch.setattr(property_directory, "_rows", pytest.fail)
+
+    with app.test_request_context():
+        form = PropertyForm()
+        set_property_choices(form.property_id)
+
+    assert form.property_id.choices == []
+    assert "data-typeahead" in form.property_id.render_kw
+    assert property_directory.count(active_only=True) == 3
+
+
+def test_get_by_city_matches_substrings(ids):
+    repo = PropertyRepository()
+
+    assert [p.id for p in repo.get_by_city("lifa")] == ids
+    assert [p.id for p in repo.get_by_city("HALIFAX")] == ids
+    assert repo.get_by_city("toronto") == []
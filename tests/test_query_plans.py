@@ -0,0 +1,429 @@
+"""Query plan regression tests.
+
+Every repository query is run against a seeded database while the
+statements it issues are captured; each statement is then EXPLAINed and the
+test fails if any table is read by a full scan (SQLite ``SCAN <table>``
+without an index, MySQL ``type = ALL``).
+
+Runs on in-memory SQLite by default; set ``TEST_DATABASE_URL`` to check the
+plans on MySQL instead (seed volume matters there: the optimizer may prefer a
+scan on tiny tables).
+"""
+
+import re
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, func
+
+from app.database import db_session, get_engine
+from app.models import (
+    Base,
+    ChargeStatus,
+    Payment,
+    PaymentAllocation,
+    Property,
+    RentCharge,
+    Tenant,
+)
+from app.repositories import (
+    ChangeLogRepository,
+    IdempotencyKeyRepository,
+    PaymentRepository,
+    PropertyRepository,
+    RentChargeRepository,
+    SearchIndexRepository,
+    TenantRepository,
+)
+
+PROPERTIES = 40
+MONTHS = 24
+TODAY = date.today()
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+def _seed() -> None:
+    """Properties with current and past tenants, monthly charges and payments."""
+    start = date(TODAY.year - 2, TODAY.month, 1)
+    for i in range(PROPERTIES):
+        prop = Property(
+            address=f"{100 + i} King Street West",
+            city=["Toronto", "Ottawa", "Montréal"][i % 3],
+            postal_code=f"M5V {i % 10}A{i % 7}",
+            monthly_rent=1500 + 10 * i,
+            is_active=i % 10 != 0,
+        )
+        prop.tenants.append(
+            Tenant(
+                name=f"Past Tenant {i}",
+                email=f"past{i}@example.com",
+                phone=f"555-01{i:02d}",
+                move_in_date=start - timedelta(days=400),
+                move_out_date=start - timedelta(days=1),
+            )
+        )
+        prop.tenants.append(
+            Tenant(
+                name=f"Current Tenant {i}",
+                email=f"current{i}@example.com",
+                phone=f"555-02{i:02d}",
+                move_in_date=start,
+            )
+        )
+        for month in range(MONTHS):
+            year, month_index = divmod(start.month - 1 + month, 12)
+            period_start = due = date(start.year + year, month_index + 1, 1)
+            charge = RentCharge(
+                period_start=period_start,
+                period_end=period_start + timedelta(days=27),
+                amount_due=prop.monthly_rent,
+                due_date=due,
+                status=ChargeStatus.PAID if month < MONTHS - 3 else ChargeStatus.IN_ARREARS,
+            )
+            prop.rent_charges.append(charge)
+            if month < MONTHS - 3:
+                payment = Payment(
+                    amount=prop.monthly_rent, payment_date=due + timedelta(days=i % 9)
+                )
+                payment.allocations.append(
+                    PaymentAllocation(rent_charge=charge, amount=prop.monthly_rent)
+                )
+                prop.payments.append(payment)
+        db_session.add(prop)
+    db_session.commit()
+
+
+@pytest.fixture(scope="module")
+def app(make_app):
+    with make_app() as app:
+        _seed()
+        yield app
+
+
+@pytest.fixture(scope="module")
+def ids(app):
+    """Id of the first seeded row per model."""
+    first = lambda model: db_session.query(func.min(model.id)).scalar()  # noqa: E731
+    return {"property": first(Property), "payment": first(Payment), "charge": first(RentCharge)}
+
+
+@pytest.fixture
+def captured(app):
+    """Statements (with parameters) executed while the test runs."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def full_scans(statement: str, parameters) -> set[str]:
+    """Tables the database plans to read in full for ``statement``."""
+    engine = get_engine()
+    tables = set(Base.metadata.tables)
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            scans = {m.group(1) for m in (_SQLITE_SCAN.match(row[-1]) for row in plan) if m}
+        else:
+            plan = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).mappings().all()
+            scans = {row["table"] for row in plan if row["type"] == "ALL"}
+    return scans & tables
+
+
+in_a_year = TODAY + timedelta(days=365)
+a_year_ago = TODAY - timedelta(days=365)
+
+# (id, query taking the seeded ids, tables a full read is expected for)
+CASES = [
+    # PropertyRepository
+    ("property.get_by_id", lambda ids: PropertyRepository().get_by_id(ids["property"]), set()),
+    ("property.get_all", lambda ids: PropertyRepository().get_all(), {"properties"}),
+    (
+        "property.get_all.with_tenants",
+        lambda ids: PropertyRepository().get_all(load="with_tenants"),
+        {"properties"},
+    ),
+    (
+        "property.get_directory_rows",
+        lambda ids: PropertyRepository().get_directory_rows(),
+        {"properties"},
+    ),
+    (
+        "property.get_with_tenant_count",
+        lambda ids: PropertyRepository().get_with_tenant_count(),
+        {"properties"},
+    ),
+    ("property.get_active", lambda ids: PropertyRepository().get_active(), set()),
+    # Substring matches: a leading wildcard cannot use an index
+    (
+        "property.get_by_city",
+        lambda ids: PropertyRepository().get_by_city("toronto"),
+        {"properties"},
+    ),
+    (
+        "property.search",
+        lambda ids: PropertyRepository().search("king st", page=2, per_page=5),
+        set(),
+    ),
+    (
+        "property.search_prefix",
+        lambda ids: PropertyRepository().search_prefix("kin", active_only=True),
+        set(),
+    ),
+    # TenantRepository
+    (
+        "tenant.get_by_property",
+        lambda ids: TenantRepository().get_by_property(ids["property"]),
+        set(),
+    ),
+    (
+        "tenant.get_active_by_property",
+        lambda ids: TenantRepository().get_active_by_property(ids["property"]),
+        set(),
+    ),
+    ("tenant.get_current", lambda ids: TenantRepository().get_current(load="with_property"), set()),
+    (
+        "tenant.search_by_name",
+        lambda ids: TenantRepository().search_by_name("current"),
+        {"tenants"},
+    ),
+    ("tenant.search", lambda ids: TenantRepository().search("past tenant"), set()),
+    ("tenant.search_prefix", lambda ids: TenantRepository().search_prefix("cur"), set()),
+    ("tenant.list_rows", lambda ids: TenantRepository().list_rows(), {"tenants"}),
+    ("tenant.list_rows.property", lambda ids: TenantRepository().list_rows(ids["property"]), set()),
+    (
+        "tenant.iter_rows.range",
+        lambda ids: list(TenantRepository().iter_rows(start_date=a_year_ago, end_date=TODAY)),
+        {"tenants"},
+    ),
+    (
+        "tenant.iter_rows.property",
+        lambda ids: list(TenantRepository().iter_rows(ids["property"], a_year_ago)),
+        set(),
+    ),
+    # ChangeLogRepository
+    ("change_log.since", lambda ids: ChangeLogRepository().since(10, 100), set()),
+    (
+        "change_log.since.tables",
+        lambda ids: ChangeLogRepository().since(10, 100, ["payments", "rent_charges"]),
+        set(),
+    ),
+    # IdempotencyKeyRepository
+    ("idempotency_keys.find", lambda ids: IdempotencyKeyRepository().find("plan"), set()),
+    # PaymentRepository
+    (
+        "payment.get_by_property",
+        lambda ids: PaymentRepository().get_by_property(ids["property"], load="list"),
+        set(),
+    ),
+    (
+        "payment.get_by_date_range",
+        lambda ids: PaymentRepository().get_by_date_range(a_year_ago, TODAY),
+        set(),
+    ),
+    (
+        "payment.get_by_date_range.property",
+        lambda ids: PaymentRepository().get_by_date_range(a_year_ago, TODAY, ids["property"]),
+        set(),
+    ),
+    (
+        "payment.get_total_by_property",
+        lambda ids: PaymentRepository().get_total_by_property(ids["property"]),
+        set(),
+    ),
+    ("payment.get_recent", lambda ids: PaymentRepository().get_recent(load="with_property"), set()),
+    (
+        "payment.get_with_allocations",
+        lambda ids: PaymentRepository().get_with_allocations(ids["payment"], load="detail"),
+        set(),
+    ),
+    (
+        "payment.get_with_allocations.panel",
+        lambda ids: PaymentRepository().get_with_allocations(ids["payment"], load="panel"),
+        set(),
+    ),
+    ("payment.list_rows", lambda ids: PaymentRepository().list_rows(), set()),
+    (
+        "payment.iter_rows",
+        lambda ids: list(PaymentRepository().iter_rows(start_date=a_year_ago, chunk_size=50)),
+        set(),
+    ),
+    (
+        "payment.iter_by_date_range",
+        lambda ids: list(PaymentRepository().iter_by_date_range(a_year_ago, TODAY)),
+        set(),
+    ),
+    ("payment.iter_all", lambda ids: list(PaymentRepository().iter_all()), {"payments"}),
+    (
+        "payment.count_and_total",
+        lambda ids: PaymentRepository().count_and_total(a_year_ago, TODAY),
+        set(),
+    ),
+    (
+        "payment.iter_allocation_rows",
+        lambda ids: list(PaymentRepository().iter_allocation_rows(start_date=a_year_ago)),
+        set(),
+    ),
+    (
+        "payment.iter_allocation_rows.property",
+        lambda ids: list(PaymentRepository().iter_allocation_rows(ids["property"])),
+        set(),
+    ),
+    (
+        "payment.keyset_page.property",
+        lambda ids: PaymentRepository().keyset_page(
+            ("id", "amount"), after=1, limit=50, property_id=ids["property"]
+        ),
+        set(),
+    ),
+    (
+        "payment.keyset_page.dates",
+        lambda ids: PaymentRepository().keyset_page(
+            ("id", "amount"), limit=50, ranges={"payment_date": (a_year_ago, TODAY)}
+        ),
+        set(),
+    ),
+    (
+        "payment.get_version.property",
+        lambda ids: PaymentRepository().get_version(property_id=ids["property"]),
+        set(),
+    ),
+    (
+        "payment.get_allocation_version",
+        lambda ids: PaymentRepository().get_allocation_version(),
+        {"payment_allocations"},
+    ),
+    (
+        "payment.get_allocation_version.payment",
+        lambda ids: PaymentRepository().get_allocation_version(payment_id=ids["payment"]),
+        set(),
+    ),
+    (
+        "payment.get_allocation_version.charge",
+        lambda ids: PaymentRepository().get_allocation_version(rent_charge_id=ids["charge"]),
+        set(),
+    ),
+    (
+        "payment.get_allocation_version.property",
+        lambda ids: PaymentRepository().get_allocation_version(property_id=ids["property"]),
+        set(),
+    ),
+    (
+        "payment.list_rows.property",
+        lambda ids: PaymentRepository().list_rows(property_id=ids["property"]),
+        set(),
+    ),
+    (
+        "payment.list_rows.range",
+        lambda ids: PaymentRepository().list_rows(start_date=a_year_ago, end_date=TODAY),
+        set(),
+    ),
+    # RentChargeRepository
+    (
+        "charge.get_by_property",
+        lambda ids: RentChargeRepository().get_by_property(ids["property"], load="list"),
+        set(),
+    ),
+    (
+        "charge.get_by_status",
+        lambda ids: RentChargeRepository().get_by_status(ChargeStatus.IN_ARREARS),
+        set(),
+    ),
+    (
+        "charge.get_charges_for_arrears_report",
+        lambda ids: RentChargeRepository().get_charges_for_arrears_report(load="arrears"),
+        set(),
+    ),
+    ("charge.get_overdue", lambda ids: RentChargeRepository().get_overdue(), set()),
+    (
+        "charge.get_upcoming",
+        lambda ids: RentChargeRepository().get_upcoming(30, load="with_property"),
+        set(),
+    ),
+    (
+        "charge.get_outstanding_by_property",
+        lambda ids: RentChargeRepository().get_outstanding_by_property(ids["property"]),
+        set(),
+    ),
+    ("charge.get_total_arrears", lambda ids: RentChargeRepository().get_total_arrears(), set()),
+    (
+        "charge.get_with_allocations",
+        lambda ids: RentChargeRepository().get_with_allocations(ids["charge"], load="detail"),
+        set(),
+    ),
+    (
+        "charge.get_by_date_range",
+        lambda ids: RentChargeRepository().get_by_date_range(a_year_ago, in_a_year),
+        set(),
+    ),
+    (
+        "charge.get_by_date_range.property",
+        lambda ids: RentChargeRepository().get_by_date_range(
+            a_year_ago, in_a_year, ids["property"]
+        ),
+        set(),
+    ),
+    ("charge.get_recent", lambda ids: RentChargeRepository().get_recent(load="summary"), set()),
+    ("charge.list_rows", lambda ids: RentChargeRepository().list_rows(), set()),
+    (
+        "charge.get_version.property",
+        lambda ids: RentChargeRepository().get_version(property_id=ids["property"]),
+        set(),
+    ),
+    (
+        "charge.iter_rows",
+        lambda ids: list(RentChargeRepository().iter_rows(status=ChargeStatus.PAID)),
+        set(),
+    ),
+    (
+        "charge.iter_by_date_range",
+        lambda ids: list(
+            RentChargeRepository().iter_by_date_range(a_year_ago, in_a_year, chunk_size=7)
+        ),
+        set(),
+    ),
+    ("charge.count_by_status", lambda ids: RentChargeRepository().count_by_status(), set()),
+    (
+        "charge.count_and_total",
+        lambda ids: RentChargeRepository().count_and_total(a_year_ago, in_a_year),
+        set(),
+    ),
+    (
+        "charge.list_rows.property",
+        lambda ids: RentChargeRepository().list_rows(property_id=ids["property"]),
+        set(),
+    ),
+    (
+        "charge.list_rows.status",
+        lambda ids: RentChargeRepository().list_rows(status=ChargeStatus.PAID),
+        set(),
+    ),
+    # SearchIndexRepository
+    (
+        "search_index.match",
+        lambda ids: SearchIndexRepository().match("tenant", "current ten", limit=5),
+        set(),
+    ),
+    (
+        "search_index.ids",
+        lambda ids: SearchIndexRepository().ids("property", "ottawa", fields=("city",)),
+        set(),
+    ),
+]
+
+
+@pytest.mark.parametrize("query, allowed", [c[1:] for c in CASES], ids=[c[0] for c in CASES])
+def test_repository_query_uses_indexes(ids, captured, query, allowed):
+    query(ids)
+    assert captured, "query issued no SELECT"
+
+    for statement, parameters in captured:
+        scans = full_scans(statement, parameters) - allowed
+        assert not scans, f"full scan of {sorted(scans)}:\n{statement}"
@@ -0,0 +1,219 @@
+"""Read-replica routing tests on two SQLite files (primary and replica).
+
+"Replication" is a file copy of the primary, so anything written afterwards
+exists on the primary only and shows which database a read went to.
+"""
+
+import shutil
+import threading
+from contextlib import contextmanager
+
+import pytest
+from flask import jsonify
+from sqlalchemy import create_engine
+
+from app.database import (
+    ReplicaHealth,
+    _engine_options,
+    db_session,
+    get_replica_engine,
+    init_read_routing,
+    primary_reads,
+    replica_health,
+    replica_reads,
+)
+from app.factories import PaymentFactory
+from app.repositories import PaymentRepository, PropertyRepository
+from app.services.report_service import ReportService
+
+
+def _property_data(n: int) -> dict:
+    return {
+        "address": f"{n} Queen Street",
+        "city": "Toronto",
+        "postal_code": "M5H 2N2",
+        "monthly_rent": 1800,
+    }
+
+
+@contextmanager
+def _replicated_app(make_app, primary, replica):
+    """A testing app on ``primary`` with reads routed to ``replica`` (SQLite files)."""
+    with make_app(
+        primary, SQLALCHEMY_REPLICA_URI=f"sqlite:///{replica}", REPLICA_CHECK_INTERVAL=0
+    ) as app:
+        init_read_routing(app)
+
+        @app.get("/_test/properties")
+        def count_properties():
+            return jsonify(count=PropertyRepository().count())
+
+        @app.post("/_test/properties")
+        def add_property():
+            PropertyRepository().create(_property_data(99))
+            return jsonify(ok=True)
+
+        yield app
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "primary.db", tmp_path / "replica.db"
+
+
+@pytest.fixture
+def app(make_app, paths):
+    with _replicated_app(make_app, *paths) as app:
+        yield app
+
+
+@pytest.fixture
+def replicate(app, paths):
+    """Copy the primary's committed state to the replica."""
+
+    def copy():
+        db_session.remove()
+        get_replica_engine().dispose()
+        shutil.copyfile(*paths)
+
+    return copy
+
+
+def test_replica_mode_reads_from_replica(app, replicate):
+    PropertyRepository().create(_property_data(1))
+    replicate()
+    PropertyRepository().create(_property_data(2))
+    db_session.remove()
+
+    with replica_reads():
+        assert PropertyRepository().count() == 1
+        with primary_reads():
+            assert PropertyRepository().count() == 2
+    assert PropertyRepository().count() == 2
+
+
+def test_writes_go_to_primary_and_pin_the_session(app, replicate):
+    property_id = PropertyRepository().create(_property_data(1)).id
+    replicate()
+
+    with replica_reads():
+        assert PaymentRepository().get_by_property(property_id) == []
+        payment = PaymentFactory().create(property_id=property_id, amount=500)
+        # Read-your-writes: the session now reads from the primary
+        assert [p.id for p in PaymentRepository().get_by_property(property_id)] == [payment.id]
+
+    db_session.remove()
+    with replica_reads():
+        assert PaymentRepository().get_by_property(property_id) == []
+
+
+def test_reports_read_from_replica(app, replicate):
+    PropertyRepository().create(_property_data(1))
+    replicate()
+    PropertyRepository().create(_property_data(2))
+    db_session.remove()
+
+    assert ReportService().get_dashboard_summary()["total_properties"] == 1
+
+
+def test_reports_on_their_own_session_read_from_replica(app, replicate):
+    PropertyRepository().create(_property_data(1))
+    replicate()
+    PropertyRepository().create(_property_data(2))
+    db_session.remove()
+
+    session = db_session.session_factory()
+    try:
+        assert ReportService(session).get_dashboard_summary()["total_properties"] == 1
+    finally:
+        session.close()
+
+
+def test_lagging_replica_falls_back_to_primary(app, replicate, monkeypatch):
+    PropertyRepository().create(_property_data(1))
+    replicate()
+    PropertyRepository().create(_property_data(2))
+    db_session.remove()
+
+    monkeypatch.setattr(replica_health, "lag_probe", lambda connection: 60.0)
+    with replica_reads():
+        assert PropertyRepository().count() == 2
+
+
+def test_unreachable_replica_falls_back_to_primary(make_app, tmp_path):
+    with _replicated_app(make_app, tmp_path / "primary.db", tmp_path / "gone" / "replica.db"):
+        PropertyRepository().create(_property_data(1))
+        db_session.remove()
+
+        with replica_reads():
+            assert PropertyRepository().count() == 1
+
+
+def test_get_requests_use_replica_until_client_writes(app, replicate):
+    PropertyRepository().create(_property_data(1))
+    replicate()
+    writer, reader = app.test_client(), app.test_client()
+
+    def get(client):
+        return client.get("/_test/properties").json["count"]
+
+    assert writer.post("/_test/properties").status_code == 200
+    # The writer keeps reading from the primary; other clients see the replica
+    assert get(writer) == 2
+    assert get(reader) == 1
+
+
+def test_primary_reads_cover_nested_replica_reads(app, replicate):
+    PropertyRepository().create(_property_data(1))
+    replicate()
+    PropertyRepository().create(_property_data(2))
+    db_session.remove()
+
+    with primary_reads():
+        with replica_reads():
+            assert PropertyRepository().count() == 2
+    with replica_reads():
+        assert PropertyRepository().count() == 1
+
+
+def test_cached_fragments_render_from_primary(app, replicate):
+    PropertyRepository().create(_property_data(1))
+    replicate()
+    PropertyRepository().create(_property_data(2))
+    db_session.remove()
+
+    template = app.jinja_env.from_string(
+        '{% cache "test.count", versions("properties") %}{{ count() }}{% endcache %}'
+    )
+    with replica_reads():
+        # Stored for every later request, so not built from the lagging replica
+        assert template.render(count=PropertyRepository().count) == "2"
+
+
+def test_hung_replica_check_does_not_block_other_threads():
+    started, release = threading.Event(), threading.Event()
+
+    def hanging_probe(connection):
+        started.set()
+        release.wait(5)
+        return 0.0
+
+    health = ReplicaHealth(lag_probe=hanging_probe)
+    health.configure(max_lag=5, check_interval=0)
+    engine = create_engine("sqlite://")
+    checker = threading.Thread(target=health.available, args=(engine,))
+    checker.start()
+    assert started.wait(5)
+
+    # Another thread gets the last known state instead of waiting on the check
+    assert health.available(engine) is False
+    release.set()
+    checker.join()
+    assert health.available(engine) is True
+
+
+def test_replica_connections_time_out_quickly():
+    config = {"SQLALCHEMY_DATABASE_URI": "mysql+pymysql://user@replica/renttrack"}
+
+    assert _engine_options(config, 2)["connect_args"] == {"connect_timeout": 2}
+    assert "connect_args" not in _engine_options(config)
@@ -0,0 +1,41 @@
+"""Report pages on the default testing database (in-memory SQLite, no async driver)."""
+
+import pytest
+
+from app.database import db_session
+from app.models import Property
+from app.seed import SeedOptions
+
+
+@pytest.fixture(scope="module")
+def app(make_app):
+    with make_app(seed=SeedOptions(properties=4, months=6)) as app:
+        yield app
+
+
+@pytest.fixture(scope="module")
+def property_id(app):
+    return db_session.query(Property.id).order_by(Property.id).first()[0]
+
+
+def test_report_pages_render(app, property_id):
+    client = app.test_client()
+
+    for path in ("/reports/arrears", f"/reports/property/{property_id}", "/reports/financial"):
+        response = client.get(path)
+        assert response.status_code == 200, path
+        assert response.get_data(as_text=True).rstrip().endswith("</html>"), path
+
+
+def test_financial_report_for_a_date_range(app):
+    response = app.test_client().post(
+        "/reports/financial", data={"start_date": "2000-01-01", "end_date": "2000-12-31"}
+    )
+
+    assert response.status_code == 200
+    assert "2000" in response.get_data(as_text=True)
+
+
+def test_missing_property_redirects(app):
+    response = app.test_client().get("/reports/property/999999")
+    assert response.status_code == 302
@@ -0,0 +1,45 @@
+"""Production server: the per-worker stats endpoint."""
+
+import pytest
+
+from app.serve import register_worker_stats
+
+TOKEN = {"Authorization": "Bearer s3cret"}
+
+
+@pytest.fixture
+def client(app):
+    app.config["WORKER_STATS_TOKEN"] = "s3cret"
+    register_worker_stats(app)
+    return app.test_client()
+
+
+def test_worker_stats_are_off_by_default(app):
+    register_worker_stats(app)
+
+    assert app.test_client().get("/_worker/stats", headers=TOKEN).status_code == 404
+
+
+def test_worker_stats_answer_loopback_clients_with_the_token(client):
+    response = client.get("/_worker/stats", headers=TOKEN)
+    assert response.status_code == 200
+    assert set(response.json) >= {"pid", "requests", "in_flight"}
+    ipv6 = {"REMOTE_ADDR": "::1"}
+    assert client.get("/_worker/stats", headers=TOKEN, environ_base=ipv6).status_code == 200
+
+
+@pytest.mark.parametrize(
+    "headers, environ",
+    [
+        ({}, {}),
+        ({"Authorization": "Bearer wrong"}, {}),
+        (TOKEN, {"REMOTE_ADDR": "203.0.113.7"}),
+        # A reverse proxy on the same host: the peer is loopback, the client is not
+        ({**TOKEN, "X-Forwarded-For": "203.0.113.7"}, {}),
+        ({**TOKEN, "Forwarded": "for=203.0.113.7"}, {}),
+    ],
+)
+def test_worker_stats_refuse_other_requests(client, headers, environ):
+    response = client.get("/_worker/stats", headers=headers, environ_base=environ)
+
+    assert response.status_code == 404
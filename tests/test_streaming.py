@@ -0,0 +1,82 @@
+"""Streamed list and report pages (on a SQLite file: the report pages are async views)."""
+
+import re
+
+import pytest
+
+from app.repositories import PaymentRepository, RentChargeRepository
+from app.seed import SeedOptions
+from app.streaming import FLUSH, RowStream
+
+
+@pytest.fixture(scope="module")
+def app(make_app, tmp_path_factory):
+    with make_app(
+        tmp_path_factory.mktemp("db") / "streaming.db",
+        seed=SeedOptions(properties=6, months=12),
+        STREAM_TEMPLATE_BUFFER_BYTES=4096,
+    ) as app:
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_row_stream_truth_test_keeps_first_row():
+    rows = RowStream(iter([1, 2, 3]))
+    assert rows and rows
+    assert list(rows) == [1, 2, 3]
+    assert not RowStream(iter([]))
+
+
+@pytest.mark.parametrize(
+    "path", ["/payments/", "/rent-charges/", "/tenants/", "/reports/arrears"]
+)
+def test_list_and_report_pages_stream(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    html = response.get_data(as_text=True)
+    assert html.rstrip().endswith("</html>")
+    assert FLUSH not in html
+
+
+def test_rows_match_repository(client):
+    html = client.get("/rent-charges/?status=paid").get_data(as_text=True)
+
+    charges = RentChargeRepository().list_rows(status="paid")
+    assert charges
+    assert re.findall(r'href="/rent-charges/(\d+)"', html) == [str(c.id) for c in charges]
+
+
+def test_chrome_is_sent_before_rows_are_read(client, monkeypatch):
+    def rows(*args, **kwargs):
+        reads.append(True)
+        yield from PaymentRepository().list_rows(**kwargs)
+
+    reads = []
+    monkeypatch.setattr(PaymentRepository, "iter_rows", lambda self, **kwargs: rows(**kwargs))
+    response = client.get("/payments/", buffered=False)
+    chunks = iter(response.response)
+
+    first = next(chunks)
+    assert b"<nav" in first and not reads
+    rest = b"".join(chunks)
+    assert reads and b"</table>" in rest
+    response.close()
+
+
+def test_empty_list_renders_placeholder(client):
+    html = client.get("/rent-charges/?property_id=999999").get_data(as_text=True)
+    assert "No rent charges found." in html
+    assert "<table" not in html
+
+
+def test_flash_is_shown_once(client):
+    response = client.get("/payments/999999", follow_redirects=True)
+    assert "not found" in response.get_data(as_text=True).lower()
+
+    assert "not found" not in client.get("/payments/").get_data(as_text=True).lower()